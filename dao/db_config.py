@@ -17,6 +17,8 @@ DEFAULT_CONFIG = {
     'database': os.getenv('POSTGRES_DB', 'news_scraper'),
     'user': os.getenv('POSTGRES_USER', 'postgres'),
     'password': os.getenv('POSTGRES_PASSWORD', 'password'),
+    # 连接超时（秒），数据库不可达时抓取器尽快退回本地缓存
+    'connect_timeout': os.getenv('POSTGRES_CONNECT_TIMEOUT', '10'),
 }
 
 def get_database_config(config: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -35,6 +37,17 @@ def get_database_config(config: Dict[str, Any] = None) -> Dict[str, Any]:
 
     return db_config
 
+def get_connect_timeout(config: Dict[str, Any] = None) -> int:
+    """获取连接超时（秒）
+
+    Args:
+        config: 可选的自定义配置
+
+    Returns:
+        传给 psycopg2.connect 的 connect_timeout
+    """
+    return int(get_database_config(config)['connect_timeout'])
+
 def get_connection_string(config: Dict[str, Any] = None) -> str:
     """获取 PostgreSQL 连接字符串
 
@@ -7,17 +7,18 @@ PostgreSQL数据库初始化脚本
 import psycopg2
 import psycopg2.extras
 
-from db_config import get_connection_string
+from db_config import get_connect_timeout, get_connection_string
 
 def init_database(config=None):
     """初始化新闻数据库"""
     # 获取连接字符串
     conn_str = get_connection_string(config)
+    connect_timeout = get_connect_timeout(config)
 
     try:
         # 连接到PostgreSQL服务器（不指定数据库）
         conn_str_no_db = conn_str.rsplit('/', 1)[0] + '/postgres'
-        conn = psycopg2.connect(conn_str_no_db)
+        conn = psycopg2.connect(conn_str_no_db, connect_timeout=connect_timeout)
         conn.autocommit = True
         cursor = conn.cursor()
 
@@ -31,7 +32,7 @@ def init_database(config=None):
         conn.close()
 
         # 连接到指定数据库
-        conn = psycopg2.connect(conn_str)
+        conn = psycopg2.connect(conn_str, connect_timeout=connect_timeout)
         cursor = conn.cursor()
 
         # 创建新闻表
@@ -8,15 +8,24 @@ import psycopg2
 import psycopg2.extras
 import json
 import argparse
+import os
+import sys
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
-from db_config import get_connection_string, get_database_config
+from db_config import get_connect_timeout, get_connection_string, get_database_config
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.tracing import traced
+from utils.news_stream import is_stream_file, iter_news_file
 
 
 class NewsDAO:
     """新闻数据访问类"""
 
+    # 从NDJSON流文件入库时每批插入的新闻数
+    LOAD_BATCH_SIZE = 200
+
     def __init__(self, config=None):
         """初始化数据库连接
 
@@ -25,6 +34,7 @@ class NewsDAO:
         """
         self.config = get_database_config(config)
         self.connection_string = get_connection_string(config)
+        self.connect_timeout = get_connect_timeout(config)
         self._ensure_database_exists()
 
     def _ensure_database_exists(self):
@@ -43,11 +53,12 @@ class NewsDAO:
 
     def _get_connection(self):
         """获取数据库连接"""
-        conn = psycopg2.connect(self.connection_string)
+        conn = psycopg2.connect(self.connection_string, connect_timeout=self.connect_timeout)
         # 使查询结果可以按列名访问
         conn.cursor_factory = psycopg2.extras.RealDictCursor
         return conn
 
+    @traced("dao.insert_news")
     def insert_news(self, news_data: Dict) -> bool:
         """插入单条新闻，避免重复"""
         try:
@@ -90,6 +101,31 @@ class NewsDAO:
             print(f"插入新闻失败: {e}")
             return False
 
+    @traced("dao.get_existing_urls")
+    def get_existing_urls(self, urls: List[str]) -> Optional[set]:
+        """批量查询数据库中已存在的新闻URL
+
+        Args:
+            urls: 待查询的URL列表
+
+        Returns:
+            已存在的URL集合，查询失败返回None
+        """
+        if not urls:
+            return set()
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT url FROM news WHERE url = ANY(%s)", (list(urls),)
+                )
+                return {row["url"] for row in cursor.fetchall()}
+
+        except psycopg2.Error as e:
+            print(f"查询已存在的新闻URL失败: {e}")
+            return None
+
+    @traced("dao.insert_news_batch")
     def insert_news_batch(self, news_list: List[Dict]) -> int:
         """批量插入新闻，返回成功插入的数量"""
         success_count = 0
@@ -97,11 +133,17 @@ class NewsDAO:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # 一次查询出已存在的URL
+            cursor.execute(
+                "SELECT url FROM news WHERE url = ANY(%s)",
+                ([news["url"] for news in news_list],),
+            )
+            existing_urls = {row["url"] for row in cursor.fetchall()}
+
             for news in news_list:
                 try:
                     # 检查URL是否已存在
-                    cursor.execute("SELECT id FROM news WHERE url = %s", (news["url"],))
-                    if cursor.fetchone():
+                    if news["url"] in existing_urls:
                         continue
 
                     if not news.get("content"):
@@ -125,6 +167,7 @@ class NewsDAO:
                         ),
                     )
 
+                    existing_urls.add(news["url"])
                     success_count += 1
 
                 except psycopg2.Error as e:
@@ -135,14 +178,27 @@ class NewsDAO:
         print(f"批量插入完成，成功插入 {success_count} 条新闻")
         return success_count
 
+    @traced("dao.load_from_json_file")
     def load_from_json_file(self, json_file_path: str) -> int:
-        """从JSON文件加载新闻到数据库"""
+        """从JSON文件或NDJSON流文件加载新闻到数据库，NDJSON逐行读取并分批插入"""
         try:
-            with open(json_file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            news_list = data.get("news_list", [])
-            return self.insert_news_batch(news_list)
+            if not is_stream_file(json_file_path):
+                with open(json_file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+                news_list = data.get("news_list", [])
+                return self.insert_news_batch(news_list)
+
+            success_count = 0
+            batch = []
+            for news in iter_news_file(json_file_path):
+                batch.append(news)
+                if len(batch) >= self.LOAD_BATCH_SIZE:
+                    success_count += self.insert_news_batch(batch)
+                    batch = []
+            if batch:
+                success_count += self.insert_news_batch(batch)
+            return success_count
 
         except FileNotFoundError:
             print(f"文件不存在: {json_file_path}")
@@ -151,6 +207,7 @@ class NewsDAO:
             print(f"JSON解析失败: {e}")
             return 0
 
+    @traced("dao.get_news_by_source")
     def get_news_by_source(self, source: str, limit: int = 10) -> List[Dict]:
         """根据来源获取新闻"""
         try:
@@ -173,6 +230,7 @@ class NewsDAO:
             print(f"查询新闻失败: {e}")
             return []
 
+    @traced("dao.get_news_by_time_range")
     def get_news_by_time_range(self, start_time: str, end_time: str) -> List[Dict]:
         """根据时间范围获取新闻
 
@@ -205,6 +263,7 @@ class NewsDAO:
             print(f"查询新闻失败: {e}")
             return []
 
+    @traced("dao.search_news_by_keyword")
     def search_news_by_keyword(self, keyword: str, limit: int = 10) -> List[Dict]:
         """根据关键词搜索新闻"""
         try:
@@ -227,6 +286,7 @@ class NewsDAO:
             print(f"搜索新闻失败: {e}")
             return []
 
+    @traced("dao.get_latest_news")
     def get_latest_news(self, limit: int = 10) -> List[Dict]:
         """获取最新新闻"""
         try:
@@ -248,6 +308,7 @@ class NewsDAO:
             print(f"获取最新新闻失败: {e}")
             return []
 
+    @traced("dao.get_news_count_by_source")
     def get_news_count_by_source(self) -> List[Dict]:
         """统计各来源的新闻数量"""
         try:
@@ -269,6 +330,7 @@ class NewsDAO:
             print(f"统计新闻数量失败: {e}")
             return []
 
+    @traced("dao.delete_old_news")
     def delete_old_news(self, days: int = 30) -> int:
         """删除指定天数之前的新闻，返回删除的数量"""
         try:
@@ -294,6 +356,7 @@ class NewsDAO:
             print(f"删除旧新闻失败: {e}")
             return 0
 
+    @traced("dao.get_total_count")
     def get_total_count(self) -> int:
         """获取新闻总数"""
         try:
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import glob
 import os
 import sys
@@ -10,23 +9,31 @@ from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import utils
+from utils.tracing import span
+from utils.news_stream import (
+    NewsStreamWriter,
+    iter_news_file,
+    news_output_format,
+    stream_filename,
+    STREAM_SUFFIXES,
+)
 
 class NewsMerger:
     def __init__(self):
         self.data_dir = os.environ.get("DATA_DIR", ".")
-        self.output_file = "news_merged.json"
+        self.output_format = news_output_format()
+        if self.output_format == "ndjson":
+            self.output_file = stream_filename("news_merged.json")
+        else:
+            self.output_file = "news_merged.json"
 
     def _merge_news_files(self, json_files) -> Dict[str, Any]:
         merged_data = {"total_count": 0, "news_list": []}
 
         for file_path in json_files:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                merged_data["total_count"] += data.get("total_count", 0)
-
-                news_list = data.get("news_list", [])
+                news_list = list(iter_news_file(file_path))
+                merged_data["total_count"] += len(news_list)
                 merged_data["news_list"].extend(news_list)
 
                 print(f"已合并 {os.path.basename(file_path)}: {len(news_list)} 条新闻")
@@ -41,9 +48,27 @@ class NewsMerger:
 
         return merged_data
 
+    def _stream_news_files(self, json_files, output_filepath) -> int:
+        """逐条读取各网站的NDJSON文件并写入合并后的流，不把全部新闻读入内存"""
+        with NewsStreamWriter(output_filepath) as writer:
+            for file_path in json_files:
+                before = writer.count
+                try:
+                    for news in iter_news_file(file_path):
+                        writer.write(news)
+                except Exception as e:
+                    print(f"读取文件 {file_path} 时出错: {e}")
+                print(f"已合并 {os.path.basename(file_path)}: {writer.count - before} 条新闻")
+        print(f"\n合并完成！总计 {writer.count} 条新闻")
+        return writer.count
+
     def _glob_news_files(self, data_dir) -> List[str]:
-        pattern = os.path.join(data_dir, "*_news.json")
-        json_files = glob.glob(pattern)
+        if self.output_format == "ndjson":
+            json_files = []
+            for suffix in STREAM_SUFFIXES.values():
+                json_files.extend(glob.glob(os.path.join(data_dir, f"*_news{suffix}")))
+        else:
+            json_files = glob.glob(os.path.join(data_dir, "*_news.json"))
 
         if not json_files:
             return None
@@ -52,16 +77,35 @@ class NewsMerger:
         return json_files
 
     def run(self, data_dir, output_filepath = None) -> str:   
+        with span("merger.run", data_dir=data_dir) as merge_span:
+            result = self._run(data_dir, output_filepath, merge_span)
+            merge_span.set_attribute("success", result)
+            return result
+
+    def _run(self, data_dir, output_filepath, merge_span):
         try:
             print(f"开始合并目录 {data_dir} 中的文件...")
             json_files = self._glob_news_files(data_dir)
             if not json_files:
-                print(f"在目录 {data_dir} 中未找到 *_news.json 文件")
+                print(f"在目录 {data_dir} 中未找到 *_news 文件")
                 return False
             print(f"找到 {len(json_files)} 个文件：")
             for file_path in json_files:
                 print(f"  - {os.path.basename(file_path)}")
+            if not output_filepath:
+                output_filepath = os.path.join(self.data_dir, self.output_file)
+            if self.output_format == "ndjson":
+                count = self._stream_news_files(json_files, output_filepath)
+                merge_span.set_attributes(files=len(json_files), news=count)
+                if count == 0:
+                    print("没有找到可合并的数据")
+                    return False
+                print(f"合并结果已保存到: {output_filepath}")
+                return True
             merged_data = self._merge_news_files(json_files)
+            merge_span.set_attributes(
+                files=len(json_files), news=len((merged_data or {}).get("news_list", []))
+            )
             if merged_data is None or "news_list" not in merged_data:
                 print("合并的数据为空")
                 return False
@@ -69,8 +113,6 @@ class NewsMerger:
                 print("没有找到可合并的数据")
                 return False
 
-            if not output_filepath:
-                output_filepath = os.path.join(self.data_dir, self.output_file)
             utils.save_to_json_file(merged_data, output_filepath)
             print(f"合并结果已保存到: {output_filepath}")
         except Exception as e:
@@ -9,9 +9,13 @@ import urllib.request
 import urllib.error
 import os
 import base64
+import sys
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.tracing import span
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -74,6 +78,15 @@ class GraphQLClient:
             encoded_credentials = base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
             headers["Authorization"] = f"Basic {encoded_credentials}"
 
+        with span(
+            "graphql.execute_query",
+            operation_name=operation_name or "",
+            query_bytes=len(query),
+            endpoint=self.endpoint,
+        ):
+            return self._post(payload, headers)
+
+    def _post(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
         try:
             # Prepare request data
             data = json.dumps(payload).encode("utf-8")
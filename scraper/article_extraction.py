@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文章页面单次提取 - 一次execute_script调用取回正文和元数据
+
+正文用 textContent 读取并在块级元素之间保留换行，不触发布局计算；发布时间取自
+meta标签、JSON-LD和<time>元素，同时返回作者、规范URL和正文字节数。
+normalize_article 在Python端整理为 ArticleRecord。
+"""
+
+from datetime import datetime
+import json
+import re
+
+from http_fetcher import normalize_text
+
+
+# 与 http_fetcher.BLOCK_TAGS/SKIP_TAGS 一致，浏览器和HTTP抓取得到相同格式的正文
+ARTICLE_EXTRACT_SCRIPT = """
+var bodySelector = arguments[0];
+var body = document.querySelector(bodySelector);
+if (!body) {
+    return null;
+}
+var BLOCK = /^(P|DIV|BR|LI|UL|OL|H[1-6]|TABLE|TR|SECTION|ARTICLE|BLOCKQUOTE|PRE)$/;
+var SKIP = /^(SCRIPT|STYLE|NOSCRIPT|IFRAME)$/;
+var parts = [];
+function walk(node) {
+    if (node.nodeType === 3) {
+        parts.push(node.nodeValue);
+        return;
+    }
+    if (node.nodeType !== 1 || SKIP.test(node.tagName)) {
+        return;
+    }
+    var block = BLOCK.test(node.tagName);
+    if (block) {
+        parts.push('\\n');
+    }
+    for (var child = node.firstChild; child; child = child.nextSibling) {
+        walk(child);
+    }
+    if (block) {
+        parts.push('\\n');
+    }
+}
+walk(body);
+var text = parts.join('');
+
+function meta(names) {
+    for (var i = 0; i < names.length; i++) {
+        var el = document.querySelector(
+            'meta[property="' + names[i] + '"], meta[name="' + names[i] + '"], meta[itemprop="' + names[i] + '"]'
+        );
+        if (el && el.getAttribute('content')) {
+            return el.getAttribute('content');
+        }
+    }
+    return null;
+}
+
+var jsonLd = [];
+var scripts = document.querySelectorAll('script[type="application/ld+json"]');
+for (var i = 0; i < scripts.length; i++) {
+    jsonLd.push(scripts[i].textContent);
+}
+var timeElement = document.querySelector('time[datetime]');
+var canonical = document.querySelector('link[rel="canonical"]');
+
+return JSON.stringify({
+    text: text,
+    bytes: new TextEncoder().encode(text).length,
+    publishedTime: meta([
+        'article:published_time', 'og:article:published_time', 'datePublished',
+        'publishdate', 'pubdate', 'publish_time'
+    ]),
+    timeElement: timeElement ? timeElement.getAttribute('datetime') : null,
+    author: meta(['author', 'article:author', 'og:article:author']),
+    canonical: canonical ? canonical.href : meta(['og:url']),
+    jsonLd: jsonLd
+});
+"""
+
+TIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y年%m月%d日 %H:%M:%S",
+    "%Y年%m月%d日 %H:%M",
+    "%Y-%m-%d",
+)
+
+
+class ArticleRecord:
+    """一篇文章的正文和元数据"""
+
+    def __init__(self, content, published_time=None, author=None, canonical_url=None, byte_size=0):
+        self.content = content
+        self.published_time = published_time
+        self.author = author
+        self.canonical_url = canonical_url
+        self.byte_size = byte_size
+
+
+def parse_publish_time(value):
+    """
+    解析发布时间，支持ISO 8601、Unix时间戳和常见的中文日期格式
+    :return: 本地时间的 datetime（不带时区），无法解析时返回None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) or re.fullmatch(r"\d{10}(\d{3})?", str(value).strip()):
+        timestamp = float(value)
+        if timestamp > 1e11:
+            timestamp /= 1000
+        return datetime.fromtimestamp(timestamp)
+    value = str(value).strip()
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        for time_format in TIME_FORMATS:
+            try:
+                return datetime.strptime(value, time_format)
+            except ValueError:
+                continue
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def _json_ld_objects(raw_scripts):
+    """展开JSON-LD脚本中的对象，包括列表和 @graph"""
+    for raw in raw_scripts or []:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            obj = pending.pop(0)
+            if not isinstance(obj, dict):
+                continue
+            pending.extend(obj.get("@graph") or [])
+            yield obj
+
+
+def _author_name(author):
+    if isinstance(author, list):
+        author = author[0] if author else None
+    if isinstance(author, dict):
+        author = author.get("name")
+    return author.strip() if isinstance(author, str) and author.strip() else None
+
+
+def normalize_article(raw):
+    """
+    整理 ARTICLE_EXTRACT_SCRIPT 的结果
+    发布时间依次取 meta标签、JSON-LD 的 datePublished、<time datetime>
+    :return: ArticleRecord，正文为空时返回None
+    """
+    if raw is None:
+        return None
+    content = normalize_text(raw.get("text") or "")
+    if not content:
+        return None
+
+    published_time = parse_publish_time(raw.get("publishedTime"))
+    author = _author_name(raw.get("author"))
+    canonical_url = raw.get("canonical")
+    for obj in _json_ld_objects(raw.get("jsonLd")):
+        if published_time is None:
+            published_time = parse_publish_time(obj.get("datePublished"))
+        if author is None:
+            author = _author_name(obj.get("author"))
+        if canonical_url is None and isinstance(obj.get("url"), str):
+            canonical_url = obj["url"]
+    if published_time is None:
+        published_time = parse_publish_time(raw.get("timeElement"))
+
+    return ArticleRecord(content, published_time, author, canonical_url or None, raw.get("bytes", 0))
+
+
+def extract_article(driver, body_selector):
+    """
+    在浏览器中一次性提取文章正文和元数据
+    :param driver: selenium WebDriver
+    :param body_selector: 正文容器的CSS选择器
+    :return: ArticleRecord，正文容器不存在或正文为空时返回None
+    """
+    result = driver.execute_script(ARTICLE_EXTRACT_SCRIPT, body_selector)
+    if result is None:
+        return None
+    return normalize_article(json.loads(result))
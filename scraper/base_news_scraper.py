@@ -1,12 +1,9 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import NoSuchElementException
+from concurrent.futures import ThreadPoolExecutor
+import json
+import queue
+import threading
 import time
 import os
 import sys
@@ -14,9 +11,38 @@ from abc import abstractmethod
 from datetime import datetime, timedelta
 from enum import Enum
 import traceback
+from urllib.parse import urlsplit
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import utils
+from utils.tracing import span, bind_context, current_span
+from utils.news_stream import (
+    NewsStreamWriter,
+    iter_news_file,
+    news_output_format,
+    save_stream_as_json,
+    stream_filename,
+)
+from browser_pool import get_browser_pool, BrowserPoolExhausted
+from http_fetcher import get_http_fetcher
+from http_cache import get_http_cache, HttpCacheStats
+from page_readiness import PageReadiness, ReadinessProfile
+from scroll_strategy import ScrollStrategy, scroll_list_page
+from list_extraction import extract_list_items
+from seen_urls import SeenUrlCache, ExistingUrlChecker
+from resource_blocking import DEFAULT_BLOCKING, apply_blocking_profile
+from fixtures import get_fixture_recorder, rewrite_url
+from checkpoint import SiteCheckpoint, checkpoint_enabled
+from retry_policy import ContentParseError, get_url_retrier
+from domain_scheduler import DomainRateLimit, get_domain_scheduler, politeness_enabled
+from article_extraction import ArticleRecord, extract_article
+from publish_time import find_publish_time, get_publish_time_index, time_resolution_enabled
+from xhr_feed import (
+    FeedCapture,
+    drain_performance_log,
+    merge_list_items,
+    xhr_feed_enabled,
+)
 
 
 class ListPageType(Enum):
@@ -25,145 +51,152 @@ class ListPageType(Enum):
 
 
 class BaseNewsScraper:
-    def __init__(self, hours_ago=3):
+    # 内容抓取工作线程租用额外浏览器的最长等待时间（秒）
+    CONTENT_WORKER_LEASE_TIMEOUT = 10
+    # 共用列表页面加载的抓取器组，见 page_groups.PageLoadGroup.register
+    page_load_group = None
+
+    def __init__(self, hours_ago=3, browser_pool=None):
+        self.hours_ago = hours_ago
         self.news_after_time = datetime.now() - timedelta(hours=hours_ago)
         self.data_dir = os.environ.get("DATA_DIR", ".")
-        self.page_load_timeout = int(os.environ.get("SELENIUM_PAGE_LOAD_TIMEOUT", "30"))
-        self.driver = None
-        self.setup_driver()
+        self.browser_pool = browser_pool or get_browser_pool()
+        self.http_fetcher = get_http_fetcher()
+        self.http_fetch_enabled = os.environ.get("HTTP_FETCH_ENABLED", "1") == "1"
+        # 新闻内容缓存（所有网站共享）和本网站的命中统计
+        self.http_cache = get_http_cache()
+        self.http_cache_stats = HttpCacheStats()
+        self._driver = None
+        # 并发抓取新闻内容的工作线程数，子类可按网站承受能力调整
+        self.content_concurrency = 1
+        # 本网站域名的请求速率和并发上限，子类可按网站承受能力调整
+        self.domain_rate_limit = DomainRateLimit()
+        # 内容抓取工作线程各自租用的浏览器
+        self._worker_local = threading.local()
+        self.page_readiness = PageReadiness()
+        # 抓取内容前跳过已入库的新闻
+        self.skip_existing_urls = os.environ.get("SKIP_EXISTING_URLS", "1") == "1"
+        self._seen_url_cache = None
+        # 最近一个列表页面中最早的新闻时间（过滤前），用于提前结束翻页
+        self.last_list_page_oldest_time = None
+        # 逐条写入已完成新闻的NDJSON流
+        self._news_stream = None
+        self._news_stream_lock = threading.Lock()
+        # 抓取断点，scrape_news 开始时读取
+        self.checkpoint = None
+        # 本网站用到的文章发布时间索引，抓取结束时保存
+        self._publish_time_indexes = set()
+        # 文章页面提取到的元数据，写入新闻时取用
+        self._article_metadata = {}
+        self._article_metadata_lock = threading.Lock()
 
-    def setup_driver(self):
-        """设置Chrome浏览器驱动 - Linux无头模式优化"""
-        chrome_options = Options()
-
-        # 强制无头模式
-        chrome_options.add_argument("--headless")
-
-        # Linux服务器环境优化参数
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-software-rasterizer")
-        chrome_options.add_argument("--disable-background-timer-throttling")
-        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-        chrome_options.add_argument("--disable-renderer-backgrounding")
-        chrome_options.add_argument("--disable-features=TranslateUI")
-        chrome_options.add_argument("--disable-ipc-flooding-protection")
-
-        # 内存和性能优化
-        chrome_options.add_argument("--memory-pressure-off")
-        chrome_options.add_argument("--max_old_space_size=4096")
-        chrome_options.add_argument("--window-size=1920,1080")
-
-        # 网络优化
-        chrome_options.add_argument("--aggressive-cache-discard")
-        chrome_options.add_argument("--disable-background-networking")
-
-        # 用户代理
-        chrome_options.add_argument(
-            "--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        # 禁用图片加载以提高速度（可选）
-        prefs = {
-            "profile.managed_default_content_settings.images": 2,
-            "profile.default_content_setting_values.notifications": 2,
-            "profile.managed_default_content_settings.media_stream": 2,
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
+    @property
+    def driver(self):
+        """浏览器驱动，首次使用时才从浏览器池租用"""
+        worker_driver = getattr(self._worker_local, "driver", None)
+        if worker_driver is not None:
+            return worker_driver
+        if getattr(self._worker_local, "owns_driver", False):
+            # 内容抓取工作线程使用单独租用的浏览器
+            self._worker_local.driver = self.browser_pool.lease(
+                timeout=self.CONTENT_WORKER_LEASE_TIMEOUT
+            )
+            return self._worker_local.driver
+        if self._driver is None:
+            self.setup_driver()
+        return self._driver
 
-        # 禁用扩展和插件
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")
+    @driver.setter
+    def driver(self, driver):
+        self._driver = driver
 
-        try:
-            # 使用webdriver-manager自动管理ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            # Set page load timeout from environment variable
-            self.driver.set_page_load_timeout(self.page_load_timeout)
-            print(f"Chrome浏览器驱动初始化成功 (无头模式, 页面加载超时: {self.page_load_timeout}秒)")
-        except Exception as e:
-            print(f"初始化Chrome驱动失败: {e}")
-            print("请确保已安装Chrome浏览器")
-            raise
+    def setup_driver(self):
+        """从浏览器池租用Chrome浏览器驱动"""
+        # 内容抓取工作线程只打开文章页面，不需要performance日志
+        self._driver = self.browser_pool.lease(feed=self.reads_list_feed())
+        print(f"Chrome浏览器驱动租用成功 (无头模式, 页面加载超时: {self.browser_pool.page_load_timeout}秒)")
 
-    def wait_for_javascript_completion(self):
-        """等待JavaScript执行完成"""
-        print("等待JavaScript执行完成...")
-        try:
-            # 等待jQuery加载完成（如果页面使用jQuery）
-            WebDriverWait(self.driver, 10).until(
-                lambda driver: driver.execute_script(
-                    "return typeof jQuery !== 'undefined' ? jQuery.active == 0 : true"
-                )
-            )
-        except TimeoutException:
-            print("jQuery检查超时，继续执行...")
+    def open_url(self, url, read_feed=False):
+        """
+        在当前浏览器中打开页面，并计入浏览器池的页面数
+        :param read_feed: 打开的是需要读取列表接口响应的列表页面
+        """
+        self.recycle_driver_if_needed()
+        self.page_readiness.install_network_tracker(self.driver)
+        apply_blocking_profile(self.driver, self.get_resource_blocking_profile())
+        recorder = get_fixture_recorder()
+        if recorder:
+            # 离开上一个页面前保存它加载的响应
+            recorder.capture_browser(self.driver)
+        elif read_feed:
+            # 丢弃之前页面的performance日志，接口抓取只读取本页面的请求
+            drain_performance_log(self.driver)
+        with self.domain_slot(url), span("browser.get", url=url):
+            self.driver.get(rewrite_url(url))
+        self.browser_pool.record_page(self.driver)
 
-        # 等待页面状态稳定
-        try:
-            WebDriverWait(self.driver, 10).until(
-                lambda driver: driver.execute_script("return document.readyState")
-                == "complete"
-            )
-        except TimeoutException:
-            print("页面状态检查超时，继续执行...")
+    def recycle_driver_if_needed(self):
+        """
+        浏览器达到页面数或内存上限时归还给浏览器池回收，换用新租用的浏览器
+        在打开页面前检查，接下来的页面直接在新浏览器中加载
+        """
+        driver = self.driver
+        if not self.browser_pool.needs_recycle(driver):
+            return
+        if getattr(self._worker_local, "driver", None) is driver:
+            self._worker_local.driver = None
+        elif self._driver is driver:
+            self._driver = None
+        else:
+            return
+        # 下次访问 self.driver 时重新租用
+        self.browser_pool.release(driver)
 
-        # 额外等待时间确保动态内容加载
-        time.sleep(2)
+    def wait_for_javascript_completion(self, profile=None, phase="javascript"):
+        """
+        等待页面就绪，条件满足后立即返回
+        :param profile: ReadinessProfile，默认等待文档加载完成且jQuery请求结束
+        :param phase: 阶段名称，用于统计等待时间
+        """
+        print("等待JavaScript执行完成...")
+        if profile is None:
+            profile = ReadinessProfile()
+        self.page_readiness.wait_until_ready(self.driver, profile, phase)
         print("JavaScript执行完成")
 
     def scroll_to_load_content(self):
-        """滚动页面以触发懒加载内容"""
-        print("滚动页面以触发懒加载...")
+        """按本网站的滚动策略滚动页面以触发懒加载内容"""
+        strategy = self.get_scroll_strategy()
+        if strategy.mode == ScrollStrategy.NONE:
+            return
+        print(f"滚动页面以触发懒加载 ({strategy.mode})...")
         try:
-            # 多次滚动以触发所有可能的懒加载
-            for i in range(3):
-                print(f"滚动尝试 {i+1}/3")
-
-                # 获取页面高度
-                last_height = self.driver.execute_script(
-                    "return document.body.scrollHeight"
-                )
-
-                # 滚动到页面底部
-                self.driver.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight);"
-                )
-                time.sleep(1)  # 增加等待时间
-
-                # 检查是否有新内容加载
-                new_height = self.driver.execute_script(
-                    "return document.body.scrollHeight"
-                )
-                if new_height > last_height:
-                    print(
-                        f"检测到新内容加载，页面高度从 {last_height} 增加到 {new_height}"
-                    )
-                    time.sleep(2)
-                else:
-                    print("未检测到新内容加载")
-
-                # 尝试滚动到中间位置
-                self.driver.execute_script(
-                    "window.scrollTo(0, document.body.scrollHeight/2);"
-                )
-                time.sleep(1)
-
-            # 滚动回顶部
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
-
+            scroll_list_page(
+                self.driver,
+                strategy,
+                self.page_readiness,
+                item_selector=self.get_list_item_selector(),
+                reached_cutoff=self.load_more_reached_cutoff,
+            )
         except Exception as e:
             print(f"滚动操作失败: {e}")
 
-    def close(self):
-        """关闭浏览器"""
-        if self.driver:
-            self.driver.quit()
-            print("浏览器已关闭")
+    def get_list_item_selector(self):
+        """列表页面中新闻项的CSS选择器，取自批量提取选择器或就绪条件"""
+        selectors = self.get_list_item_selectors()
+        if selectors and selectors.get("item"):
+            return selectors["item"]
+        return self.get_list_readiness_profile().item_selector
+
+    def close(self, discard=False):
+        """
+        将浏览器归还到浏览器池
+        :param discard: 为True时关闭浏览器而不是放回池中复用
+        """
+        if self._driver:
+            self.browser_pool.release(self._driver, discard=discard)
+            self._driver = None
+            print("浏览器已归还浏览器池")
 
     def save_to_json_file(self, news_list, filename=None):
         """
@@ -189,15 +222,143 @@ class BaseNewsScraper:
             print(f"保存抓取文件失败: {e}")
             return None
 
+    def get_news_stream_filepath(self):
+        return os.path.join(self.data_dir, stream_filename(self.get_json_filename()))
+
+    def open_news_stream(self, news_list, resumed_news=None):
+        """
+        开始本次抓取的NDJSON流，之后新闻按列表顺序逐条追加
+        :param news_list: 本次抓取的全部新闻（列表顺序），决定写入流的顺序
+        :param resumed_news: 从断点取回的已完成新闻
+        """
+        self._news_stream = NewsStreamWriter(self.get_news_stream_filepath())
+        # URL -> 列表中的位置；先完成的新闻暂存，等它之前的新闻都写入后再写
+        self._stream_positions = {}
+        for news in news_list:
+            self._stream_positions.setdefault(news["url"], len(self._stream_positions))
+        self._stream_next_position = 0
+        self._stream_held = {}
+        for news_item in resumed_news or []:
+            self._write_in_list_order(news_item)
+        return self._news_stream
+
+    def write_news_item(self, news_item):
+        """把已完成（抓取到内容或已放弃）的新闻按列表顺序写入流，写入后抓取到内容的记入断点"""
+        self.apply_article_metadata(news_item)
+        if self._news_stream is None:
+            self._mark_news_fetched([news_item])
+        else:
+            self._write_in_list_order(news_item)
+
+    def _write_in_list_order(self, news_item):
+        with self._news_stream_lock:
+            position = self._stream_positions.get(news_item["url"])
+            if position is None or position < self._stream_next_position:
+                # 不在列表中或重复的URL，直接写入
+                written = [news_item]
+            else:
+                self._stream_held[position] = news_item
+                written = []
+                while self._stream_next_position in self._stream_held:
+                    written.append(self._stream_held.pop(self._stream_next_position))
+                    self._stream_next_position += 1
+            for item in written:
+                self._news_stream.write(item)
+        self._mark_news_fetched(written)
+
+    def _flush_held_news(self):
+        """把暂存的新闻按列表顺序全部写入流"""
+        with self._news_stream_lock:
+            written = [self._stream_held[position] for position in sorted(self._stream_held)]
+            self._stream_held = {}
+            for item in written:
+                self._news_stream.write(item)
+        self._mark_news_fetched(written)
+
+    def _mark_news_fetched(self, news_items):
+        # 只记录已写入流的新闻，续抓时才能从流中取回
+        if self.checkpoint is None:
+            return
+        for news_item in news_items:
+            if news_item.get("content"):
+                self.checkpoint.mark_fetched(news_item["url"])
+
+    def apply_article_metadata(self, news_item):
+        """列表中没有时间的新闻使用文章页面的发布时间，并补充作者和规范URL"""
+        with self._article_metadata_lock:
+            record = self._article_metadata.pop(news_item["url"], None)
+        if record is None:
+            return
+        if record.published_time:
+            self.learn_publish_time(news_item["url"], record.published_time)
+            if not news_item.get("time"):
+                news_item["time"] = record.published_time.strftime("%Y-%m-%d %H:%M:%S")
+        if record.author:
+            news_item["author"] = record.author
+        if record.canonical_url and record.canonical_url != news_item["url"]:
+            news_item["canonical_url"] = record.canonical_url
+
+    def abort_news_stream(self):
+        """抓取异常时关闭流但保留文件，重试时从断点取回已完成的新闻"""
+        if self._news_stream is not None:
+            self._flush_held_news()
+        stream, self._news_stream = self._news_stream, None
+        if stream is not None:
+            stream.close()
+
+    def finish_news_stream(self):
+        """
+        结束NDJSON流，NEWS_OUTPUT_FORMAT=json 时由流文件生成原来的JSON格式并删除流文件
+        :return: 输出文件路径，失败返回None
+        """
+        if self._news_stream is not None:
+            self._flush_held_news()
+        stream, self._news_stream = self._news_stream, None
+        if stream is None:
+            return None
+        stream.close()
+        if news_output_format() == "ndjson":
+            print(f"已写入 {stream.count} 条新闻: {stream.filepath}")
+            return stream.filepath
+        try:
+            output_filepath = os.path.join(self.data_dir, self.get_json_filename())
+            save_stream_as_json(stream.filepath, output_filepath)
+            os.remove(stream.filepath)
+            return output_filepath
+        except Exception as e:
+            print(f"保存抓取文件失败: {e}")
+            return None
+
     def click_load_more_button(self):
         pass
 
+    def load_more_reached_cutoff(self):
+        """
+        判断已加载的最后一条新闻是否早于截止时间，是则无需继续点击"加载更多"
+        只在配置了批量提取选择器时检查，只取回最后一个新闻项
+        """
+        selectors = self.get_list_item_selectors()
+        if not selectors:
+            return False
+        try:
+            records = extract_list_items(self.driver, dict(selectors, last_only=True))
+            if not records:
+                return False
+            news_time = self.parse_list_item_record(records[-1])[3]
+        except Exception as e:
+            print(f"检查最后一条新闻时间失败: {e}")
+            return False
+        if news_time is not None and news_time <= self.news_after_time:
+            print(f"最后一条新闻时间 {news_time} 已早于截止时间，停止加载更多")
+            return True
+        return False
+
     def scrape_news_list(self, url=None, news_after_time=None):
         """
         抓取指定页面的新闻标题和链接
+        支持HTTP抓取的网站先尝试静态解析，解析不到新闻时回退到浏览器
         :param url: 目标页面URL
         :param news_after_time: 新闻时间过滤条件
-        :param load_more_clicks: 点击"加载更多"按钮的次数，默认为3次
         :return: 包含新闻标题和链接的列表
         """
         if url is None:
@@ -205,130 +366,754 @@ class BaseNewsScraper:
         if news_after_time is None:
             news_after_time = self.news_after_time
 
+        with span("scraper.list_page", url=url) as list_span:
+            if self.http_fetch_enabled and self.supports_http_fetch():
+                news_list = self.scrape_news_list_http(url, news_after_time)
+                if news_list:
+                    list_span.set_attributes(source="http", items=len(news_list))
+                    return news_list
+                print("静态页面未解析到新闻，回退到浏览器抓取")
+
+            news_list = self.scrape_news_list_browser(url, news_after_time)
+            list_span.set_attributes(source="browser", items=len(news_list or []))
+            return news_list
+
+    def scrape_news_list_http(self, url, news_after_time):
+        """通过HTTP请求抓取并解析静态列表页面"""
         try:
-            print(f"正在访问页面: {url}")
-            self.driver.get(url)
+            with self.domain_slot(url):
+                doc = self.http_fetcher.fetch_document(url)
+            parsed_items = self.parse_list_page_document(doc)
+            if not parsed_items:
+                return []
+            print(f"在静态列表页面中找到 {len(parsed_items)} 个新闻项")
+            return self.filter_news_items(parsed_items, news_after_time)
+        except Exception as e:
+            print(f"HTTP抓取列表页面失败: {e}")
+            return []
 
-            # 等待页面完全加载，包括JavaScript执行
-            print("等待页面完全加载...")
-            time.sleep(3)  # 初始等待时间
+    def scrape_news_list_browser(self, url, news_after_time):
+        """通过浏览器渲染页面并解析列表"""
+        try:
+            if self.page_load_group is not None and self.page_load_group.is_shared(self):
+                # 与组内其他抓取器共用一次页面加载
+                parsed_items = self.page_load_group.list_page_items(self, url)
+            else:
+                print(f"正在访问页面: {url}")
+                self.open_url(url, read_feed=self.uses_xhr_feed())
+                parsed_items = self.render_list_page()
+            if parsed_items is None:
+                return []
+            return self.filter_news_items(parsed_items, news_after_time)
 
-            # 等待JavaScript执行完成
-            self.wait_for_javascript_completion()
+        except Exception as e:
+            print(f"抓取过程中发生错误: {e}")
+            return []
 
-            # 尝试滚动页面以触发懒加载
-            self.scroll_to_load_content()
+    def render_list_page(self):
+        """
+        在已打开的列表页面上等待就绪、展开并解析
+        :return: (title, url, source, time) 元组列表，查找失败返回None
+        """
+        # 等待页面就绪，包括JavaScript执行和列表渲染
+        print("等待页面完全加载...")
+        self.wait_for_javascript_completion(
+            self.get_list_readiness_profile(), phase="list_page"
+        )
 
-            # # 额外等待，尝试让更多内容加载
-            # print("额外等待以加载更多内容...")
-            # time.sleep(3)
+        feed_items = self.scrape_list_feed()
+        if feed_items is not None:
+            # 已渲染的新闻与接口结果合并，接口翻页代替"加载更多"
+            return merge_list_items(self.parse_list_page(), feed_items)
 
-            # 循环点击"加载更多"按钮
-            if self.get_list_page_type() == ListPageType.LOAD_MORE:
-                self.click_load_more_button()
-            elif self.get_list_page_type() == ListPageType.PAGINATION:
-                pass
-            else:
-                raise Exception("Invalid list page type")
+        self.expand_list_page()
 
-            news_list = []
-            try:
-                print("查找列表页面中的新闻项...")
-                news_items = self.find_items_in_list_page()
-                print(f"在列表页面中找到 {len(news_items)} 个新闻项")
+        return self.parse_list_page()
 
-                for item in news_items:
-                    title, url, source, news_time = self.parse_list_page_item(item)
-                    if title is None or url is None or source is None:
-                        continue
-                    if news_after_time and news_time:
-                        if news_time <= news_after_time:
-                            continue
-
-                    news_item = {
-                        "title": title,
-                        "url": url,
-                        "source": source,
-                    }
-                    if news_time:
-                        news_item["time"] = news_time.strftime("%Y-%m-%d %H:%M:%S")
-                    news_list.append(news_item)
-                    print(f"找到新闻: {title} (时间: {news_time})")
-
-            except NoSuchElementException as e:
-                print(f"未找到HTML标签或类名, {e}")
-                print(f"完整栈信息:\n{traceback.format_exc()}")
-                return []
+    def scrape_list_feed(self):
+        """
+        从列表页面的JSON接口读取新闻，并按接口翻页直到截止时间
+        :return: FeedItem 列表，本网站没有接口或未捕获到接口响应时返回None
+        """
+        if not self.uses_xhr_feed():
+            return None
+        feed = self.get_xhr_feed()
+        try:
+            capture = FeedCapture(self.driver, feed.url_pattern)
+            captured = capture.poll()
+            # 接口响应仍在传输时等待其完成；首屏由服务端渲染时，触发一次接口请求以取得接口地址和参数
+            if not captured and (capture.has_pending or self.trigger_feed_request()):
+                def response_captured():
+                    captured.extend(capture.poll())
+                    return captured
+
+                self.page_readiness.wait_for(
+                    response_captured, timeout=feed.capture_timeout, phase="xhr_feed"
+                )
+        except Exception as e:
+            print(f"捕获列表接口响应失败: {e}，使用页面解析")
+            return None
+        if not captured:
+            print("未捕获到列表接口响应，使用页面解析")
+            return None
 
+        try:
+            items = []
+            for response in captured:
+                items.extend(self.parse_feed_response(response.data))
+        except Exception as e:
+            print(f"解析列表接口响应失败: {e}，使用页面解析")
+            return None
+        if not items:
+            print("列表接口响应中没有新闻，使用页面解析")
+            return None
+
+        with span("scraper.xhr_feed", url=captured[-1].url) as feed_span:
+            # 从最后一个捕获的响应继续翻页，沿用浏览器发出请求时的请求头
+            url, data, headers = captured[-1].url, captured[-1].data, captured[-1].request_headers
+            page_items = self.parse_feed_response(data)
+            pages = 0
+            while pages < feed.max_pages and not self.feed_reached_cutoff(page_items):
+                url = self.next_feed_page_url(url, data, page_items)
+                if not url:
+                    break
+                try:
+                    data = get_url_retrier().call(url, self.fetch_feed_page, url, headers)
+                except Exception as e:
+                    print(f"请求列表接口失败: {url}: {e}")
+                    break
+                try:
+                    page_items = self.parse_feed_response(data)
+                except Exception as e:
+                    print(f"解析列表接口响应失败: {url}: {e}")
+                    break
+                if not page_items:
+                    break
+                items.extend(page_items)
+                pages += 1
+            feed_span.set_attributes(captured=len(captured), pages=pages, items=len(items))
+
+        print(f"从列表接口读取 {len(items)} 条新闻 (捕获 {len(captured)} 个响应, 翻页 {pages} 次)")
+        for item in items:
+            if item.time is not None:
+                self.learn_publish_time(item.url, item.time)
+        self.cache_feed_contents(items)
+        return items
+
+    def fetch_feed_page(self, url, headers=None):
+        """通过HTTP请求列表接口的一页，:return: 解析后的JSON"""
+        with self.domain_slot(url):
+            page = self.http_fetcher.fetch(url, headers=headers)
+        return json.loads(page.text)
+
+    def feed_reached_cutoff(self, page_items):
+        """接口一页中最早的新闻已早于截止时间时停止翻页"""
+        times = [item.time for item in page_items if item.time is not None]
+        return bool(times) and min(times) <= self.news_after_time
+
+    def cache_feed_contents(self, items):
+        """接口直接给出正文的新闻写入内容缓存，抓取内容时不再请求文章页面"""
+        if self.http_cache is None:
+            return
+        for item in items:
+            if not item.content:
+                continue
+            try:
+                self.http_cache.put(item.url, item.content)
             except Exception as e:
-                print(f"查找HTML标签或类名失败: {e}")
-                print(f"完整栈信息:\n{traceback.format_exc()}")
-                return []
+                print(f"保存内容缓存失败: {e}")
+                return
+
+    def expand_list_page(self):
+        """滚动页面并点击"加载更多"，让列表加载出更多新闻"""
+        # 尝试滚动页面以触发懒加载
+        self.scroll_to_load_content()
+
+        # 循环点击"加载更多"按钮
+        if self.get_list_page_type() == ListPageType.LOAD_MORE:
+            self.click_load_more_button()
+        elif self.get_list_page_type() == ListPageType.PAGINATION:
+            pass
+        else:
+            raise Exception("Invalid list page type")
 
-            # 去重和排序
-            unique_news = []
-            seen_titles = set()
+    def parse_list_page(self):
+        """
+        解析当前已渲染的列表页面，优先批量提取
+        :return: (title, url, source, time) 元组列表，查找失败返回None
+        """
+        parsed_items = self.parse_list_page_batch()
+        if parsed_items:
+            return parsed_items
+
+        try:
+            print("查找列表页面中的新闻项...")
+            news_items = self.find_items_in_list_page()
+            print(f"在列表页面中找到 {len(news_items)} 个新闻项")
+            return [self.parse_list_page_item(item) for item in news_items]
 
-            for news in news_list:
-                if news["title"] not in seen_titles:
-                    unique_news.append(news)
-                    seen_titles.add(news["title"])
+        except NoSuchElementException as e:
+            print(f"未找到HTML标签或类名, {e}")
+            print(f"完整栈信息:\n{traceback.format_exc()}")
+            return None
 
-            print(f"去重后共找到 {len(unique_news)} 条新闻")
-            return unique_news
+        except Exception as e:
+            print(f"查找HTML标签或类名失败: {e}")
+            print(f"完整栈信息:\n{traceback.format_exc()}")
+            return None
 
+    def parse_list_page_batch(self):
+        """
+        批量提取当前列表页面中的新闻项，只需一次浏览器往返
+        :return: (title, url, source, time) 元组列表，不支持或提取失败时返回None
+        """
+        selectors = self.get_list_item_selectors()
+        if not selectors:
+            return None
+        try:
+            records = extract_list_items(self.driver, selectors)
+            if not records:
+                print("批量提取未找到新闻项，回退到逐个元素解析")
+                return None
+            print(f"批量提取到 {len(records)} 个新闻项")
+            return [self.parse_list_item_record(record) for record in records]
         except Exception as e:
-            print(f"抓取过程中发生错误: {e}")
-            return []
+            print(f"批量提取新闻项失败: {e}，回退到逐个元素解析")
+            return None
+
+    def filter_news_items(self, parsed_items, news_after_time):
+        """
+        过滤、转换并去重解析出的新闻项
+        :param parsed_items: (title, url, source, time) 元组列表
+        :param news_after_time: 新闻时间过滤条件
+        :return: 新闻字典列表
+        """
+        news_times = [item[3] for item in parsed_items if item[3] is not None]
+        if news_times:
+            self.last_list_page_oldest_time = min(news_times)
+
+        news_list = []
+        for title, url, source, news_time in parsed_items:
+            if title is None or url is None or source is None:
+                continue
+            if news_after_time and news_time:
+                if news_time <= news_after_time:
+                    continue
+
+            news_item = {
+                "title": title,
+                "url": url,
+                "source": source,
+            }
+            if news_time:
+                news_item["time"] = news_time.strftime("%Y-%m-%d %H:%M:%S")
+            news_list.append(news_item)
+            print(f"找到新闻: {title} (时间: {news_time})")
+
+        # 去重和排序
+        unique_news = []
+        seen_titles = set()
+
+        for news in news_list:
+            if news["title"] not in seen_titles:
+                unique_news.append(news)
+                seen_titles.add(news["title"])
+
+        print(f"去重后共找到 {len(unique_news)} 条新闻")
+        return unique_news
+
+    def fetch_news_content(self, url):
+        """
+        按URL重试策略抓取新闻内容，超时、连接错误和5xx会退避重试，网站熔断时直接跳过
+        :raise: 不再重试时抛出最后一次的异常
+        """
+        def fetch():
+            return get_url_retrier().call(url, self.scrape_news_content, url)
+
+        if self.page_load_group is not None and self.page_load_group.is_shared(self):
+            # 组内其他抓取器正在或已经抓取的URL直接共用结果，连同文章页面的元数据
+            record = self.page_load_group.fetch_content(url, lambda: self.fetch_article_record(url, fetch))
+            self.store_article_metadata(url, record)
+            return record.content
+        return fetch()
+
+    def fetch_article_record(self, url, fetch):
+        """
+        抓取内容并取回提取到的元数据
+        :return: ArticleRecord，内容来自缓存或HTTP抓取时不含元数据
+        """
+        content = fetch()
+        with self._article_metadata_lock:
+            record = self._article_metadata.get(url)
+        if record is None or record.content != content:
+            record = ArticleRecord(content)
+        return record
+
+    def store_article_metadata(self, url, record):
+        """保存文章页面的元数据，写入新闻时由 apply_article_metadata 取用"""
+        if record.published_time or record.author or record.canonical_url:
+            with self._article_metadata_lock:
+                self._article_metadata[url] = record
 
     def scrape_news_content(self, url):
-        try:
-            print(f"正在访问页面: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-            self.wait_for_javascript_completion()
-            # self.scroll_to_load_content()
-            # time.sleep(1)
-            content = self.parse_content()
-            if content is None:
-                raise Exception("Content is None")
+        with span("scraper.content", url=url) as content_span:
+            content = self.get_cached_content(url)
+            if content:
+                content_span.set_attribute("source", "cache")
+                return content
+            content = self.scrape_news_content_http(url)
+            if content:
+                content_span.set_attribute("source", "http")
+                return content
+            content_span.set_attribute("source", "browser")
+            content = self.scrape_news_content_browser(url)
+            if content:
+                self.cache_content(url, content)
+            content_span.set_attribute("found", bool(content))
             return content
-        except NoSuchElementException:
-            print("未找到指定的HTML标签或类名")
+
+    def get_cached_content(self, url):
+        """
+        :return: 缓存中未过期的新闻内容，没有时返回None
+        """
+        if self.http_cache is None:
+            return None
+        try:
+            entry = self.http_cache.get(url)
+        except Exception as e:
+            print(f"读取内容缓存失败: {e}")
+            return None
+        if entry is None or not entry.is_fresh(self.http_cache.fresh_seconds):
             return None
+        print(f"使用缓存的新闻内容: {url}")
+        self.http_cache_stats.record_hit(entry)
+        return entry.content
+
+    def cache_content(self, url, content, page=None):
+        """
+        保存新抓取到的新闻内容
+        :param page: HTTP抓取时的HttpPage，提供条件请求所需的校验信息
+        """
+        size = page.size if page else 0
+        self.http_cache_stats.record_miss(size)
+        if self.http_cache is None:
+            return
+        try:
+            if page:
+                self.http_cache.put(url, content, page.etag, page.last_modified, size)
+            else:
+                self.http_cache.put(url, content)
         except Exception as e:
-            print(f"抓取新闻内容失败: {e}")
+            print(f"保存内容缓存失败: {e}")
+
+    def scrape_news_content_http(self, url):
+        """
+        通过HTTP请求抓取静态内容页面
+        :return: 新闻内容，不支持HTTP抓取或解析失败时返回None
+        """
+        if not (self.http_fetch_enabled and self.supports_http_fetch()):
             return None
+        try:
+            # 缓存已过期的新闻发送条件请求，未修改时继续使用缓存内容
+            entry = self.http_cache.get(url) if self.http_cache else None
+            with self.domain_slot(url):
+                page = self.http_fetcher.fetch(url, headers=entry.validators() if entry else None)
+            if page.not_modified and entry:
+                self.http_cache.touch(entry)
+                self.http_cache_stats.record_revalidated(entry)
+                return entry.content
+            content = self.parse_content_document(page.document())
+            if content:
+                self.cache_content(url, content, page)
+                return content
+            print("静态页面未解析到新闻内容，回退到浏览器抓取")
+        except Exception as e:
+            # 新闻已不存在时浏览器也打不开，交给重试策略按4xx处理
+            if getattr(getattr(e, "response", None), "status_code", None) in (404, 410):
+                raise
+            print(f"HTTP抓取新闻内容失败: {e}，回退到浏览器抓取")
+        return None
+
+    def scrape_news_content_browser(self, url):
+        """
+        通过浏览器渲染并解析内容页面
+        超时和浏览器错误直接抛出，由重试策略决定是否重试
+        :raise ContentParseError: 页面已加载但未解析到内容
+        """
+        print(f"正在访问页面: {url}")
+        self.open_url(url)
+        self.wait_for_javascript_completion(
+            self.get_content_readiness_profile(), phase="content_page"
+        )
+        try:
+            content = self.extract_content(url)
+        except NoSuchElementException as e:
+            raise ContentParseError(f"未找到指定的HTML标签或类名: {e.msg}") from e
+        if content is None:
+            raise ContentParseError("Content is None")
+        return content
+
+    def extract_content(self, url):
+        """
+        解析当前已打开的内容页面
+        配置了正文选择器时一次脚本调用取回正文和元数据，否则使用 parse_content
+        """
+        selector = self.get_content_selector()
+        if selector is None:
+            return self.parse_content()
+        record = extract_article(self.driver, selector)
+        if record is None:
+            return None
+        current_span().set_attributes(bytes=record.byte_size, published=bool(record.published_time))
+        self.store_article_metadata(url, record)
+        return record.content
+
+    def print_news_list(self, news_list):
+        print(f"\n成功抓取到 {len(news_list)} 条新闻:")
+        for i, news in enumerate(news_list, 1):
+            print(f"{i}. {news['title']}")
+            print(f"   链接: {news['url']}")
+            if "time" in news:
+                print(f"   时间: {news['time']}")
+            else:
+                print("   时间: 未知")
+            print(f"   来源: {news['source']}")
+            print()
+
+    def list_page_reached_cutoff(self):
+        """最近一个列表页面中最早的新闻是否已早于截止时间，是则无需继续翻页"""
+        oldest_time = self.last_list_page_oldest_time
+        if oldest_time is not None and oldest_time <= self.news_after_time:
+            print(f"本页最早的新闻时间 {oldest_time} 已早于截止时间，停止翻页")
+            return True
+        return False
+
+    def load_checkpoint(self):
+        """
+        读取本网站的抓取断点，CHECKPOINT_ENABLED=0 时不使用断点
+        :return: SiteCheckpoint 或 None
+        """
+        if not checkpoint_enabled():
+            self.checkpoint = None
+            return None
+        name = os.path.splitext(self.get_json_filename())[0]
+        filepath = os.path.join(self.data_dir, "checkpoints", f"{name}.json")
+        self.checkpoint = SiteCheckpoint.load(filepath, self.hours_ago)
+        if self.checkpoint.resumed:
+            print(
+                f"从断点继续抓取: 已完成 {len(self.checkpoint.list_pages)} 个列表页面, "
+                f"{len(self.checkpoint.news)} 条新闻, {len(self.checkpoint.fetched_urls)} 条已抓到内容"
+            )
+        return self.checkpoint
+
+    def iter_pending_list_page_urls(self):
+        """按需生成尚未完成的列表页面URL，跳过断点中已完成的页面"""
+        if self.checkpoint is None:
+            yield from self.iter_list_page_urls()
+            return
+        if self.checkpoint.list_complete or self.checkpoint.reached_cutoff:
+            return
+        done = set(self.checkpoint.list_pages)
+        for url in self.iter_list_page_urls():
+            if url not in done:
+                yield url
+
+    def checkpoint_news(self):
+        """:return: 断点中已发现的新闻列表"""
+        return list(self.checkpoint.news) if self.checkpoint else []
+
+    def checkpoint_list_page(self, url, news_list, reached_cutoff=False):
+        """:param reached_cutoff: 该页面已到达截止时间，续抓时不再翻页"""
+        if self.checkpoint is not None:
+            self.checkpoint.add_list_page(url, news_list, reached_cutoff)
+
+    def checkpoint_news_list(self, news_list):
+        """列表页面全部完成，记录待抓取内容的新闻列表"""
+        if self.checkpoint is not None:
+            self.checkpoint.complete_list(news_list)
+
+    def split_resumed_news(self, news_list):
+        """
+        从上次的NDJSON流中取回断点记录为已抓到内容的新闻
+        :return: (已完成的新闻, 待抓取内容的新闻)
+        """
+        if self.checkpoint is None or not self.checkpoint.fetched_urls:
+            return [], news_list
+        fetched = {}
+        try:
+            for news_item in iter_news_file(self.get_news_stream_filepath()):
+                if news_item.get("content") and news_item["url"] in self.checkpoint.fetched_urls:
+                    fetched[news_item["url"]] = news_item
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"读取上次的新闻流失败: {e}")
+        resumed = [fetched[news["url"]] for news in news_list if news["url"] in fetched]
+        pending = [news for news in news_list if news["url"] not in fetched]
+        if resumed:
+            print(f"从断点取回 {len(resumed)} 条已抓到内容的新闻，待抓取 {len(pending)} 条")
+        return resumed, pending
+
+    def finish_checkpoint(self):
+        """网站抓取成功，删除断点"""
+        if self.checkpoint is not None:
+            self.checkpoint.remove()
+            self.checkpoint = None
 
     def scrape_news(self):
-        merged_news_list = []
-
-        list_page_urls = self.get_list_page_urls()
-        for list_page_url in list_page_urls:
-            news_list = self.scrape_news_list(list_page_url)
-            if news_list:
-                print(f"\n成功抓取到 {len(news_list)} 条新闻:")
-                for i, news in enumerate(news_list, 1):
-                    print(f"{i}. {news['title']}")
-                    print(f"   链接: {news['url']}")
-                    if "time" in news:
-                        print(f"   时间: {news['time']}")
-                    else:
-                        print("   时间: 未知")
-                    print(f"   来源: {news['source']}")
-                    print()
+        site = os.path.splitext(self.get_json_filename())[0]
+        with span("scraper.scrape_news", site=site) as scrape_span:
+            self.load_checkpoint()
+            merged_news_list = self.checkpoint_news()
+            list_pages = 0
+
+            # 列表页面按需生成，某一页最早的新闻早于截止时间后不再翻页
+            for list_page_url in self.iter_pending_list_page_urls():
+                self.last_list_page_oldest_time = None
+                list_pages += 1
+                news_list = self.scrape_news_list(list_page_url)
+                if not news_list:
+                    print("未找到任何新闻")
+                    break
+                self.print_news_list(news_list)
                 merged_news_list.extend(news_list)
-            else:
-                print("未找到任何新闻")
-                break
+                reached_cutoff = self.list_page_reached_cutoff()
+                self.checkpoint_list_page(list_page_url, news_list, reached_cutoff)
+                if reached_cutoff:
+                    break
+
+            listed = len(merged_news_list)
+            if not (self.checkpoint and self.checkpoint.list_complete):
+                with span("scraper.skip_existing", candidates=listed):
+                    merged_news_list = self.skip_existing_news(merged_news_list)
+                with span("scraper.resolve_times", candidates=len(merged_news_list)):
+                    merged_news_list = self.resolve_publish_times(merged_news_list)
+                self.checkpoint_news_list(merged_news_list)
+            resumed_news_list, pending_news_list = self.split_resumed_news(merged_news_list)
+            self.open_news_stream(merged_news_list, resumed_news_list)
+            try:
+                with span("scraper.contents", items=len(pending_news_list), resumed=len(resumed_news_list)):
+                    self.scrape_news_contents(pending_news_list)
+            except BaseException:
+                self.abort_news_stream()
+                raise
+            filename = self.finish_news_stream()
+            if filename:
+                self.finish_checkpoint()
+            merged_news_list = resumed_news_list + pending_news_list
+            self.save_publish_time_indexes()
+            self.page_readiness.print_report(f"{self.get_json_filename()} 等待时间统计")
+            self.http_cache_stats.print_stats(f"{self.get_json_filename()} 内容缓存统计")
+            scrape_span.set_attributes(
+                list_pages=list_pages,
+                listed=listed,
+                fetched=len(merged_news_list),
+                with_content=sum(1 for news in merged_news_list if news.get("content")),
+            )
+
+            return filename
+
+    def get_article_id(self, url):
+        """
+        文章URL中随发布时间递增的数字ID，用于发布时间索引
+        :return: int，不支持时返回None
+        """
+        return None
+
+    def supports_time_probe(self):
+        """列表中没有时间的新闻，是否读取文章页面开头来确定发布时间"""
+        return False
+
+    def get_time_probe_patterns(self, article_id):
+        """
+        页面开头中本网站特有的发布时间写法，优先于通用的meta标签和JSON-LD
+        :return: 正则表达式列表，第一个分组为时间
+        """
+        return []
+
+    def publish_time_index(self, url):
+        """:return: 文章所在域名的发布时间索引"""
+        index = get_publish_time_index(urlsplit(url).netloc.lower())
+        self._publish_time_indexes.add(index)
+        return index
 
-        for news_item in merged_news_list:
-            print(f"抓取新闻内容: {news_item['title']}")
-            content = self.scrape_news_content(news_item["url"])
-            if content is not None:
-                news_item["content"] = content
+    def learn_publish_time(self, url, published_time):
+        """记录一篇文章的精确发布时间"""
+        article_id = self.get_article_id(url)
+        if article_id is not None:
+            self.publish_time_index(url).learn(article_id, published_time)
 
-        return self.save_to_json_file(merged_news_list, self.get_json_filename())
+    def save_publish_time_indexes(self):
+        for index in self._publish_time_indexes:
+            index.save()
+
+    def resolve_publish_times(self, news_list):
+        """
+        抓取内容前为没有精确时间的新闻确定发布时间，早于截止时间的不再抓取内容
+        先查文章ID索引，列表中没有时间的再读取文章页面开头
+        :return: 过滤后的新闻列表
+        """
+        if not news_list or not time_resolution_enabled():
+            return news_list
+        probe = self.supports_time_probe() and self.http_fetch_enabled
+        max_bytes = int(os.environ.get("TIME_PROBE_MAX_BYTES", str(256 * 1024)))
+        kept = []
+        by_index = by_probe = probed = 0
+        for news in news_list:
+            article_id = self.get_article_id(news["url"])
+            if article_id is None:
+                kept.append(news)
+                continue
+            if self.publish_time_index(news["url"]).is_before(article_id, self.news_after_time):
+                by_index += 1
+                print(f"发布时间索引显示新闻早于截止时间，跳过: {news['title']}")
+                continue
+            if probe and not news.get("time"):
+                probed += 1
+                published_time = self.probe_publish_time(news["url"], article_id, max_bytes)
+                if published_time is not None:
+                    self.learn_publish_time(news["url"], published_time)
+                    news["time"] = published_time.strftime("%Y-%m-%d %H:%M:%S")
+                    if published_time <= self.news_after_time:
+                        by_probe += 1
+                        print(f"新闻发布于 {published_time}，早于截止时间，跳过: {news['title']}")
+                        continue
+            kept.append(news)
+        if by_index or probed:
+            print(
+                f"发布时间解析: 索引跳过 {by_index} 条, 读取页面开头 {probed} 条并跳过 {by_probe} 条, "
+                f"剩余 {len(kept)}/{len(news_list)} 条"
+            )
+            current_span().set_attributes(by_index=by_index, probed=probed, by_probe=by_probe)
+        return kept
+
+    def probe_publish_time(self, url, article_id, max_bytes):
+        """
+        只读取文章页面开头，找到发布时间后立即断开
+        :return: datetime，找不到或请求失败时返回None
+        """
+        patterns = self.get_time_probe_patterns(article_id)
+        try:
+            with self.domain_slot(url):
+                text = self.http_fetcher.fetch_prefix(
+                    url, max_bytes, stop=lambda text: find_publish_time(text, patterns) is not None
+                )
+        except Exception as e:
+            print(f"读取文章页面开头失败: {url}: {e}")
+            return None
+        return find_publish_time(text, patterns)
+
+    def get_seen_url_cache(self):
+        """每个网站单独一个本地已抓取URL缓存文件，避免并发写同一文件"""
+        if self._seen_url_cache is None:
+            name = os.path.splitext(self.get_json_filename())[0]
+            filepath = os.path.join(self.data_dir, "seen_urls", f"{name}.json")
+            self._seen_url_cache = SeenUrlCache(filepath)
+        return self._seen_url_cache
+
+    def skip_existing_news(self, news_list):
+        """
+        一次性查询候选新闻中哪些已入库，只保留需要抓取内容的新闻
+        :param news_list: 新闻字典列表
+        :return: 未入库的新闻列表
+        """
+        if not self.skip_existing_urls or not news_list:
+            return news_list
+        try:
+            checker = ExistingUrlChecker(self.get_seen_url_cache())
+            existing_urls = checker.find_existing([news["url"] for news in news_list])
+        except Exception as e:
+            print(f"检查已入库新闻失败: {e}")
+            return news_list
+
+        new_news_list = [news for news in news_list if news["url"] not in existing_urls]
+        print(
+            f"跳过 {len(news_list) - len(new_news_list)} 条已入库的新闻，"
+            f"待抓取内容 {len(new_news_list)} 条"
+        )
+        return new_news_list
+
+    def get_domain_rate_limit(self):
+        """:return: 本网站域名的 DomainRateLimit"""
+        return self.domain_rate_limit
+
+    def domain_slot(self, url):
+        """在域名调度器的令牌和并发名额下发出一次请求"""
+        return get_domain_scheduler().slot(url, self.get_domain_rate_limit())
+
+    def get_content_concurrency(self):
+        """
+        获取内容抓取并发数，环境变量 CONTENT_CONCURRENCY 优先于抓取器自身的设置
+        开启域名限速时不超过域名的并发上限，多出的工作线程只会等待名额
+        """
+        concurrency = os.environ.get("CONTENT_CONCURRENCY")
+        concurrency = max(1, int(concurrency)) if concurrency else max(1, self.content_concurrency)
+        if politeness_enabled():
+            concurrency = min(concurrency, self.get_domain_rate_limit().max_concurrency)
+        return concurrency
+
+    def scrape_news_contents(self, news_list):
+        """
+        并发抓取新闻内容，结果写回各新闻项，每完成一条即写入NDJSON流
+        第一个工作线程使用抓取器自身的浏览器，其余工作线程从浏览器池各租用一个，
+        租用不到时该线程退出，剩余新闻由其他线程继续抓取
+        :param news_list: 新闻字典列表
+        """
+        if not news_list:
+            return
+        concurrency = min(self.get_content_concurrency(), len(news_list))
+        print(f"开始抓取 {len(news_list)} 条新闻内容，并发数: {concurrency}")
+
+        pending = queue.Queue()
+        for index in range(len(news_list)):
+            pending.put(index)
+        fetched = [0]
+        fetched_lock = threading.Lock()
+
+        def worker(primary, final=False):
+            self._worker_local.owns_driver = not primary
+            try:
+                while True:
+                    try:
+                        index = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    news_item = news_list[index]
+                    print(f"抓取新闻内容: {news_item['title']}")
+                    content = None
+                    try:
+                        content = self.fetch_news_content(news_item["url"])
+                    except BrowserPoolExhausted as e:
+                        if not final:
+                            print(f"内容抓取线程未能租用浏览器，退出: {e}")
+                            pending.put(index)
+                            return
+                        print(f"抓取新闻内容失败: {e}")
+                    except Exception as e:
+                        print(f"抓取新闻内容失败: {news_item['url']}, {e}")
+                    if content is not None:
+                        news_item["content"] = content
+                        with fetched_lock:
+                            fetched[0] += 1
+                    self.write_news_item(news_item)
+            finally:
+                worker_driver = getattr(self._worker_local, "driver", None)
+                if worker_driver is not None:
+                    self.browser_pool.release(worker_driver)
+                self._worker_local.driver = None
+                self._worker_local.owns_driver = False
+
+        with ThreadPoolExecutor(max_workers=concurrency - 1 or 1) as executor:
+            futures = [executor.submit(bind_context(worker), False) for _ in range(concurrency - 1)]
+            # 调用线程作为主工作线程，保证即使额外浏览器全部租用失败也能抓完
+            worker(True)
+            for future in futures:
+                future.result()
+        # 租用浏览器失败的线程会把新闻放回队列，由主工作线程补抓
+        if not pending.empty():
+            worker(True, final=True)
+
+        print(f"新闻内容抓取完成，成功 {fetched[0]}/{len(news_list)} 条")
 
     @abstractmethod
     def get_json_filename(self):
@@ -345,6 +1130,13 @@ class BaseNewsScraper:
         """
         return []
 
+    def iter_list_page_urls(self):
+        """
+        按顺序生成列表页面的URL，scrape_news 在到达截止时间后停止迭代
+        翻页较多的网站可重写为生成器，按需生成后续页面
+        """
+        yield from self.get_list_page_urls()
+
     @abstractmethod
     def find_items_in_list_page(self):
         """
@@ -370,3 +1162,116 @@ class BaseNewsScraper:
         """
         content = None
         return content
+
+    def get_list_readiness_profile(self):
+        """
+        列表页面的就绪条件，子类应给出列表容器和新闻项的选择器
+        :return: ReadinessProfile
+        """
+        return ReadinessProfile(network_idle_ms=500)
+
+    def get_content_selector(self):
+        """
+        内容页面正文容器的CSS选择器，返回None时使用 parse_content 解析
+        """
+        return None
+
+    def get_content_readiness_profile(self):
+        """
+        内容页面的就绪条件，子类应给出正文容器的选择器
+        :return: ReadinessProfile
+        """
+        return ReadinessProfile(network_idle_ms=300)
+
+    def get_scroll_strategy(self):
+        """
+        列表页面的滚动策略，分页网站和由"加载更多"按钮加载的网站应返回 NO_SCROLL
+        :return: ScrollStrategy
+        """
+        return ScrollStrategy(ScrollStrategy.UNTIL_STABLE)
+
+    def get_xhr_feed(self):
+        """
+        列表页面使用的JSON接口，返回XhrFeed时优先从接口读取新闻列表
+        需同时实现 parse_feed_response 和 next_feed_page_url
+        :return: XhrFeed 或 None
+        """
+        return None
+
+    def uses_xhr_feed(self):
+        """本网站是否从列表接口读取新闻"""
+        return xhr_feed_enabled() and self.get_xhr_feed() is not None
+
+    def reads_list_feed(self):
+        """本抓取器加载的列表页面是否需要读取接口响应，共享页面加载时取决于组内所有抓取器"""
+        if self.page_load_group is not None and self.page_load_group.is_shared(self):
+            return self.page_load_group.uses_xhr_feed(self)
+        return self.uses_xhr_feed()
+
+    def parse_feed_response(self, data):
+        """
+        解析接口返回的一页JSON
+        :return: FeedItem 列表
+        """
+        return []
+
+    def next_feed_page_url(self, url, data, page_items):
+        """
+        :param url: 当前页的接口URL
+        :param data: 当前页的JSON
+        :param page_items: 当前页解析出的 FeedItem 列表
+        :return: 下一页的接口URL，没有更多时返回None
+        """
+        return None
+
+    def trigger_feed_request(self):
+        """
+        页面加载时没有发出接口请求（如首屏由服务端渲染）时，触发一次请求
+        :return: 是否已触发
+        """
+        return False
+
+    def get_list_item_selectors(self):
+        """
+        列表页面批量提取使用的选择器描述，格式见 list_extraction.extract_list_items
+        返回None时使用 find_items_in_list_page/parse_list_page_item 逐个元素解析
+        """
+        return None
+
+    def parse_list_item_record(self, record):
+        """
+        解析批量提取返回的一条记录
+        :param record: {"title", "href", "time", ...} 字典
+        :return: (title, url, source, time)
+        """
+        return None, None, None, None
+
+    def get_resource_blocking_profile(self):
+        """
+        浏览器中拦截哪些请求，子类可在默认规则上增加本网站的广告、视频等资源
+        :return: BlockingProfile
+        """
+        return DEFAULT_BLOCKING
+
+    def supports_http_fetch(self):
+        """
+        是否支持不经过浏览器直接通过HTTP抓取页面
+        返回True的抓取器需要实现 parse_list_page_document 和 parse_content_document
+        """
+        return False
+
+    def parse_list_page_document(self, doc):
+        """
+        解析HTTP抓取的静态列表页面
+        :param doc: lxml文档，链接已转换为绝对地址
+        :return: (title, url, source, time) 元组列表
+        """
+        return []
+
+    def parse_content_document(self, doc):
+        """
+        解析HTTP抓取的静态内容页面
+        :param doc: lxml文档
+        :return: 新闻内容，解析失败返回None
+        """
+        return None
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表页面提取性能对比 - 在同一页面上比较逐个元素解析和批量提取
+"""
+
+import argparse
+import time
+from dotenv import load_dotenv
+
+from base_news_scraper import ListPageType
+from cli import SCRAPER_CLASSES
+
+
+def count_driver_commands(driver):
+    """统计驱动发送给chromedriver的命令数"""
+    counter = {"commands": 0}
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        counter["commands"] += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = execute
+
+    def restore():
+        driver.execute = original_execute
+
+    return counter, restore
+
+
+def run_element_path(scraper):
+    news_items = scraper.find_items_in_list_page()
+    return [scraper.parse_list_page_item(item) for item in news_items]
+
+
+def run_batch_path(scraper):
+    return scraper.parse_list_page_batch() or []
+
+
+def measure(scraper, path, rounds):
+    counter, restore = count_driver_commands(scraper.driver)
+    timings = []
+    parsed_items = []
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            parsed_items = path(scraper)
+            timings.append(time.perf_counter() - start)
+    finally:
+        restore()
+    return {
+        "items": len(parsed_items),
+        "parsed": parsed_items,
+        "best_seconds": min(timings),
+        "mean_seconds": sum(timings) / len(timings),
+        "commands_per_round": counter["commands"] / rounds,
+    }
+
+
+def benchmark(website, rounds):
+    scraper_class = SCRAPER_CLASSES[website]
+    scraper = scraper_class()
+    try:
+        if not scraper.get_list_item_selectors():
+            print(f"{website} 未配置批量提取选择器")
+            return
+        url = next(iter(scraper.get_list_page_urls()))
+        print(f"加载列表页面: {url}")
+        scraper.open_url(url)
+        scraper.wait_for_javascript_completion(
+            scraper.get_list_readiness_profile(), phase="list_page"
+        )
+        scraper.scroll_to_load_content()
+        if scraper.get_list_page_type() == ListPageType.LOAD_MORE:
+            scraper.click_load_more_button()
+
+        element_result = measure(scraper, run_element_path, rounds)
+        batch_result = measure(scraper, run_batch_path, rounds)
+
+        print(f"\n{website} 列表提取对比 ({rounds} 轮):")
+        for name, result in (("逐个元素解析", element_result), ("批量提取", batch_result)):
+            print(
+                f"  {name}: {result['items']} 项, 最快 {result['best_seconds'] * 1000:.1f}毫秒, "
+                f"平均 {result['mean_seconds'] * 1000:.1f}毫秒, 每轮 {result['commands_per_round']:.0f} 次驱动命令"
+            )
+        if batch_result["best_seconds"] > 0:
+            speedup = element_result["best_seconds"] / batch_result["best_seconds"]
+            print(f"  批量提取加速: {speedup:.1f}x")
+
+        element_keys = {(title, url) for title, url, _, _ in element_result["parsed"] if title and url}
+        batch_keys = {(title, url) for title, url, _, _ in batch_result["parsed"] if title and url}
+        if element_keys == batch_keys:
+            print("  两种方式提取结果一致")
+        else:
+            print(
+                f"  提取结果不一致: 仅逐个解析 {len(element_keys - batch_keys)} 项, "
+                f"仅批量提取 {len(batch_keys - element_keys)} 项"
+            )
+    finally:
+        scraper.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列表页面提取性能对比")
+    parser.add_argument(
+        "--site",
+        action="append",
+        choices=list(SCRAPER_CLASSES.keys()),
+        help="要测试的网站，可重复指定，默认测试全部网站",
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="每种方式重复提取的次数")
+    args = parser.parse_args()
+
+    for website in args.site or SCRAPER_CLASSES.keys():
+        try:
+            benchmark(website, args.rounds)
+        except Exception as e:
+            print(f"{website} 测试失败: {e}")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+资源拦截效果对比 - 在同一组页面上比较不拦截和使用网站拦截规则时的加载时间、请求数和传输字节数
+"""
+
+import argparse
+import time
+from dotenv import load_dotenv
+
+from cli import SCRAPER_CLASSES
+from resource_blocking import NO_BLOCKING, apply_blocking_profile, measure_page_resources
+
+
+def collect_urls(scraper, articles):
+    """列表页面加上前几篇新闻的链接"""
+    list_url = next(iter(scraper.get_list_page_urls()))
+    news_list = scraper.scrape_news_list(list_url)
+    return [list_url] + [news["url"] for news in news_list[:articles]]
+
+
+def load_pages(driver, urls, profile):
+    apply_blocking_profile(driver, profile)
+    results = []
+    for url in urls:
+        start = time.perf_counter()
+        try:
+            driver.get(url)
+        except Exception as e:
+            print(f"  加载失败: {url}, {e}")
+            continue
+        load_seconds = time.perf_counter() - start
+        resources = measure_page_resources(driver)
+        results.append(
+            {
+                "load_seconds": load_seconds,
+                "requests": resources["requests"],
+                "bytes": resources["bytes"],
+                "heap_bytes": resources["heapBytes"],
+            }
+        )
+    return results
+
+
+def summarize(results):
+    count = len(results) or 1
+    return {
+        "pages": len(results),
+        "load_seconds": sum(r["load_seconds"] for r in results) / count,
+        "requests": sum(r["requests"] for r in results) / count,
+        "bytes": sum(r["bytes"] for r in results) / count,
+        "heap_bytes": sum(r["heap_bytes"] for r in results) / count,
+    }
+
+
+def benchmark(website, articles):
+    scraper_class = SCRAPER_CLASSES[website]
+    scraper = scraper_class()
+    # 列表通过浏览器获取，保证比较的是浏览器加载的页面
+    scraper.http_fetch_enabled = False
+    try:
+        urls = collect_urls(scraper, articles)
+        profile = scraper.get_resource_blocking_profile()
+        driver = scraper.driver
+        # 禁用浏览器缓存，两轮加载都从网络获取全部资源
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        try:
+            baseline = summarize(load_pages(driver, urls, NO_BLOCKING))
+            blocked = summarize(load_pages(driver, urls, profile))
+        finally:
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+
+        print(f"\n{website} 资源拦截对比 ({len(urls)} 个页面, 规则: {profile.name}):")
+        for name, result in (("不拦截", baseline), ("拦截", blocked)):
+            print(
+                f"  {name}: 平均加载 {result['load_seconds'] * 1000:.0f}毫秒, "
+                f"{result['requests']:.0f} 个请求, 传输 {result['bytes'] / 1024:.0f}KB, "
+                f"JS堆 {result['heap_bytes'] / 1024 / 1024:.1f}MB"
+            )
+        print(
+            f"  每页节省: {baseline['requests'] - blocked['requests']:.0f} 个请求, "
+            f"{(baseline['bytes'] - blocked['bytes']) / 1024:.0f}KB, "
+            f"{(baseline['load_seconds'] - blocked['load_seconds']) * 1000:.0f}毫秒"
+        )
+    finally:
+        scraper.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="资源拦截效果对比")
+    parser.add_argument(
+        "--site",
+        action="append",
+        choices=list(SCRAPER_CLASSES.keys()),
+        help="要测试的网站，可重复指定，默认测试全部网站",
+    )
+    parser.add_argument("--articles", type=int, default=3, help="每个网站加载的新闻内容页面数")
+    args = parser.parse_args()
+
+    for website in args.site or SCRAPER_CLASSES.keys():
+        try:
+            benchmark(website, args.articles)
+        except Exception as e:
+            print(f"{website} 测试失败: {e}")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓取器基准测试 - 用录制存档回放完整抓取流程，按阶段统计耗时，保存基线并与之比较
+
+    python benchmark_scrapers.py run --rounds 3 --output baseline.json
+    python benchmark_scrapers.py compare baseline.json current.json --threshold 0.2
+
+run 默认使用 FIXTURE_DIR 中的录制存档（FIXTURE_MODE=replay），并关闭内容缓存、已入库检查和抓取断点，
+使每轮都执行相同的抓取工作。
+"""
+
+from datetime import datetime
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+
+
+# 阶段名称 -> 抓取器上被计时的方法
+SCRAPER_PHASES = {
+    "page_load": "open_url",
+    "readiness_wait": "wait_for_javascript_completion",
+    "scroll": "scroll_to_load_content",
+    "load_more": "click_load_more_button",
+    "list_http": "scrape_news_list_http",
+    "list_parse": "parse_list_page",
+    "content": "scrape_news_content",
+}
+
+# 比较时越小越好的指标
+LOWER_IS_BETTER = ["wall_seconds", "peak_rss_python_mb", "peak_rss_chrome_mb"]
+
+
+class PhaseRecorder:
+    """包装对象的方法，累计每个阶段的耗时和调用次数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds = {}
+        self.counts = {}
+
+    def record(self, phase, seconds):
+        with self._lock:
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def wrap(self, obj, method_name, phase):
+        method = getattr(obj, method_name)
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(phase, time.perf_counter() - start)
+
+        setattr(obj, method_name, timed)
+
+
+def run_round(website, scraper_class, time_range):
+    """完整抓取一次网站，返回本轮的各项指标"""
+    from browser_pool import BrowserPool
+    from process_metrics import RssSampler
+    from utils.news_stream import iter_news_file
+
+    recorder = PhaseRecorder()
+    # 每轮使用单独的浏览器池，启动耗时计入本轮
+    pool = BrowserPool(warm_size=0)
+    recorder.wrap(pool, "_start_browser", "driver_startup")
+    sampler = RssSampler()
+    sampler.start()
+    scraper = scraper_class(time_range)
+    scraper.browser_pool = pool
+    for phase, method_name in SCRAPER_PHASES.items():
+        recorder.wrap(scraper, method_name, phase)
+
+    start = time.perf_counter()
+    news_count = 0
+    content_count = 0
+    try:
+        filename = scraper.scrape_news()
+        if filename:
+            for news in iter_news_file(filename):
+                news_count += 1
+                if news.get("content"):
+                    content_count += 1
+    finally:
+        wall_seconds = time.perf_counter() - start
+        scraper.close()
+        pool.shutdown()
+        sampler.stop()
+
+    return {
+        "wall_seconds": wall_seconds,
+        "items": news_count,
+        "contents": content_count,
+        "items_per_second": news_count / wall_seconds if wall_seconds > 0 else 0.0,
+        "peak_rss_python_mb": sampler.peak_python_bytes / 1024 / 1024,
+        "peak_rss_chrome_mb": sampler.peak_children_bytes / 1024 / 1024,
+        "phases": {
+            phase: {"seconds": seconds, "count": recorder.counts[phase]}
+            for phase, seconds in recorder.seconds.items()
+        },
+    }
+
+
+def summarize_rounds(rounds):
+    """各指标取中位数"""
+    summary = {
+        key: statistics.median(r[key] for r in rounds)
+        for key in ("wall_seconds", "items", "contents", "items_per_second",
+                    "peak_rss_python_mb", "peak_rss_chrome_mb")
+    }
+    phases = sorted({phase for r in rounds for phase in r["phases"]})
+    summary["phases"] = {
+        phase: {
+            "seconds": statistics.median(r["phases"].get(phase, {}).get("seconds", 0.0) for r in rounds),
+            "count": statistics.median(r["phases"].get(phase, {}).get("count", 0) for r in rounds),
+        }
+        for phase in phases
+    }
+    summary["rounds"] = len(rounds)
+    return summary
+
+
+def print_site_result(website, result):
+    print(
+        f"\n{website}: {result['items']:.0f} 条新闻 ({result['contents']:.0f} 条有内容), "
+        f"总耗时 {result['wall_seconds']:.2f}秒, {result['items_per_second']:.2f} 条/秒, "
+        f"峰值内存 Python {result['peak_rss_python_mb']:.0f}MB / Chrome {result['peak_rss_chrome_mb']:.0f}MB"
+    )
+    for phase, stat in sorted(result["phases"].items(), key=lambda x: -x[1]["seconds"]):
+        print(f"  {phase}: {stat['seconds']:.2f}秒 ({stat['count']:.0f} 次)")
+
+
+def run(args):
+    fixture_dir = None
+    if not args.live:
+        from fixtures import fixture_dir as default_fixture_dir
+
+        fixture_dir = os.path.abspath(args.fixtures or default_fixture_dir())
+        if not os.path.exists(os.path.join(fixture_dir, "index.json")):
+            print(f"录制存档不存在: {fixture_dir}，请先用 FIXTURE_MODE=record 录制")
+            return 1
+        os.environ["FIXTURE_MODE"] = "replay"
+        os.environ["FIXTURE_DIR"] = fixture_dir
+
+    # ChromeDriver缓存仍使用原来的数据目录，避免每轮都重新解析
+    os.environ.setdefault(
+        "CHROMEDRIVER_CACHE_FILE",
+        os.path.abspath(os.path.join(os.environ.get("DATA_DIR", "."), "driver_cache", "chromedriver.json")),
+    )
+    # 每轮执行相同的抓取工作，输出文件写到临时目录
+    os.environ["HTTP_CACHE_ENABLED"] = "0"
+    os.environ["SKIP_EXISTING_URLS"] = "0"
+    os.environ["CHECKPOINT_ENABLED"] = "0"
+    os.environ["TIME_RESOLUTION_ENABLED"] = "0"
+    os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="news-scraper-benchmark-")
+
+    from cli import SCRAPER_CLASSES
+
+    results = {}
+    for website in args.site or SCRAPER_CLASSES.keys():
+        rounds = []
+        for i in range(args.rounds):
+            print(f"\n=== {website} 第 {i + 1}/{args.rounds} 轮 ===")
+            try:
+                rounds.append(run_round(website, SCRAPER_CLASSES[website], args.time_range))
+            except Exception as e:
+                print(f"{website} 第 {i + 1} 轮失败: {e}")
+        if rounds:
+            results[website] = summarize_rounds(rounds)
+
+    for website, result in results.items():
+        print_site_result(website, result)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "fixture_dir": fixture_dir,
+        "time_range": args.time_range,
+        "sites": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n基准测试结果已保存: {args.output}")
+    return 0
+
+
+def compare_metric(name, baseline_value, current_value, threshold, lower_is_better=True):
+    """:return: 退化时返回说明文字，否则返回None"""
+    if not baseline_value:
+        return None
+    change = (current_value - baseline_value) / baseline_value
+    regressed = change > threshold if lower_is_better else change < -threshold
+    if regressed:
+        return f"{name}: {baseline_value:.2f} -> {current_value:.2f} ({change * 100:+.0f}%)"
+    return None
+
+
+def compare(args):
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+
+    regressions = []
+    for website, base in baseline["sites"].items():
+        result = current["sites"].get(website)
+        if result is None:
+            print(f"{website}: 当前结果中缺失")
+            continue
+        site_regressions = []
+        for key in LOWER_IS_BETTER:
+            site_regressions.append(compare_metric(key, base[key], result[key], args.threshold))
+        site_regressions.append(
+            compare_metric(
+                "items_per_second", base["items_per_second"], result["items_per_second"],
+                args.threshold, lower_is_better=False,
+            )
+        )
+        for phase, stat in base["phases"].items():
+            # 忽略耗时很短的阶段，避免噪声
+            if stat["seconds"] < args.min_seconds:
+                continue
+            current_seconds = result["phases"].get(phase, {}).get("seconds", 0.0)
+            site_regressions.append(
+                compare_metric(f"phase {phase}", stat["seconds"], current_seconds, args.threshold)
+            )
+        site_regressions = [r for r in site_regressions if r]
+        if site_regressions:
+            print(f"✗ {website}")
+            for regression in site_regressions:
+                print(f"    {regression}")
+            regressions.extend(site_regressions)
+        else:
+            print(f"✓ {website}")
+
+    if regressions:
+        print(f"\n发现 {len(regressions)} 项性能退化 (阈值 {args.threshold * 100:.0f}%)")
+        return 1
+    print("\n未发现性能退化")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="抓取器基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="运行基准测试")
+    run_parser.add_argument("--site", action="append", help="要测试的网站，可重复指定，默认测试全部网站")
+    run_parser.add_argument("--rounds", type=int, default=3, help="每个网站的测试轮数，结果取中位数")
+    run_parser.add_argument("--time-range", type=int, default=24, help="抓取时间范围（小时）")
+    run_parser.add_argument("--fixtures", help="录制存档目录，默认 FIXTURE_DIR")
+    run_parser.add_argument("--live", action="store_true", help="访问真实网站而不是回放存档")
+    run_parser.add_argument("--output", help="保存结果的JSON文件")
+
+    compare_parser = subparsers.add_parser("compare", help="与基线比较")
+    compare_parser.add_argument("baseline", help="基线JSON文件")
+    compare_parser.add_argument("current", help="当前结果JSON文件")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="允许的相对退化比例")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.5, help="基线耗时低于该值的阶段不参与比较")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return run(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    sys.exit(main())
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chrome浏览器池 - 在多个网站、重试和定时任务之间复用无头Chrome实例
+"""
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+import atexit
+import os
+import threading
+import time
+
+from driver_resolver import get_driver_resolver
+from fixtures import get_fixture_recorder
+from memory_watchdog import current_site, driver_pid, get_memory_watchdog
+from xhr_feed import drain_performance_log, performance_log_enabled
+
+
+class BrowserPoolExhausted(Exception):
+    """在租用超时时间内没有可用的浏览器"""
+
+
+def build_chrome_options(performance_log=False):
+    """
+    构建Chrome启动参数 - Linux无头模式优化
+    :param performance_log: 是否记录performance日志，只有读取列表接口和录制时需要
+    """
+    chrome_options = Options()
+
+    # 强制无头模式
+    chrome_options.add_argument("--headless")
+
+    # Linux服务器环境优化参数
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-software-rasterizer")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-features=TranslateUI")
+    chrome_options.add_argument("--disable-ipc-flooding-protection")
+
+    # 内存和性能优化
+    chrome_options.add_argument("--memory-pressure-off")
+    chrome_options.add_argument("--max_old_space_size=4096")
+    chrome_options.add_argument("--window-size=1920,1080")
+
+    # 网络优化
+    chrome_options.add_argument("--aggressive-cache-discard")
+    chrome_options.add_argument("--disable-background-networking")
+
+    # 用户代理
+    chrome_options.add_argument(
+        "--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    # 禁用图片加载以提高速度（可选）
+    prefs = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+    }
+    chrome_options.add_experimental_option("prefs", prefs)
+
+    # 录制模式和XHR接口抓取从performance日志中读取页面加载的响应
+    if performance_log:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    # 禁用扩展和插件
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-images")
+
+    return chrome_options
+
+
+def create_chrome_driver(page_load_timeout, performance_log=False):
+    """启动一个新的无头Chrome实例"""
+    resolver = get_driver_resolver()
+    resolution = resolver.resolve()
+    try:
+        driver = _start_chrome(resolution, page_load_timeout, performance_log)
+    except Exception as e:
+        if resolution.source != "cache":
+            print(f"初始化Chrome驱动失败: {e}")
+            print("请确保已安装Chrome浏览器")
+            raise
+        # 缓存的驱动可能已与Chrome不兼容，重新解析后再试一次
+        print(f"使用缓存的ChromeDriver启动失败: {e}，重新解析")
+        resolver.invalidate()
+        driver = _start_chrome(resolver.resolve(), page_load_timeout, performance_log)
+    return driver
+
+
+def _start_chrome(resolution, page_load_timeout, performance_log):
+    options = build_chrome_options(performance_log)
+    if os.environ.get("CHROME_BINARY"):
+        options.binary_location = resolution.chrome_path
+    service = Service(resolution.driver_path)
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+
+class PooledBrowser:
+    """浏览器池中的一个Chrome实例及其使用记录"""
+
+    def __init__(self, driver, startup_seconds, performance_log=False):
+        self.driver = driver
+        self.startup_seconds = startup_seconds
+        self.performance_log = performance_log
+        self.created_at = time.time()
+        self.pid = driver_pid(driver)
+        self.pages = 0
+        self.leases = 0
+
+
+class BrowserPool:
+    """
+    无头Chrome浏览器池
+
+    抓取器通过 lease() 借用浏览器、通过 release() 归还，浏览器在归还后保持
+    运行以供下一个抓取器复用。打开页面数或进程树内存超过上限的浏览器会被回收重建，
+    空闲浏览器在租出前会做健康检查，并在后台保持若干个预热的备用实例。
+    """
+
+    def __init__(
+        self,
+        max_size=None,
+        warm_size=None,
+        max_pages_per_browser=None,
+        max_rss_mb=None,
+        page_load_timeout=None,
+        lease_timeout=None,
+    ):
+        """
+        :param max_size: 同时存在的浏览器数量上限
+        :param warm_size: 保持空闲备用的浏览器数量
+        :param max_pages_per_browser: 单个浏览器打开页面数上限，超过后回收
+        :param max_rss_mb: 单个浏览器进程树常驻内存上限（MB），超过后回收，0为不限制
+        :param page_load_timeout: 页面加载超时（秒）
+        :param lease_timeout: 租用浏览器的最长等待时间（秒）
+        """
+        self.max_size = max_size or int(os.environ.get("BROWSER_POOL_MAX_SIZE", "5"))
+        if warm_size is None:
+            warm_size = int(os.environ.get("BROWSER_POOL_WARM_SIZE", "1"))
+        self.warm_size = min(warm_size, self.max_size)
+        self.max_pages_per_browser = max_pages_per_browser or int(
+            os.environ.get("BROWSER_MAX_PAGES", "200")
+        )
+        if max_rss_mb is None:
+            max_rss_mb = int(os.environ.get("BROWSER_MAX_RSS_MB", "1024"))
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.memory_watchdog = get_memory_watchdog()
+        self.page_load_timeout = page_load_timeout or int(
+            os.environ.get("SELENIUM_PAGE_LOAD_TIMEOUT", "30")
+        )
+        self.lease_timeout = lease_timeout or int(
+            os.environ.get("BROWSER_LEASE_TIMEOUT", "300")
+        )
+
+        self._lock = threading.Condition()
+        self._idle = []
+        self._leased = {}
+        self._starting = 0
+        self._closed = False
+
+        self._stats = {
+            "browsers_started": 0,
+            "startup_seconds_total": 0.0,
+            "startup_seconds_min": None,
+            "startup_seconds_max": None,
+            # 本进程第一个浏览器的启动耗时，包含ChromeDriver解析
+            "cold_startup_seconds": None,
+            "leases": 0,
+            "reused_leases": 0,
+            "lease_wait_seconds_total": 0.0,
+            "recycled": 0,
+            "memory_recycled": 0,
+            "unhealthy_discarded": 0,
+        }
+
+    def _start_browser(self, performance_log=False):
+        """启动一个新浏览器并记录启动耗时"""
+        start = time.perf_counter()
+        driver = create_chrome_driver(self.page_load_timeout, performance_log)
+        startup_seconds = time.perf_counter() - start
+
+        with self._lock:
+            stats = self._stats
+            stats["browsers_started"] += 1
+            if stats["cold_startup_seconds"] is None:
+                stats["cold_startup_seconds"] = startup_seconds
+            stats["startup_seconds_total"] += startup_seconds
+            if stats["startup_seconds_min"] is None or startup_seconds < stats["startup_seconds_min"]:
+                stats["startup_seconds_min"] = startup_seconds
+            if stats["startup_seconds_max"] is None or startup_seconds > stats["startup_seconds_max"]:
+                stats["startup_seconds_max"] = startup_seconds
+
+        print(f"Chrome浏览器启动成功 (无头模式, 启动耗时: {startup_seconds:.2f}秒)")
+        browser = PooledBrowser(driver, startup_seconds, performance_log)
+        self.memory_watchdog.track(id(driver), browser.pid)
+        return browser
+
+    def _quit_browser(self, browser):
+        self.memory_watchdog.untrack(id(browser.driver))
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            print(f"关闭Chrome浏览器失败: {e}")
+
+    def is_healthy(self, driver):
+        """检查浏览器是否仍可响应命令"""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _total(self):
+        return len(self._idle) + len(self._leased) + self._starting
+
+    def _pop_idle(self, performance_log):
+        """取出一个performance日志设置相同的空闲浏览器，调用方需持有 self._lock"""
+        for index in range(len(self._idle) - 1, -1, -1):
+            if self._idle[index].performance_log == performance_log:
+                return self._idle.pop(index)
+        return None
+
+    def lease(self, timeout=None, feed=False):
+        """
+        从池中租用一个浏览器驱动
+        :param timeout: 最长等待时间（秒），默认使用 lease_timeout
+        :param feed: 是否需要从performance日志读取列表接口响应，此时租用开启日志的浏览器
+        :return: selenium WebDriver
+        """
+        if timeout is None:
+            timeout = self.lease_timeout
+        performance_log = performance_log_enabled(feed)
+        wait_start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+
+        while True:
+            browser = None
+            mismatched = None
+            should_start = False
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("浏览器池已关闭")
+                browser = self._pop_idle(performance_log)
+                if browser is None and (self._total() < self.max_size or self._idle):
+                    if self._total() >= self.max_size:
+                        # 空闲浏览器的日志设置不同，关闭一个以腾出名额
+                        mismatched = self._idle.pop()
+                    self._starting += 1
+                    should_start = True
+                elif browser is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolExhausted(
+                            f"等待 {timeout} 秒后仍没有可用的浏览器 (上限: {self.max_size})"
+                        )
+                    self._lock.wait(remaining)
+                    continue
+
+            if mismatched is not None:
+                self._quit_browser(mismatched)
+            if should_start:
+                try:
+                    browser = self._start_browser(performance_log)
+                finally:
+                    with self._lock:
+                        self._starting -= 1
+                        self._lock.notify_all()
+                reused = False
+            else:
+                if not self.is_healthy(browser.driver):
+                    print("空闲浏览器健康检查失败，丢弃并重新获取")
+                    self._quit_browser(browser)
+                    with self._lock:
+                        self._stats["unhealthy_discarded"] += 1
+                        self._lock.notify_all()
+                    continue
+                reused = True
+
+            with self._lock:
+                browser.leases += 1
+                self._leased[id(browser.driver)] = browser
+                self.memory_watchdog.assign(id(browser.driver), current_site())
+                self._stats["leases"] += 1
+                if reused:
+                    self._stats["reused_leases"] += 1
+                self._stats["lease_wait_seconds_total"] += time.perf_counter() - wait_start
+
+            self._replenish()
+            return browser.driver
+
+    def release(self, driver, discard=False):
+        """
+        归还浏览器驱动
+        :param driver: lease() 返回的驱动
+        :param discard: 为True时直接关闭该浏览器而不放回池中
+        """
+        with self._lock:
+            browser = self._leased.pop(id(driver), None)
+        if browser is None:
+            # 不是由本池租出的驱动，直接关闭
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return
+
+        recorder = get_fixture_recorder()
+        if recorder and not discard:
+            recorder.capture_browser(driver)
+
+        reason = self._recycle_reason(browser)
+        recycle = discard or self._closed or reason is not None
+        if not recycle:
+            try:
+                # 离开当前页面以释放页面占用的内存
+                driver.get("about:blank")
+                if browser.performance_log:
+                    # 丢弃积累的日志，下一个租用者只读取自己的页面
+                    drain_performance_log(driver)
+            except Exception:
+                recycle = True
+
+        if recycle:
+            if reason is not None:
+                print(f"浏览器{reason}，回收重建")
+            memory_exceeded = self._memory_exceeded(browser)
+            if memory_exceeded:
+                self.memory_watchdog.record_recycle(id(driver))
+            self._quit_browser(browser)
+            with self._lock:
+                self._stats["recycled"] += 1
+                if memory_exceeded:
+                    self._stats["memory_recycled"] += 1
+                self._lock.notify_all()
+            self._replenish()
+            return
+
+        self.memory_watchdog.assign(id(driver), None)
+        with self._lock:
+            self._idle.append(browser)
+            self._lock.notify_all()
+
+    def _memory_exceeded(self, browser):
+        return self.max_rss_bytes > 0 and self.memory_watchdog.rss_bytes(id(browser.driver)) >= self.max_rss_bytes
+
+    def _recycle_reason(self, browser):
+        """:return: 浏览器需要回收的原因，不需要回收时返回None"""
+        if browser.pages >= self.max_pages_per_browser:
+            return f"已打开 {browser.pages} 个页面"
+        if self._memory_exceeded(browser):
+            rss_mb = self.memory_watchdog.rss_bytes(id(browser.driver)) / 1024 / 1024
+            return f"进程树内存 {rss_mb:.0f}MB 超过上限 {self.max_rss_bytes // 1024 // 1024}MB"
+        return None
+
+    def needs_recycle(self, driver):
+        """租用中的浏览器是否已达到页面数或内存上限，不是由本池租出的驱动返回False"""
+        with self._lock:
+            browser = self._leased.get(id(driver))
+        return browser is not None and self._recycle_reason(browser) is not None
+
+    def record_page(self, driver):
+        """记录浏览器打开了一个页面，用于按页面数回收"""
+        with self._lock:
+            browser = self._leased.get(id(driver))
+            if browser is not None:
+                browser.pages += 1
+
+    def _replenish(self):
+        """在后台补足预热的备用浏览器"""
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.warm_size - len(self._idle) - self._starting
+            missing = min(missing, self.max_size - self._total())
+            if missing <= 0:
+                return
+            self._starting += missing
+
+        for _ in range(missing):
+            threading.Thread(target=self._start_standby, daemon=True).start()
+
+    def _start_standby(self):
+        browser = None
+        try:
+            # 备用浏览器供大多数不读取列表接口的租用者使用，录制模式下开启日志
+            browser = self._start_browser(performance_log_enabled())
+        except Exception as e:
+            print(f"预热备用浏览器失败: {e}")
+        finally:
+            with self._lock:
+                self._starting -= 1
+                if browser is not None and not self._closed:
+                    self._idle.append(browser)
+                    browser = None
+                self._lock.notify_all()
+        if browser is not None:
+            self._quit_browser(browser)
+
+    def warm_up(self):
+        """预先启动备用浏览器"""
+        self._replenish()
+
+    def stats(self):
+        """
+        获取浏览器池统计信息
+        :return: 统计信息字典，包含启动耗时和复用节省的时间
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            stats["leased"] = len(self._leased)
+            stats["starting"] = self._starting
+
+        started = stats["browsers_started"]
+        avg = stats["startup_seconds_total"] / started if started else 0.0
+        stats["startup_seconds_avg"] = avg
+        # 后续浏览器复用已解析的ChromeDriver
+        if started > 1:
+            stats["warm_startup_seconds_avg"] = (
+                stats["startup_seconds_total"] - stats["cold_startup_seconds"]
+            ) / (started - 1)
+        else:
+            stats["warm_startup_seconds_avg"] = None
+        resolution = get_driver_resolver().resolution
+        stats["driver_resolve_source"] = resolution.source if resolution else None
+        stats["driver_resolve_seconds"] = resolution.seconds if resolution else None
+        # 每次复用都省去了一次浏览器启动
+        stats["estimated_seconds_saved"] = avg * stats["reused_leases"]
+        return stats
+
+    def print_stats(self):
+        stats = self.stats()
+        print("\n浏览器池统计:")
+        print(f"  启动浏览器: {stats['browsers_started']} 个, 总耗时 {stats['startup_seconds_total']:.2f}秒, 平均 {stats['startup_seconds_avg']:.2f}秒")
+        if stats["cold_startup_seconds"] is not None:
+            warm = stats["warm_startup_seconds_avg"]
+            resolve = ""
+            if stats["driver_resolve_source"]:
+                resolve = f" (ChromeDriver来源: {stats['driver_resolve_source']}, 解析 {stats['driver_resolve_seconds']:.2f}秒)"
+            print(
+                f"  冷启动: {stats['cold_startup_seconds']:.2f}秒{resolve}, "
+                f"热启动平均: {f'{warm:.2f}秒' if warm is not None else '无'}"
+            )
+        print(f"  租用次数: {stats['leases']}, 复用次数: {stats['reused_leases']}, 预计节省启动时间 {stats['estimated_seconds_saved']:.2f}秒")
+        print(f"  回收: {stats['recycled']} (内存超限 {stats['memory_recycled']}), 健康检查丢弃: {stats['unhealthy_discarded']}")
+        print(f"  当前空闲: {stats['idle']}, 租用中: {stats['leased']}")
+
+    def shutdown(self):
+        """关闭池中所有浏览器"""
+        with self._lock:
+            self._closed = True
+            browsers = list(self._idle) + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+            self._lock.notify_all()
+        for browser in browsers:
+            self._quit_browser(browser)
+        if browsers:
+            print(f"浏览器池已关闭 {len(browsers)} 个浏览器")
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """获取进程内共享的默认浏览器池"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool()
+            atexit.register(_default_pool.shutdown)
+        return _default_pool
@@ -0,0 +1,772 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio抓取引擎 - 通过Chrome DevTools协议直接控制Chrome，在一个事件循环中并发打开多个页面
+
+内容页面的导航和就绪等待在事件循环中异步完成；列表页面与selenium引擎一样经过
+scrape_news_list_browser（共享页面加载、接口读取、展开和解析），抓取器的同步方法
+通过 CdpDriverAdapter 在线程中执行，适配器把 selenium 风格的调用转换为CDP命令并提交回事件循环。
+"""
+
+from selenium.common.exceptions import NoSuchElementException
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import websockets
+
+from browser_pool import build_chrome_options
+from driver_resolver import find_chrome_binary
+from page_readiness import NETWORK_TRACKER_SCRIPT, PAGE_STATE_SCRIPT, ReadinessCheck
+from resource_blocking import NO_BLOCKING, resource_blocking_enabled
+from fixtures import rewrite_url
+from retry_policy import ContentParseError, get_url_retrier, site_retry_delay
+from domain_scheduler import get_domain_scheduler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.tracing import span
+
+
+# 在根节点（元素或document）下按selenium的定位方式查找元素
+FIND_ELEMENTS_FUNCTION = """
+function(by, value, multiple) {
+    var root = (this && this.nodeType) ? this : document;
+    var nodes = [];
+    if (by === 'xpath') {
+        var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+    } else {
+        var selector = value;
+        if (by === 'id') {
+            selector = '#' + CSS.escape(value);
+        } else if (by === 'class name') {
+            selector = '.' + CSS.escape(value);
+        } else if (by === 'name') {
+            selector = '[name="' + value + '"]';
+        }
+        nodes = Array.prototype.slice.call(root.querySelectorAll(selector));
+    }
+    return multiple ? nodes : (nodes[0] || null);
+}
+"""
+
+ELEMENT_TEXT_FUNCTION = "function() { return (this.innerText || this.textContent || ''); }"
+
+# 与selenium的get_attribute一致：优先返回同名属性值，否则返回HTML属性
+ELEMENT_ATTRIBUTE_FUNCTION = """
+function(name) {
+    var value = this[name];
+    if (typeof value === 'string' || typeof value === 'number' || typeof value === 'boolean') {
+        return String(value);
+    }
+    return this.getAttribute(name);
+}
+"""
+
+ELEMENT_CLICK_FUNCTION = "function() { this.scrollIntoView({block: 'center'}); this.click(); }"
+
+OBJECT_GROUP = "news-scraper"
+
+
+class CdpError(Exception):
+    """CDP命令执行失败"""
+
+
+def require_chrome_binary():
+    binary = find_chrome_binary()
+    if not binary:
+        raise CdpError("未找到Chrome浏览器，请安装Chrome或设置 CHROME_BINARY")
+    return binary
+
+
+class ChromeProcess:
+    """以远程调试模式启动的Chrome进程"""
+
+    def __init__(self, binary=None):
+        self.binary = binary or require_chrome_binary()
+        self.process = None
+        self.user_data_dir = None
+        self.ws_url = None
+        self.startup_seconds = None
+
+    async def start(self, timeout=30):
+        start = time.perf_counter()
+        self.user_data_dir = tempfile.mkdtemp(prefix="news-scraper-cdp-")
+        args = [
+            self.binary,
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self.user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--blink-settings=imagesEnabled=false",
+        ]
+        args.extend(build_chrome_options().arguments)
+        args.append("about:blank")
+        self.process = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+        # Chrome启动后把调试端口和浏览器路径写入 DevToolsActivePort
+        port_file = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with open(port_file, "r") as f:
+                    lines = f.read().split("\n")
+                if len(lines) >= 2 and lines[0] and lines[1]:
+                    self.ws_url = f"ws://127.0.0.1:{lines[0]}{lines[1]}"
+                    break
+            except FileNotFoundError:
+                pass
+            if self.process.returncode is not None:
+                raise CdpError(f"Chrome进程启动失败，退出码: {self.process.returncode}")
+            if time.monotonic() > deadline:
+                raise CdpError("等待Chrome调试端口超时")
+            await asyncio.sleep(0.05)
+
+        self.startup_seconds = time.perf_counter() - start
+        print(f"Chrome浏览器启动成功 (CDP, 启动耗时: {self.startup_seconds:.2f}秒)")
+
+    async def stop(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class CdpConnection:
+    """到浏览器的CDP WebSocket连接，页面会话通过sessionId复用同一连接"""
+
+    def __init__(self, ws):
+        self._ws = ws
+        self._next_id = 0
+        self._pending = {}
+        self._listeners = []
+        self._reader = None
+
+    @classmethod
+    async def connect(cls, ws_url):
+        ws = await websockets.connect(ws_url, max_size=None, ping_interval=None)
+        connection = cls(ws)
+        connection._reader = asyncio.ensure_future(connection._read_loop())
+        return connection
+
+    async def send(self, method, params=None, session_id=None, timeout=60):
+        self._next_id += 1
+        message_id = self._next_id
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def _read_loop(self):
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.get(message["id"])
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CdpError(message["error"].get("message", "")))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    for listener in list(self._listeners):
+                        listener(message)
+        except Exception as e:
+            print(f"CDP连接读取失败: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CdpError("CDP连接已关闭"))
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def close(self):
+        await self._ws.close()
+        if self._reader:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class CdpPage:
+    """一个浏览器标签页"""
+
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.blocking_profile = None
+        # 开启后记录本标签页的Network事件，供适配器的 get_log("performance") 读取
+        self._network_log = None
+        self._network_listener = None
+
+    @classmethod
+    async def create(cls, connection):
+        target = await connection.send("Target.createTarget", {"url": "about:blank"})
+        attached = await connection.send(
+            "Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}
+        )
+        page = cls(connection, target["targetId"], attached["sessionId"])
+        await page.send("Page.enable")
+        await page.send(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT}
+        )
+        return page
+
+    async def send(self, method, params=None, timeout=60):
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    def event_future(self, method):
+        """返回在本页面收到指定事件时完成的future"""
+        future = asyncio.get_running_loop().create_future()
+
+        def listener(message):
+            if (
+                message.get("sessionId") == self.session_id
+                and message.get("method") == method
+                and not future.done()
+            ):
+                future.set_result(message.get("params", {}))
+
+        self.connection.add_listener(listener)
+        future.add_done_callback(lambda _: self.connection.remove_listener(listener))
+        return future
+
+    def start_network_log(self):
+        """开始记录Network事件，事件在 set_blocking_profile 启用Network域后才会发出"""
+        if self._network_log is not None:
+            return
+        self._network_log = []
+
+        def listener(message):
+            if message.get("sessionId") == self.session_id and message.get("method", "").startswith("Network."):
+                self._network_log.append({"method": message["method"], "params": message.get("params", {})})
+
+        self._network_listener = listener
+        self.connection.add_listener(listener)
+
+    def stop_network_log(self):
+        if self._network_listener is not None:
+            self.connection.remove_listener(self._network_listener)
+        self._network_log = None
+        self._network_listener = None
+
+    def read_network_log(self):
+        """:return: 上次读取之后记录的Network事件，读取后清空；未开启记录时返回空列表"""
+        if self._network_log is None:
+            return []
+        entries, self._network_log = self._network_log, []
+        return entries
+
+    async def set_blocking_profile(self, profile):
+        """启用资源拦截规则，标签页已使用同一规则时不重复设置"""
+        if not resource_blocking_enabled():
+            profile = NO_BLOCKING
+        if self.blocking_profile == profile.name:
+            return
+        await self.send("Network.enable")
+        await self.send("Network.setBlockedURLs", {"urls": profile.blocked_urls()})
+        self.blocking_profile = profile.name
+
+    async def navigate(self, url, timeout=30):
+        # 导航会使之前取得的元素失效，释放它们占用的对象
+        await self.send("Runtime.releaseObjectGroup", {"objectGroup": OBJECT_GROUP})
+        loaded = self.event_future("Page.loadEventFired")
+        try:
+            result = await self.send("Page.navigate", {"url": rewrite_url(url)})
+            if result.get("errorText"):
+                raise CdpError(f"打开页面失败: {result['errorText']}")
+            await asyncio.wait_for(loaded, timeout)
+        except asyncio.TimeoutError:
+            print(f"页面加载超时 ({timeout}秒)，停止加载并继续: {url}")
+            await self.send("Page.stopLoading")
+        finally:
+            if not loaded.done():
+                loaded.cancel()
+
+    @staticmethod
+    def _check_result(result):
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            exception = details.get("exception", {})
+            raise CdpError(exception.get("description") or details.get("text", "脚本执行失败"))
+        return result["result"]
+
+    async def evaluate(self, expression, return_by_value=True):
+        result = await self.send(
+            "Runtime.evaluate",
+            {
+                "expression": expression,
+                "returnByValue": return_by_value,
+                "awaitPromise": True,
+                "objectGroup": OBJECT_GROUP,
+            },
+        )
+        return self._check_result(result)
+
+    async def call_function(self, declaration, object_id, arguments=None, return_by_value=True):
+        result = await self.send(
+            "Runtime.callFunctionOn",
+            {
+                "functionDeclaration": declaration,
+                "objectId": object_id,
+                "arguments": arguments or [],
+                "returnByValue": return_by_value,
+                "awaitPromise": True,
+                "objectGroup": OBJECT_GROUP,
+            },
+        )
+        return self._check_result(result)
+
+    async def array_object_ids(self, object_id):
+        """获取数组对象中各元素的objectId"""
+        result = await self.send(
+            "Runtime.getProperties", {"objectId": object_id, "ownProperties": True}
+        )
+        items = [
+            (int(prop["name"]), prop["value"]["objectId"])
+            for prop in result.get("result", [])
+            if prop["name"].isdigit() and "objectId" in prop.get("value", {})
+        ]
+        return [object_id for _, object_id in sorted(items)]
+
+    async def wait_until_ready(self, profile, readiness, phase):
+        """
+        异步等待页面满足就绪配置，与 PageReadiness.wait_until_ready 条件一致
+        :param readiness: PageReadiness，用于记录等待时间
+        """
+        check = ReadinessCheck(profile)
+        arguments = json.dumps([profile.container_selector, profile.item_selector])
+        expression = f"(function() {{{PAGE_STATE_SCRIPT}}}).apply(null, {arguments})"
+        start = time.perf_counter()
+        deadline = start + profile.timeout
+        while True:
+            try:
+                state = (await self.evaluate(expression)).get("value")
+                if state and check.is_ready(state):
+                    readiness.record(phase, time.perf_counter() - start)
+                    return True
+            except CdpError:
+                pass
+            if time.perf_counter() >= deadline:
+                readiness.record(phase, time.perf_counter() - start, timed_out=True)
+                print(f"等待页面就绪超时 ({phase}, {profile.timeout}秒)，继续执行...")
+                return False
+            await asyncio.sleep(profile.poll_interval)
+
+    async def close(self):
+        self.stop_network_log()
+        try:
+            await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+        except CdpError:
+            pass
+
+
+class CdpElement:
+    """selenium WebElement 的CDP实现，只包含抓取器用到的方法"""
+
+    def __init__(self, adapter, object_id):
+        self._adapter = adapter
+        self.object_id = object_id
+
+    @property
+    def text(self):
+        return self._adapter._call_on(self.object_id, ELEMENT_TEXT_FUNCTION)
+
+    def get_attribute(self, name):
+        return self._adapter._call_on(self.object_id, ELEMENT_ATTRIBUTE_FUNCTION, name)
+
+    def find_element(self, by, value):
+        return self._adapter._find(by, value, self.object_id, multiple=False)
+
+    def find_elements(self, by, value):
+        return self._adapter._find(by, value, self.object_id, multiple=True)
+
+    def click(self):
+        self._adapter._call_on(self.object_id, ELEMENT_CLICK_FUNCTION)
+
+
+class CdpDriverAdapter:
+    """
+    selenium WebDriver 的同步适配器
+
+    在工作线程中调用，把每个命令提交到事件循环执行并等待结果。
+    """
+
+    def __init__(self, page, loop, page_load_timeout=30, command_timeout=60):
+        self.page = page
+        self.loop = loop
+        self.page_load_timeout = page_load_timeout
+        self.command_timeout = command_timeout
+        # CdpPage.create 已注册网络请求跟踪脚本
+        self._news_scraper_network_tracker = True
+
+    def _run(self, coroutine):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        return future.result(self.command_timeout)
+
+    async def _find_async(self, by, value, root_object_id, multiple):
+        arguments = [by, value, multiple]
+        if root_object_id:
+            result = await self.page.call_function(
+                FIND_ELEMENTS_FUNCTION,
+                root_object_id,
+                [{"value": argument} for argument in arguments],
+                return_by_value=False,
+            )
+        else:
+            expression = f"({FIND_ELEMENTS_FUNCTION}).apply(document, {json.dumps(arguments)})"
+            result = await self.page.evaluate(expression, return_by_value=False)
+
+        if multiple:
+            return await self.page.array_object_ids(result["objectId"])
+        if result.get("subtype") == "null" or "objectId" not in result:
+            return None
+        return result["objectId"]
+
+    def _find(self, by, value, root_object_id=None, multiple=False):
+        found = self._run(self._find_async(by, value, root_object_id, multiple))
+        if multiple:
+            return [CdpElement(self, object_id) for object_id in found]
+        if found is None:
+            raise NoSuchElementException(f"未找到元素: {by}={value}")
+        return CdpElement(self, found)
+
+    def _call_on(self, object_id, declaration, *arguments):
+        result = self._run(
+            self.page.call_function(
+                declaration, object_id, [{"value": argument} for argument in arguments]
+            )
+        )
+        return result.get("value")
+
+    async def _execute_script_async(self, script, arguments):
+        declaration = "function() {\n" + script + "\n}"
+        elements = [argument for argument in arguments if isinstance(argument, CdpElement)]
+        if elements:
+            call_arguments = [
+                {"objectId": argument.object_id}
+                if isinstance(argument, CdpElement)
+                else {"value": argument}
+                for argument in arguments
+            ]
+            result = await self.page.call_function(declaration, elements[0].object_id, call_arguments)
+        else:
+            expression = f"({declaration}).apply(null, {json.dumps(list(arguments))})"
+            result = await self.page.evaluate(expression)
+        return result.get("value")
+
+    def get(self, url):
+        self._run(self.page.navigate(url, self.page_load_timeout))
+
+    def find_element(self, by, value):
+        return self._find(by, value, multiple=False)
+
+    def find_elements(self, by, value):
+        return self._find(by, value, multiple=True)
+
+    def execute_script(self, script, *arguments):
+        return self._run(self._execute_script_async(script, arguments))
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self._run(self.page.send(cmd, cmd_args))
+
+    async def _read_log_async(self):
+        return self.page.read_network_log()
+
+    def get_log(self, log_type):
+        """只支持performance日志，条目格式与chromedriver一致"""
+        if log_type != "performance":
+            raise ValueError(f"不支持的日志类型: {log_type}")
+        return [
+            {"message": json.dumps({"message": message})}
+            for message in self._run(self._read_log_async())
+        ]
+
+    @property
+    def current_url(self):
+        return self.execute_script("return location.href;")
+
+    @property
+    def page_source(self):
+        return self.execute_script("return document.documentElement.outerHTML;")
+
+
+class CdpScrapeEngine:
+    """
+    基于asyncio和CDP的抓取引擎
+
+    启动一个或几个Chrome进程，所有网站的列表页和内容页作为标签页在同一个事件循环中并发处理。
+    """
+
+    def __init__(self, browsers=None, max_pages=None, page_load_timeout=None):
+        """
+        :param browsers: 启动的Chrome进程数
+        :param max_pages: 同时打开的标签页数上限
+        :param page_load_timeout: 页面加载超时（秒）
+        """
+        self.browsers = browsers or int(os.environ.get("CDP_BROWSERS", "1"))
+        self.max_pages = max_pages or int(os.environ.get("CDP_MAX_PAGES", "8"))
+        self.page_load_timeout = page_load_timeout or int(
+            os.environ.get("SELENIUM_PAGE_LOAD_TIMEOUT", "30")
+        )
+        self._processes = []
+        self._connections = []
+        self._idle_pages = []
+        self._next_connection = 0
+        self._page_slots = None
+
+    async def start(self):
+        self._page_slots = asyncio.Semaphore(self.max_pages)
+        for _ in range(self.browsers):
+            process = ChromeProcess()
+            await process.start()
+            self._processes.append(process)
+            self._connections.append(await CdpConnection.connect(process.ws_url))
+
+    async def stop(self):
+        for page in self._idle_pages:
+            await page.close()
+        self._idle_pages = []
+        for connection in self._connections:
+            await connection.close()
+        self._connections = []
+        for process in self._processes:
+            await process.stop()
+        self._processes = []
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        """租用一个标签页，用完放回复用；出错的标签页直接关闭"""
+        async with self._page_slots:
+            if self._idle_pages:
+                page = self._idle_pages.pop()
+            else:
+                connection = self._connections[self._next_connection % len(self._connections)]
+                self._next_connection += 1
+                page = await CdpPage.create(connection)
+            try:
+                yield page
+            except BaseException:
+                await page.close()
+                raise
+            self._idle_pages.append(page)
+
+    async def run_with_adapter(self, page, scraper, function, *args):
+        """在线程中执行抓取器的同步方法，期间 scraper.driver 指向该标签页的适配器"""
+        adapter = CdpDriverAdapter(page, asyncio.get_running_loop(), self.page_load_timeout)
+
+        def call():
+            scraper._worker_local.driver = adapter
+            try:
+                return function(*args)
+            finally:
+                scraper._worker_local.driver = None
+
+        return await asyncio.to_thread(call)
+
+    async def scrape_list_page(self, scraper, url):
+        """与 BaseNewsScraper.scrape_news_list 一致，浏览器渲染部分在标签页适配器上执行"""
+        with span("scraper.list_page", url=url, engine="cdp") as list_span:
+            if scraper.http_fetch_enabled and scraper.supports_http_fetch():
+                news_list = await asyncio.to_thread(
+                    scraper.scrape_news_list_http, url, scraper.news_after_time
+                )
+                if news_list:
+                    list_span.set_attributes(source="http", items=len(news_list))
+                    return news_list
+                print("静态页面未解析到新闻，回退到浏览器抓取")
+
+            async with self.page() as page:
+                await page.set_blocking_profile(scraper.get_resource_blocking_profile())
+                # 从列表接口读取新闻的网站（含共享页面加载的组）需要页面的Network事件
+                if await asyncio.to_thread(scraper.reads_list_feed):
+                    page.start_network_log()
+                try:
+                    news_list = await self.run_with_adapter(
+                        page, scraper, scraper.scrape_news_list_browser, url, scraper.news_after_time
+                    )
+                finally:
+                    page.stop_network_log()
+            list_span.set_attributes(source="browser", items=len(news_list or []))
+            return news_list
+
+    async def scrape_content(self, scraper, news_item, site_slots):
+        async with site_slots:
+            with span("scraper.content", url=news_item["url"], engine="cdp"):
+                print(f"抓取新闻内容: {news_item['title']}")
+                try:
+                    content = await get_url_retrier().acall(
+                        news_item["url"], lambda: self._scrape_content(scraper, news_item)
+                    )
+                except Exception as e:
+                    print(f"抓取新闻内容失败: {news_item['url']}, {e}")
+                    content = None
+        if content is not None:
+            news_item["content"] = content
+        await asyncio.to_thread(scraper.write_news_item, news_item)
+        return content
+
+    async def _scrape_content(self, scraper, news_item):
+        """抓取一次新闻内容，失败时抛出异常，由重试策略决定是否重试"""
+        content = await asyncio.to_thread(scraper.get_cached_content, news_item["url"])
+        if content:
+            return content
+        content = await asyncio.to_thread(scraper.scrape_news_content_http, news_item["url"])
+        if content:
+            return content
+        async with self.page() as page:
+            await page.set_blocking_profile(scraper.get_resource_blocking_profile())
+            async with get_domain_scheduler().async_slot(
+                news_item["url"], scraper.get_domain_rate_limit()
+            ):
+                await page.navigate(news_item["url"], self.page_load_timeout)
+            await page.wait_until_ready(
+                scraper.get_content_readiness_profile(),
+                scraper.page_readiness,
+                "content_page",
+            )
+            try:
+                content = await self.run_with_adapter(
+                    page, scraper, scraper.extract_content, news_item["url"]
+                )
+            except NoSuchElementException as e:
+                raise ContentParseError(f"未找到指定的HTML标签或类名: {e.msg}") from e
+        if not content:
+            raise ContentParseError("Content is None")
+        await asyncio.to_thread(scraper.cache_content, news_item["url"], content)
+        return content
+
+    async def scrape(self, scraper):
+        """
+        抓取一个网站，流程与 BaseNewsScraper.scrape_news 一致
+        :return: 输出文件路径，失败返回None
+        """
+        site = os.path.splitext(scraper.get_json_filename())[0]
+        with span("scraper.scrape_news", site=site, engine="cdp") as scrape_span:
+            scraper.load_checkpoint()
+            merged_news_list = scraper.checkpoint_news()
+            list_pages = 0
+            for list_page_url in scraper.iter_pending_list_page_urls():
+                scraper.last_list_page_oldest_time = None
+                list_pages += 1
+                news_list = await self.scrape_list_page(scraper, list_page_url)
+                if not news_list:
+                    print("未找到任何新闻")
+                    break
+                scraper.print_news_list(news_list)
+                merged_news_list.extend(news_list)
+                reached_cutoff = scraper.list_page_reached_cutoff()
+                await asyncio.to_thread(
+                    scraper.checkpoint_list_page, list_page_url, news_list, reached_cutoff
+                )
+                if reached_cutoff:
+                    break
+
+            listed = len(merged_news_list)
+            if not (scraper.checkpoint and scraper.checkpoint.list_complete):
+                merged_news_list = await asyncio.to_thread(scraper.skip_existing_news, merged_news_list)
+                merged_news_list = await asyncio.to_thread(scraper.resolve_publish_times, merged_news_list)
+                await asyncio.to_thread(scraper.checkpoint_news_list, merged_news_list)
+            resumed_news_list, pending_news_list = await asyncio.to_thread(
+                scraper.split_resumed_news, merged_news_list
+            )
+            site_slots = asyncio.Semaphore(scraper.get_content_concurrency())
+            scraper.open_news_stream(merged_news_list, resumed_news_list)
+            try:
+                with span("scraper.contents", items=len(pending_news_list), resumed=len(resumed_news_list)):
+                    contents = await asyncio.gather(
+                        *(self.scrape_content(scraper, news_item, site_slots) for news_item in pending_news_list)
+                    )
+            except BaseException:
+                scraper.abort_news_stream()
+                raise
+            filename = await asyncio.to_thread(scraper.finish_news_stream)
+            if filename:
+                scraper.finish_checkpoint()
+            print(
+                f"新闻内容抓取完成，成功 {sum(1 for c in contents if c is not None)}/{len(pending_news_list)} 条"
+            )
+
+            merged_news_list = resumed_news_list + pending_news_list
+            scraper.save_publish_time_indexes()
+            scraper.page_readiness.print_report(f"{scraper.get_json_filename()} 等待时间统计")
+            scraper.http_cache_stats.print_stats(f"{scraper.get_json_filename()} 内容缓存统计")
+            scrape_span.set_attributes(
+                list_pages=list_pages,
+                listed=listed,
+                fetched=len(merged_news_list),
+                with_content=sum(1 for news in merged_news_list if news.get("content")),
+            )
+            return filename
+
+    async def scrape_website(self, website, scraper_class, time_range, max_retry):
+        """抓取单个网站，失败时整站重试"""
+        for retry_count in range(max_retry + 1):
+            scraper = None
+            failed = False
+            try:
+                print(f"开始抓取 {website} 新闻 (CDP引擎)...")
+                if retry_count > 0:
+                    await asyncio.sleep(site_retry_delay(retry_count))
+                    print(f"开始抓取 {website} 新闻的第 {retry_count} 次重试 ...")
+                scraper = scraper_class(time_range)
+                with span("cli.scrape_website", website=website, attempt=retry_count, engine="cdp"):
+                    filename = await self.scrape(scraper)
+                if filename:
+                    return filename
+            except Exception as e:
+                failed = True
+                print(f"✗ {website} 抓取异常: {e}")
+            finally:
+                if scraper:
+                    try:
+                        # 异常退出的浏览器状态不可信，不放回池中复用
+                        scraper.close(discard=failed)
+                    except Exception as e:
+                        print(f"关闭 {website} 抓取器时发生异常: {e}")
+        return None
+
+    async def run(self, scrape_tasks):
+        """
+        并发抓取多个网站
+        :param scrape_tasks: (website, scraper_class, time_range, max_retry) 列表
+        :return: (website, 文件路径或None) 列表
+        """
+        await self.start()
+        try:
+            filenames = await asyncio.gather(
+                *(self.scrape_website(*task) for task in scrape_tasks)
+            )
+        finally:
+            await self.stop()
+        return [(task[0], filename) for task, filename in zip(scrape_tasks, filenames)]
+
+
+def run_scrape_tasks(scrape_tasks):
+    """同步入口，供Cli调用"""
+    return asyncio.run(CdpScrapeEngine().run(scrape_tasks))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓取断点 - 记录每个网站已抓取的列表页面、发现的新闻和已抓到内容的URL
+
+同一次运行中的重试和工作进程从断点继续：已完成的列表页面不再打开，已抓到内容的新闻从上次的
+NDJSON流中取回，不再重新抓取。断点在网站抓取成功后删除；属于其他运行、超过抓取时间范围
+的断点作废，定时任务的下一次运行总是重新查找列表页面。
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+
+
+def checkpoint_enabled():
+    return os.environ.get("CHECKPOINT_ENABLED", "1") == "1"
+
+
+def start_checkpoint_run():
+    """
+    开始新的一次运行，之前运行留下的断点不再使用
+    运行ID保存在环境变量中，process 模式下启动的工作进程继承同一个ID
+    """
+    run_id = uuid.uuid4().hex
+    os.environ["SCRAPE_RUN_ID"] = run_id
+    return run_id
+
+
+def current_run_id():
+    return os.environ.get("SCRAPE_RUN_ID")
+
+
+class SiteCheckpoint:
+    """单个网站的抓取断点，保存在 DATA_DIR/checkpoints/<网站>.json"""
+
+    def __init__(self, filepath, window_hours, created_at=None, run_id=None):
+        self.filepath = filepath
+        self.window_hours = window_hours
+        self.created_at = created_at or time.time()
+        self.run_id = run_id or current_run_id()
+        # 已完成的列表页面URL，按抓取顺序
+        self.list_pages = []
+        # 最后完成的列表页面已早于截止时间，续抓时不再翻页
+        self.reached_cutoff = False
+        self.list_complete = False
+        # 列表页面中发现的新闻（不含内容），按发现顺序
+        self.news = []
+        self.fetched_urls = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, filepath, window_hours):
+        """
+        读取断点，不存在、已过期、属于其他运行或时间范围不同时返回新的空断点
+        :param window_hours: 本次抓取的时间范围（小时）
+        """
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(filepath, window_hours)
+        except (OSError, ValueError) as e:
+            print(f"读取抓取断点失败: {e}")
+            return cls(filepath, window_hours)
+
+        checkpoint = cls(filepath, data.get("window_hours"), data.get("created_at"), data.get("run_id"))
+        if (
+            checkpoint.window_hours != window_hours
+            or checkpoint.run_id != current_run_id()
+            or checkpoint.is_expired()
+        ):
+            print(f"抓取断点已失效，重新开始: {filepath}")
+            checkpoint.remove()
+            return cls(filepath, window_hours)
+        checkpoint.list_pages = data.get("list_pages", [])
+        checkpoint.reached_cutoff = data.get("reached_cutoff", False)
+        checkpoint.list_complete = data.get("list_complete", False)
+        checkpoint.news = data.get("news", [])
+        checkpoint.fetched_urls = set(data.get("fetched_urls", []))
+        return checkpoint
+
+    def is_expired(self, now=None):
+        """超过抓取时间范围的断点中，新闻列表已不再对应当前的时间窗口"""
+        now = now or time.time()
+        return now - self.created_at > self.window_hours * 3600
+
+    @property
+    def resumed(self):
+        return bool(self.list_pages or self.news)
+
+    def add_list_page(self, url, news_list, reached_cutoff=False):
+        """:param reached_cutoff: 该页面最早的新闻已早于截止时间，之后的页面不再需要"""
+        with self._lock:
+            self.list_pages.append(url)
+            self.news.extend(news_list)
+            self.reached_cutoff = reached_cutoff
+        self.save()
+
+    def complete_list(self, news_list):
+        """列表页面全部完成，保存跳过已入库新闻后的待抓取列表"""
+        with self._lock:
+            self.list_complete = True
+            self.news = list(news_list)
+        self.save()
+
+    def mark_fetched(self, url):
+        with self._lock:
+            self.fetched_urls.add(url)
+        self.save()
+
+    def save(self):
+        with self._lock:
+            data = {
+                "created_at": self.created_at,
+                "window_hours": self.window_hours,
+                "run_id": self.run_id,
+                "list_pages": list(self.list_pages),
+                "reached_cutoff": self.reached_cutoff,
+                "list_complete": self.list_complete,
+                "news": list(self.news),
+                "fetched_urls": sorted(self.fetched_urls),
+            }
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.filepath)), exist_ok=True)
+                tmp_path = f"{self.filepath}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.filepath)
+            except OSError as e:
+                print(f"保存抓取断点失败: {e}")
+
+    def remove(self):
+        try:
+            os.remove(self.filepath)
+        except OSError:
+            pass
@@ -1,5 +1,9 @@
 from typing import List, Union
+import multiprocessing
 import os
+import queue
+import signal
+import sys
 import time
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -9,6 +13,26 @@ from cls_news_scraper import CLSNewsScraper
 from cls_headline_news_scraper import CLSHeadlineNewsScraper
 from jqka_news_scraper import JQKANewsScraper
 from wallstreetcn_news_scraper import WallStreetCNNewsScraper
+from browser_pool import get_browser_pool
+from checkpoint import start_checkpoint_run
+from fixtures import get_fixture_recorder, active_fixture_server
+from memory_watchdog import get_memory_watchdog, print_site_peaks
+from process_metrics import descendant_pids
+from retry_policy import get_url_retrier, site_retry_delay
+from domain_scheduler import get_domain_scheduler
+from page_groups import start_page_load_groups
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.tracing import span, bind_context
+
+# 支持的新闻网站及其抓取器
+SCRAPER_CLASSES = {
+    "东方财富网": EastMoneyNewsScraper,
+    "财联社": CLSNewsScraper,
+    "财联社头条": CLSHeadlineNewsScraper,
+    "同花顺": JQKANewsScraper,
+    "华尔街见闻": WallStreetCNNewsScraper,
+}
 
 
 class Cli:
@@ -40,17 +64,8 @@ class Cli:
         # 创建抓取任务列表
         scrape_tasks = []
         for website in params["websites"]:
-            if website == "东方财富网":
-                scraper_class = EastMoneyNewsScraper
-            elif website == "财联社":
-                scraper_class = CLSNewsScraper
-            elif website == "财联社头条":
-                scraper_class = CLSHeadlineNewsScraper
-            elif website == "同花顺":
-                scraper_class = JQKANewsScraper
-            elif website == "华尔街见闻":
-                scraper_class = WallStreetCNNewsScraper
-            else:
+            scraper_class = SCRAPER_CLASSES.get(website)
+            if scraper_class is None:
                 print(f"不支持的新闻网站: {website}")
                 continue
             scrape_tasks.append((website, scraper_class, params["time_range"], params["max_retry"]))
@@ -58,10 +73,49 @@ class Cli:
         if len(scrape_tasks) == 0:
             return False
 
-        self._run_scrape_tasks(scrape_tasks, params["max_workers"])
+        if not "engine" in params:
+            params["engine"] = os.environ.get("SCRAPE_ENGINE", "selenium")
+        if params["engine"] not in ("cdp", "selenium"):
+            print(f"不支持的抓取引擎: {params['engine']}")
+            return False
+
+        if not "executor" in params:
+            params["executor"] = os.environ.get("SCRAPE_EXECUTOR", "thread")
+        if params["executor"] not in ("thread", "process"):
+            print(f"不支持的执行方式: {params['executor']}")
+            return False
+
+        if not "site_timeout" in params:
+            params["site_timeout"] = int(os.environ.get("SITE_TIMEOUT", "1800"))
+
+        # 断点只在本次运行内的重试和工作进程之间使用
+        start_checkpoint_run()
+        retrier = get_url_retrier()
+        retrier.start_run()
+        scheduler = get_domain_scheduler()
+        scheduler.start_run()
+        get_memory_watchdog().start_run()
+        with span("cli.run", engine=params["engine"], websites=len(scrape_tasks)):
+            if params["engine"] == "cdp":
+                self._run_scrape_tasks_cdp(scrape_tasks)
+            elif params["executor"] == "process":
+                self._run_scrape_tasks_process(
+                    scrape_tasks, params["max_workers"], params["site_timeout"]
+                )
+            else:
+                self._run_scrape_tasks(scrape_tasks, params["max_workers"])
+        # process 模式下各工作进程各自输出重试和限速统计
+        retrier.metrics.print_stats()
+        scheduler.print_report()
+        self._finish_fixtures()
 
     def _run_scrape_tasks(self, scrape_tasks, max_workers=3):
         print(f"开始并发抓取 {len(scrape_tasks)} 个网站的新闻...")
+        # 在提交任务前预热浏览器池，使首批抓取器无需等待浏览器启动
+        browser_pool = get_browser_pool()
+        browser_pool.warm_up()
+        # 同一进程中的抓取器才能共用列表页面加载
+        start_page_load_groups({scraper_class for _, scraper_class, *_ in scrape_tasks})
         successful_scrapes = []
         failed_scrapes = []
 
@@ -69,7 +123,7 @@ class Cli:
             # 提交所有抓取任务
             future_to_website = {
                 executor.submit(
-                    self._scrape_single_website, website, scraper_class, time_range, max_retry
+                    bind_context(self._scrape_single_website), website, scraper_class, time_range, max_retry
                 ): website
                 for website, scraper_class, time_range, max_retry in scrape_tasks
             }
@@ -87,6 +141,97 @@ class Cli:
                     failed_scrapes.append(website)
                     print(f"✗ {website} 抓取时发生严重异常: {e}")
 
+        watchdog = get_memory_watchdog()
+        self._print_summary(
+            successful_scrapes, failed_scrapes, watchdog.site_peaks(), watchdog.peak_python_bytes
+        )
+        browser_pool.print_stats()
+
+    def _run_scrape_tasks_process(self, scrape_tasks, max_workers=3, site_timeout=1800):
+        """
+        每个网站在单独的工作进程中抓取，各自使用自己的浏览器
+        结果通过队列返回，超过 site_timeout 秒仍未完成的进程连同其浏览器一起被终止
+        """
+        print(f"开始使用 {max_workers} 个工作进程抓取 {len(scrape_tasks)} 个网站的新闻...")
+        # 使用spawn启动，子进程不继承父进程中的线程和浏览器连接
+        context = multiprocessing.get_context("spawn")
+        result_queue = context.Queue()
+        pending = list(scrape_tasks)
+        running = {}
+        results = {}
+        memory_peaks = {}
+
+        while pending or running:
+            while pending and len(running) < max_workers:
+                website, _, time_range, max_retry = pending.pop(0)
+                process = context.Process(
+                    target=_scrape_website_in_process,
+                    args=(website, time_range, max_retry, result_queue),
+                    name=f"scraper-{website}",
+                )
+                process.start()
+                running[website] = {"process": process, "started_at": time.monotonic(), "exited_at": None}
+
+            try:
+                website, filename, site_peaks = result_queue.get(timeout=1)
+                results[website] = filename
+                memory_peaks.update(site_peaks)
+                print(f"{'✓' if filename else '✗'} {website} 工作进程已返回结果")
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            for website, worker in list(running.items()):
+                process = worker["process"]
+                if website in results:
+                    process.join(10)
+                    if process.is_alive():
+                        _terminate_process_tree(process)
+                    del running[website]
+                elif not process.is_alive():
+                    # 进程退出时结果可能仍在队列中，稍等片刻再判定为异常退出
+                    if worker["exited_at"] is None:
+                        worker["exited_at"] = now
+                    elif now - worker["exited_at"] > 2:
+                        print(f"✗ {website} 工作进程异常退出，退出码: {process.exitcode}")
+                        results[website] = None
+                        del running[website]
+                elif now - worker["started_at"] > site_timeout:
+                    print(f"✗ {website} 抓取超过 {site_timeout} 秒，终止工作进程")
+                    _terminate_process_tree(process)
+                    results[website] = None
+                    del running[website]
+
+        successful_scrapes = [(w, results[w]) for w, *_ in scrape_tasks if results.get(w)]
+        failed_scrapes = [w for w, *_ in scrape_tasks if not results.get(w)]
+        self._print_summary(successful_scrapes, failed_scrapes, memory_peaks)
+
+    def _run_scrape_tasks_cdp(self, scrape_tasks):
+        """使用asyncio CDP引擎在同一个事件循环中抓取所有网站"""
+        # websockets 只在使用CDP引擎时需要
+        from cdp_engine import run_scrape_tasks
+
+        print(f"开始使用CDP引擎并发抓取 {len(scrape_tasks)} 个网站的新闻...")
+        start_page_load_groups({scraper_class for _, scraper_class, *_ in scrape_tasks})
+        successful_scrapes = []
+        failed_scrapes = []
+        for website, result in run_scrape_tasks(scrape_tasks):
+            if result:
+                successful_scrapes.append((website, result))
+            else:
+                failed_scrapes.append(website)
+        self._print_summary(successful_scrapes, failed_scrapes)
+
+    def _finish_fixtures(self):
+        """录制模式下保存存档，回放模式下输出回放统计"""
+        recorder = get_fixture_recorder()
+        if recorder:
+            recorder.save()
+        server = active_fixture_server()
+        if server:
+            server.print_stats()
+
+    def _print_summary(self, successful_scrapes, failed_scrapes, memory_peaks=None, python_bytes=None):
         # 汇总结果
         print(
             f"\n抓取完成！成功: {len(successful_scrapes)}, 失败: {len(failed_scrapes)}"
@@ -95,6 +240,7 @@ class Cli:
             print(f"失败的网站: {', '.join(failed_scrapes)}")
         if not successful_scrapes:
             print("所有网站抓取都失败了")
+        print_site_peaks(memory_peaks, python_bytes)
 
     def _scrape_single_website(
         self, website: str, scraper_class, time_range: int, max_retry: int = 1
@@ -109,28 +255,69 @@ class Cli:
         """
         for retry_count in range(max_retry + 1):  # +1 because we include the first attempt
             scraper = None
+            failed = False
             try:
                 print(f"开始抓取 {website} 新闻...")
                 if retry_count > 0:
-                    # 重试前等待一段时间，递增等待时间：5秒, 10秒, 15秒...
-                    time.sleep(5 * retry_count)
+                    # 重试前等待一段时间，指数退避加随机抖动，多个网站不会同时重试
+                    time.sleep(site_retry_delay(retry_count))
                     print(f"开始抓取 {website} 新闻的第 {retry_count} 次重试 ...")
 
-                scraper = scraper_class(time_range)
-                filename = scraper.scrape_news()
+                with span("cli.scrape_website", website=website, attempt=retry_count):
+                    # 本网站租用的浏览器和抓取期间的本进程内存计入网站内存峰值
+                    with get_memory_watchdog().site(website):
+                        scraper = scraper_class(time_range)
+                        filename = scraper.scrape_news()
                 if filename:
                     return filename
             except Exception as e:
+                failed = True
                 print(f"✗ {website} 抓取异常: {e}")
             finally:
                 if scraper:
                     try:
-                        scraper.close()
+                        # 异常退出的浏览器状态不可信，不放回池中复用
+                        scraper.close(discard=failed)
                     except Exception as e:
                         print(f"关闭 {website} 抓取器时发生异常: {e}")
 
         return None
 
+def _scrape_website_in_process(website, time_range, max_retry, result_queue):
+    """工作进程入口：抓取一个网站，把 (网站, 文件名, 内存峰值) 放入结果队列"""
+    filename = None
+    try:
+        filename = Cli()._scrape_single_website(
+            website, SCRAPER_CLASSES[website], time_range, max_retry
+        )
+    finally:
+        # 在返回结果前保存，父进程收到结果后可能终止本进程
+        recorder = get_fixture_recorder()
+        if recorder:
+            recorder.save()
+        result_queue.put((website, filename, get_memory_watchdog().site_peaks()))
+        get_url_retrier().metrics.print_stats(f"{website} URL重试统计")
+        get_domain_scheduler().print_report(f"{website} 域名限速统计")
+        browser_pool = get_browser_pool()
+        browser_pool.print_stats()
+        browser_pool.shutdown()
+
+
+def _terminate_process_tree(process):
+    """终止工作进程及其启动的chromedriver和Chrome进程"""
+    children = descendant_pids(process.pid)
+    process.terminate()
+    process.join(5)
+    if process.is_alive():
+        process.kill()
+        process.join()
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
 if __name__ == "__main__":
     load_dotenv()
     
@@ -138,7 +325,10 @@ if __name__ == "__main__":
         "websites": ["东方财富网", "财联社", "财联社头条", "同花顺", "华尔街见闻"],
         "time_range": int(os.environ.get("TIME_RANGE", "3")),  # hours
         "max_workers": int(os.environ.get("MAX_WORKERS", "5")),
-        "max_retry": int(os.environ.get("MAX_RETRY", "1"))
+        "max_retry": int(os.environ.get("MAX_RETRY", "1")),
+        "engine": os.environ.get("SCRAPE_ENGINE", "selenium"),
+        "executor": os.environ.get("SCRAPE_EXECUTOR", "thread"),
+        "site_timeout": int(os.environ.get("SITE_TIMEOUT", "1800")),
     }
 
     cli = Cli()
@@ -4,10 +4,18 @@ from selenium.webdriver.remote.webelement import WebElement
 import re
 
 from base_news_scraper import BaseNewsScraper, ListPageType
+from page_readiness import ReadinessProfile
+from scroll_strategy import NO_SCROLL
+from domain_scheduler import DomainRateLimit
+from page_groups import get_page_load_group
 
+# 财联社深度和头条来自同一个列表页面
+@get_page_load_group("cls_depth").register
 class CLSHeadlineNewsScraper(BaseNewsScraper):
     def __init__(self, hours_ago=3):
         super().__init__(hours_ago)
+        self.content_concurrency = 2
+        self.domain_rate_limit = DomainRateLimit(requests_per_second=1.5, burst=3, max_concurrency=2)
 
     def clean_title(self, title_text):
         """
@@ -29,9 +37,38 @@ class CLSHeadlineNewsScraper(BaseNewsScraper):
     def get_list_page_type(self):
         return ListPageType.PAGINATION
 
+    def get_scroll_strategy(self):
+        # 头条文章在首屏渲染，滚动不会加载更多
+        return NO_SCROLL
+
     def get_list_page_urls(self):
         return ["https://www.cls.cn/depth?id=1000"]
 
+    def get_list_readiness_profile(self):
+        return ReadinessProfile(
+            container_selector="div.depth-top-article-list",
+            item_selector="div.depth-top-article-list",
+            network_idle_ms=500,
+        )
+
+    def get_article_id(self, url):
+        # 文章地址形如 https://www.cls.cn/detail/1234567，ID随发布时间递增
+        match = re.search(r"cls\.cn/detail/(\d+)", url)
+        return int(match.group(1)) if match else None
+
+    def supports_time_probe(self):
+        return True
+
+    def get_time_probe_patterns(self, article_id):
+        # 页面数据中文章自身的 ctime（Unix时间戳）
+        return [re.compile(r'"id":\s*%d\s*,[^{}]*?"ctime":\s*(\d{10})' % article_id)]
+
+    def get_content_selector(self):
+        return "div.f-l.w-894"
+
+    def get_content_readiness_profile(self):
+        return ReadinessProfile(container_selector="div.f-l.w-894")
+
     def find_items_in_list_page(self):
         news_items = self.driver.find_elements(
             By.CSS_SELECTOR, "div.depth-top-article-list"
@@ -39,6 +76,27 @@ class CLSHeadlineNewsScraper(BaseNewsScraper):
 
         return news_items
 
+    def get_list_item_selectors(self):
+        return {
+            "item": "div.depth-top-article-list",
+            "title": "a",
+            # 选择第一个有文本内容的链接，确保是有效的标题
+            "min_title_length": 5,
+            "include_text": True,
+        }
+
+    def parse_list_item_record(self, record):
+        title_text = self.clean_title(record["title"] or "")
+        link_url = record["href"] if title_text else None
+        # 如果没有找到链接，尝试从元素文本中提取标题
+        if not title_text and record.get("text"):
+            for line in record["text"].split("\n"):
+                line = line.strip()
+                if line and len(line) > 5 and not re.match(r".*小时前.*", line):
+                    title_text = self.clean_title(line)
+                    break
+        return title_text or None, link_url, "财联社", None
+
     def parse_list_page_item(self, item: WebElement):
         news_element = item
         title_text = None
@@ -13,15 +13,39 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
-import time
 from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import hashlib
 import re
 from base_news_scraper import BaseNewsScraper, ListPageType
+from page_readiness import ReadinessProfile
+from scroll_strategy import NO_SCROLL
+from xhr_feed import FeedItem, XhrFeed
+from domain_scheduler import DomainRateLimit
+from page_groups import get_page_load_group
 
 
+# "加载更多"按钮，由脚本渲染
+LOAD_MORE_XPATH = "//div[contains(@class, 'more-button') and contains(text(), '加载更多')]"
+
+# 深度列表的翻页接口，按上一页最早文章的时间 last_time 取下一页
+DEPTH_LIST_API = "https://www.cls.cn/v3/depth/list/1000"
+
+
+def sign_params(params):
+    """财联社接口的签名：按参数名排序后的查询串做SHA1，再对十六进制结果做MD5"""
+    query = urlencode(sorted(params.items()))
+    return hashlib.md5(hashlib.sha1(query.encode("utf-8")).hexdigest().encode("utf-8")).hexdigest()
+
+
+# 财联社深度和头条来自同一个列表页面
+@get_page_load_group("cls_depth").register
 class CLSNewsScraper(BaseNewsScraper):
     def __init__(self, hours_ago=3):
         super().__init__(hours_ago)
+        self.content_concurrency = 2
+        # 与财联社头条共用 www.cls.cn 的限速
+        self.domain_rate_limit = DomainRateLimit(requests_per_second=1.5, burst=3, max_concurrency=2)
         self.load_more_clicks = 5
 
     def clean_title(self, title_text):
@@ -63,35 +87,42 @@ class CLSNewsScraper(BaseNewsScraper):
             print(f"解析时间时发生错误: {e}, 时间字符串: {time_text}")
             return None
 
+    def count_news_items(self):
+        return len(
+            self.driver.find_elements(
+                By.CSS_SELECTOR, "div.subject-interest-image-content-box.p-r"
+            )
+        )
+
     def click_load_more_button(self):
         for i in range(self.load_more_clicks):
             try:
+                # 最后一条新闻已早于截止时间，继续加载只会得到更早的新闻
+                if self.load_more_reached_cutoff():
+                    break
+
                 print(f"第 {i+1} 次尝试点击'加载更多'按钮...")
 
                 # 滚动到页面底部，确保按钮可见
                 self.driver.execute_script(
                     "window.scrollTo(0, document.body.scrollHeight);"
                 )
-                time.sleep(2)
 
                 # 记录点击前的新闻数量
-                news_count_before = len(
-                    self.driver.find_elements(
-                        By.CSS_SELECTOR, "div.subject-interest-image-content-box.p-r"
-                    )
-                )
+                news_count_before = self.count_news_items()
 
-                # 通过文本内容查找按钮
-                load_more_button = self.driver.find_element(
-                    By.XPATH,
-                    "//div[contains(@class, 'more-button') and contains(text(), '加载更多')]",
+                # 通过文本内容查找按钮，按钮由脚本渲染，出现后立即继续
+                self.page_readiness.wait_for(
+                    lambda: self.driver.find_elements(By.XPATH, LOAD_MORE_XPATH),
+                    timeout=3,
+                    phase="load_more",
                 )
+                load_more_button = self.driver.find_element(By.XPATH, LOAD_MORE_XPATH)
 
                 # 确保按钮可见
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView(true);", load_more_button
                 )
-                time.sleep(1)
 
                 # 尝试点击按钮
                 try:
@@ -108,19 +139,15 @@ class CLSNewsScraper(BaseNewsScraper):
                         print(f"JavaScript点击也失败: {js_click_error}")
                         break
 
-                # 等待新内容加载
-                time.sleep(3)
-
-                # 等待JavaScript执行完成
-                self.wait_for_javascript_completion()
+                # 等待新闻数量增加，新内容出现后立即继续
+                self.page_readiness.wait_for(
+                    lambda: self.count_news_items() > news_count_before,
+                    timeout=8,
+                    phase="load_more",
+                )
 
                 # 检查是否有新内容加载
-                news_count_after = len(
-                    self.driver.find_elements(
-                        By.CSS_SELECTOR,
-                        "div.subject-interest-image-content-box.p-r",
-                    )
-                )
+                news_count_after = self.count_news_items()
 
                 if news_count_after > news_count_before:
                     print(
@@ -145,9 +172,82 @@ class CLSNewsScraper(BaseNewsScraper):
     def get_list_page_type(self):
         return ListPageType.LOAD_MORE
 
+    def get_scroll_strategy(self):
+        # 新闻由"加载更多"按钮加载，点击前会滚动到按钮处
+        return NO_SCROLL
+
     def get_list_page_urls(self):
         return ["https://www.cls.cn/depth?id=1000"]
 
+    def get_xhr_feed(self):
+        # 首屏由服务端渲染，点击"加载更多"后由深度列表接口加载
+        return XhrFeed(r"cls\.cn/v3/depth/(home/assembled|list)/1000", max_pages=self.load_more_clicks)
+
+    def parse_feed_response(self, data):
+        articles = data.get("data") or []
+        if isinstance(articles, dict):
+            articles = articles.get("depth_list") or []
+        items = []
+        for article in articles:
+            title_text = self.clean_title(article.get("title") or article.get("brief") or "")
+            if not title_text or not article.get("id"):
+                continue
+            ctime = article.get("ctime")
+            news_time = datetime.fromtimestamp(ctime) if ctime else None
+            items.append(
+                FeedItem(title_text, f"https://www.cls.cn/detail/{article['id']}", "财联社", news_time)
+            )
+        return items
+
+    def next_feed_page_url(self, url, data, page_items):
+        times = [item.time for item in page_items if item.time is not None]
+        if not times:
+            return None
+        # 沿用页面请求的客户端参数，签名随参数重新计算
+        captured = dict(parse_qsl(urlsplit(url).query))
+        params = {
+            "app": captured.get("app", "CailianpressWeb"),
+            "os": captured.get("os", "web"),
+            "sv": captured.get("sv", "8.4.6"),
+            "id": "1000",
+            "last_time": str(int(min(times).timestamp())),
+            "rn": captured.get("rn", "20"),
+        }
+        params["sign"] = sign_params(params)
+        return f"{DEPTH_LIST_API}?{urlencode(params)}"
+
+    def trigger_feed_request(self):
+        buttons = self.driver.find_elements(By.XPATH, LOAD_MORE_XPATH)
+        if not buttons:
+            return False
+        self.driver.execute_script("arguments[0].click();", buttons[0])
+        return True
+
+    def get_list_readiness_profile(self):
+        return ReadinessProfile(
+            container_selector="div.depth-list-box",
+            item_selector="div.subject-interest-image-content-box.p-r",
+            network_idle_ms=500,
+        )
+
+    def get_article_id(self, url):
+        # 文章地址形如 https://www.cls.cn/detail/1234567，ID随发布时间递增
+        match = re.search(r"cls\.cn/detail/(\d+)", url)
+        return int(match.group(1)) if match else None
+
+    def supports_time_probe(self):
+        return True
+
+    def get_time_probe_patterns(self, article_id):
+        # 页面数据中文章自身的 ctime（Unix时间戳）
+        return [re.compile(r'"id":\s*%d\s*,[^{}]*?"ctime":\s*(\d{10})' % article_id)]
+
+    def get_content_selector(self):
+        return "div.f-l.w-894"
+
+    def get_content_readiness_profile(self):
+        return ReadinessProfile(container_selector="div.f-l.w-894")
+
     def find_items_in_list_page(self):
         news_container = self.driver.find_element(By.CSS_SELECTOR, "div.depth-list-box")
         print("成功找到指定的新闻列表容器")
@@ -159,6 +259,22 @@ class CLSNewsScraper(BaseNewsScraper):
 
         return news_items
 
+    def get_list_item_selectors(self):
+        return {
+            "container": "div.depth-list-box",
+            "item": "div.subject-interest-image-content-box.p-r",
+            "title": "div.subject-interest-title a",
+            "time": "span.m-r-5",
+        }
+
+    def parse_list_item_record(self, record):
+        title_text = self.clean_title(record["title"] or "")
+        link_url = record["href"]
+        if not title_text or not link_url:
+            return None, None, None, None
+        news_time = self.parse_time_string(record["time"]) if record["time"] else None
+        return title_text, link_url, "财联社", news_time
+
     def parse_list_page_item(self, item: WebElement):
         news_element = item
         title_text = None
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按域名限速 - 每个域名一个令牌桶和并发上限，所有网站的页面加载和HTTP请求都经过调度器
+
+    with get_domain_scheduler().slot(url, scraper.get_domain_rate_limit()):
+        driver.get(url)
+
+请求只等待自己域名的令牌和并发名额，各网站互不阻塞：慢的网站被限速时，其他网站的
+工作线程继续请求，整体吞吐不受单个网站拖累。运行结束后输出每个域名的利用率。
+"""
+
+from urllib.parse import urlsplit
+import asyncio
+import contextlib
+import os
+import threading
+import time
+
+
+def politeness_enabled():
+    return os.environ.get("POLITENESS_ENABLED", "1") == "1"
+
+
+class DomainRateLimit:
+    """
+    单个域名的限速配置
+    :param requests_per_second: 令牌补充速率
+    :param burst: 令牌桶容量，允许的突发请求数
+    :param max_concurrency: 同时进行的请求数上限
+    """
+
+    def __init__(self, requests_per_second=None, burst=None, max_concurrency=None):
+        self.requests_per_second = requests_per_second or float(
+            os.environ.get("DOMAIN_RATE_LIMIT", "2")
+        )
+        self.burst = burst or int(os.environ.get("DOMAIN_BURST", "4"))
+        self.max_concurrency = max_concurrency or int(os.environ.get("DOMAIN_MAX_CONCURRENCY", "4"))
+
+
+class DomainLimiter:
+    """令牌桶加并发上限"""
+
+    def __init__(self, domain, limit):
+        self.domain = domain
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.active = 0
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        # 统计
+        self.requests = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        # 按第一次未取得名额的原因分别累计的等待时间
+        self.rate_wait_seconds = 0.0
+        self.concurrency_wait_seconds = 0.0
+        self.rate_limited = 0
+        self.concurrency_limited = 0
+        # 正在等待名额的请求数，即本域名的排队长度
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.busy_seconds = 0.0
+        self.peak_active = 0
+        self.first_request_at = None
+        self.last_release_at = None
+
+    def _refill(self, now):
+        self.tokens = min(
+            float(self.limit.burst),
+            self.tokens + (now - self._updated) * self.limit.requests_per_second,
+        )
+        self._updated = now
+
+    def try_acquire(self):
+        """
+        :return: (是否取得名额, 取不到时建议等待的秒数，None表示等待其他请求释放名额)
+        调用方需持有 self._condition
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if self.active >= self.limit.max_concurrency:
+            return False, None
+        if self.tokens < 1:
+            return False, (1 - self.tokens) / self.limit.requests_per_second
+        self.tokens -= 1
+        self.active += 1
+        self.requests += 1
+        self.peak_active = max(self.peak_active, self.active)
+        if self.first_request_at is None:
+            self.first_request_at = now
+        return True, 0.0
+
+    def _start_waiting(self):
+        """请求第一次未取得名额，进入排队，调用方需持有 self._condition"""
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+
+    def _record_wait(self, waited, wait_hint):
+        """:param wait_hint: 第一次未取得名额时的原因，False 表示没有等待"""
+        if wait_hint is False:
+            return
+        self.waiting -= 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        if wait_hint is None:
+            self.concurrency_limited += 1
+            self.concurrency_wait_seconds += waited
+        else:
+            self.rate_limited += 1
+            self.rate_wait_seconds += waited
+
+    def acquire(self):
+        """阻塞直到取得名额，:return: 取得名额的时刻"""
+        start = time.monotonic()
+        first_hint = False
+        with self._condition:
+            while True:
+                acquired, wait = self.try_acquire()
+                if acquired:
+                    now = time.monotonic()
+                    self._record_wait(now - start, first_hint)
+                    return now
+                if first_hint is False:
+                    first_hint = wait
+                    self._start_waiting()
+                self._condition.wait(wait)
+
+    async def acquire_async(self):
+        """acquire 的异步版本，等待期间不占用事件循环"""
+        start = time.monotonic()
+        first_hint = False
+        while True:
+            with self._condition:
+                acquired, wait = self.try_acquire()
+                if acquired:
+                    now = time.monotonic()
+                    self._record_wait(now - start, first_hint)
+                    return now
+                if first_hint is False:
+                    first_hint = wait
+                    self._start_waiting()
+            await asyncio.sleep(wait if wait is not None else 0.05)
+
+    def release(self, acquired_at):
+        with self._condition:
+            now = time.monotonic()
+            self.active -= 1
+            self.busy_seconds += now - acquired_at
+            self.last_release_at = now
+            self._condition.notify_all()
+
+    def report(self):
+        """:return: 本域名的统计，利用率为占用的并发名额时间占可用名额时间的比例"""
+        with self._condition:
+            elapsed = 0.0
+            if self.first_request_at is not None and self.last_release_at is not None:
+                elapsed = max(self.last_release_at - self.first_request_at, 1e-9)
+            return {
+                "requests": self.requests,
+                "requests_per_second": self.requests / elapsed if elapsed else 0.0,
+                "rate_limit": self.limit.requests_per_second,
+                "max_concurrency": self.limit.max_concurrency,
+                "peak_concurrency": self.peak_active,
+                "utilization": self.busy_seconds / (elapsed * self.limit.max_concurrency) if elapsed else 0.0,
+                "wait_seconds": self.wait_seconds,
+                "avg_wait_seconds": self.wait_seconds / self.requests if self.requests else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+                "rate_wait_seconds": self.rate_wait_seconds,
+                "concurrency_wait_seconds": self.concurrency_wait_seconds,
+                "peak_waiting": self.peak_waiting,
+                "rate_limited": self.rate_limited,
+                "concurrency_limited": self.concurrency_limited,
+            }
+
+
+class DomainScheduler:
+    """所有域名的限速器，按请求URL的域名分发"""
+
+    def __init__(self):
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, url, limit=None):
+        """
+        :param limit: DomainRateLimit，域名首次出现时使用，默认读取环境变量
+        """
+        domain = urlsplit(url).netloc.lower()
+        with self._lock:
+            limiter = self._limiters.get(domain)
+            if limiter is None:
+                limiter = DomainLimiter(domain, limit or DomainRateLimit())
+                self._limiters[domain] = limiter
+            return limiter
+
+    @contextlib.contextmanager
+    def slot(self, url, limit=None):
+        """在本域名的令牌和并发名额下执行一次请求"""
+        if not politeness_enabled():
+            yield
+            return
+        limiter = self.limiter(url, limit)
+        acquired_at = limiter.acquire()
+        try:
+            yield
+        finally:
+            limiter.release(acquired_at)
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self, url, limit=None):
+        if not politeness_enabled():
+            yield
+            return
+        limiter = self.limiter(url, limit)
+        acquired_at = await limiter.acquire_async()
+        try:
+            yield
+        finally:
+            limiter.release(acquired_at)
+
+    def start_run(self):
+        """每次运行开始时清空统计，域名配置重新登记"""
+        with self._lock:
+            self._limiters = {}
+
+    def report(self):
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.domain: limiter.report() for limiter in limiters}
+
+    def print_report(self, title="域名限速统计"):
+        report = self.report()
+        if not report:
+            return
+        print(f"\n{title}:")
+        for domain, stats in sorted(report.items(), key=lambda x: -x[1]["requests"]):
+            print(
+                f"  {domain}: {stats['requests']} 次请求, "
+                f"{stats['requests_per_second']:.2f}/{stats['rate_limit']:.2f} 次/秒, "
+                f"并发峰值 {stats['peak_concurrency']}/{stats['max_concurrency']}, "
+                f"利用率 {stats['utilization'] * 100:.0f}%"
+            )
+            print(
+                f"    等待名额: 共 {stats['wait_seconds']:.1f}秒, "
+                f"平均 {stats['avg_wait_seconds'] * 1000:.0f}毫秒/次, "
+                f"最长 {stats['max_wait_seconds']:.1f}秒, 排队峰值 {stats['peak_waiting']}; "
+                f"限速 {stats['rate_limited']} 次 {stats['rate_wait_seconds']:.1f}秒, "
+                f"并发已满 {stats['concurrency_limited']} 次 {stats['concurrency_wait_seconds']:.1f}秒"
+            )
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_domain_scheduler():
+    """获取进程内共享的域名调度器"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DomainScheduler()
+        return _scheduler
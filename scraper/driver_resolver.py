@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ChromeDriver解析 - 只在首次启动时查找chromedriver，结果缓存到磁盘
+
+之后的启动直接使用缓存的路径，只要驱动文件校验和与Chrome可执行文件都未变化就不再调用
+webdriver-manager，无法联网的机器上也能启动。
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+
+CHROME_BINARY_NAMES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+]
+
+VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+
+
+class DriverResolutionError(Exception):
+    """找不到可用的chromedriver"""
+
+
+def find_chrome_binary():
+    """
+    查找Chrome可执行文件，环境变量 CHROME_BINARY 优先
+    :return: 可执行文件路径，找不到时返回None
+    """
+    binary = os.environ.get("CHROME_BINARY")
+    if binary:
+        return binary
+    for name in CHROME_BINARY_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def read_version(binary):
+    """
+    运行 `<binary> --version` 获取版本号
+    :return: 如 "120.0.6099.109"，失败时返回None
+    """
+    try:
+        output = subprocess.run(
+            [binary, "--version"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+
+def major_version(version):
+    return version.split(".", 1)[0] if version else None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    """文件大小和修改时间，用来判断Chrome是否已升级，无需运行Chrome"""
+    try:
+        stat = os.stat(os.path.realpath(path))
+    except (OSError, TypeError):
+        return None
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+class DriverResolution:
+    """一次chromedriver解析的结果"""
+
+    def __init__(
+        self,
+        driver_path,
+        driver_version,
+        driver_sha256,
+        chrome_path,
+        chrome_version,
+        chrome_signature,
+        source,
+        seconds=0.0,
+    ):
+        self.driver_path = driver_path
+        self.driver_version = driver_version
+        self.driver_sha256 = driver_sha256
+        self.chrome_path = chrome_path
+        self.chrome_version = chrome_version
+        self.chrome_signature = chrome_signature
+        # 解析来源: env / cache / path / manager
+        self.source = source
+        self.seconds = seconds
+
+    def to_dict(self):
+        return {
+            "driver_path": self.driver_path,
+            "driver_version": self.driver_version,
+            "driver_sha256": self.driver_sha256,
+            "chrome_path": self.chrome_path,
+            "chrome_version": self.chrome_version,
+            "chrome_signature": self.chrome_signature,
+        }
+
+
+class DriverResolver:
+    """
+    解析chromedriver路径
+
+    依次尝试:
+    1. 环境变量 CHROMEDRIVER_PATH 指定的驱动
+    2. 磁盘缓存，驱动文件校验和与Chrome可执行文件均未变化时有效
+    3. PATH中与Chrome主版本一致的chromedriver
+    4. webdriver-manager 下载或查找驱动
+    后两种结果写入缓存。
+    """
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file or os.environ.get("CHROMEDRIVER_CACHE_FILE") or os.path.join(
+            os.environ.get("DATA_DIR", "."), "driver_cache", "chromedriver.json"
+        )
+        self._lock = threading.Lock()
+        self._resolution = None
+
+    def resolve(self):
+        """
+        解析chromedriver，进程内只解析一次
+        :return: DriverResolution
+        """
+        with self._lock:
+            if self._resolution is None:
+                start = time.perf_counter()
+                resolution = self._resolve()
+                resolution.seconds = time.perf_counter() - start
+                print(
+                    f"ChromeDriver: {resolution.driver_path} (版本: {resolution.driver_version or '未知'}, "
+                    f"来源: {resolution.source}, 耗时: {resolution.seconds:.2f}秒)"
+                )
+                self._resolution = resolution
+            return self._resolution
+
+    @property
+    def resolution(self):
+        """已解析的结果，尚未解析时为None"""
+        return self._resolution
+
+    def invalidate(self):
+        """缓存的驱动无法启动Chrome时调用，下次重新解析"""
+        with self._lock:
+            self._resolution = None
+            try:
+                os.remove(self.cache_file)
+            except OSError:
+                pass
+
+    def _resolve(self):
+        chrome_path = find_chrome_binary()
+        chrome_signature = file_signature(chrome_path)
+
+        driver_path = os.environ.get("CHROMEDRIVER_PATH")
+        if driver_path:
+            if not os.access(driver_path, os.X_OK):
+                raise DriverResolutionError(f"CHROMEDRIVER_PATH 不可执行: {driver_path}")
+            return DriverResolution(
+                driver_path, None, None, chrome_path, None, chrome_signature, "env"
+            )
+
+        cached = self._load_cache(chrome_path, chrome_signature)
+        if cached:
+            return cached
+
+        chrome_version = read_version(chrome_path) if chrome_path else None
+        resolution = self._resolve_from_path(chrome_path, chrome_version, chrome_signature)
+        if resolution is None:
+            resolution = self._resolve_with_manager(chrome_path, chrome_version, chrome_signature)
+        self._save_cache(resolution)
+        return resolution
+
+    def _load_cache(self, chrome_path, chrome_signature):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"读取ChromeDriver缓存失败: {e}")
+            return None
+
+        if data.get("chrome_path") != chrome_path or data.get("chrome_signature") != chrome_signature:
+            print("Chrome已变化，重新解析ChromeDriver")
+            return None
+        driver_path = data.get("driver_path")
+        if not driver_path or not os.access(driver_path, os.X_OK):
+            print("缓存的ChromeDriver不存在，重新解析")
+            return None
+        if file_sha256(driver_path) != data.get("driver_sha256"):
+            print("缓存的ChromeDriver校验和不一致，重新解析")
+            return None
+        return DriverResolution(
+            driver_path,
+            data.get("driver_version"),
+            data.get("driver_sha256"),
+            chrome_path,
+            data.get("chrome_version"),
+            chrome_signature,
+            "cache",
+        )
+
+    def _save_cache(self, resolution):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(resolution.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"保存ChromeDriver缓存失败: {e}")
+
+    def _resolve_from_path(self, chrome_path, chrome_version, chrome_signature):
+        driver_path = shutil.which("chromedriver")
+        if not driver_path:
+            return None
+        driver_version = read_version(driver_path)
+        if chrome_version and major_version(driver_version) != major_version(chrome_version):
+            print(
+                f"PATH中的ChromeDriver版本 {driver_version} 与Chrome {chrome_version} 不一致，忽略"
+            )
+            return None
+        return DriverResolution(
+            driver_path,
+            driver_version,
+            file_sha256(driver_path),
+            chrome_path,
+            chrome_version,
+            chrome_signature,
+            "path",
+        )
+
+    def _resolve_with_manager(self, chrome_path, chrome_version, chrome_signature):
+        # 只有缓存失效时才需要webdriver-manager
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        try:
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            raise DriverResolutionError(f"webdriver-manager 获取ChromeDriver失败: {e}") from e
+        return DriverResolution(
+            driver_path,
+            read_version(driver_path),
+            file_sha256(driver_path),
+            chrome_path,
+            chrome_version,
+            chrome_signature,
+            "manager",
+        )
+
+
+_default_resolver = None
+_default_resolver_lock = threading.Lock()
+
+
+def get_driver_resolver():
+    """获取进程内共享的ChromeDriver解析器"""
+    global _default_resolver
+    with _default_resolver_lock:
+        if _default_resolver is None:
+            _default_resolver = DriverResolver()
+        return _default_resolver
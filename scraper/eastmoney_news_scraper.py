@@ -16,10 +16,19 @@ from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
 import re
 from base_news_scraper import BaseNewsScraper, ListPageType
+from page_readiness import ReadinessProfile
+from scroll_strategy import NO_SCROLL
+from domain_scheduler import DomainRateLimit
+from http_fetcher import extract_text
+from resource_blocking import DEFAULT_BLOCKING
 
 class EastMoneyNewsScraper(BaseNewsScraper):
     def __init__(self, hours_ago=3):
         super().__init__(hours_ago)
+        self.max_list_pages = 5
+        # 静态页面走HTTP抓取，可承受较高并发
+        self.content_concurrency = 4
+        self.domain_rate_limit = DomainRateLimit(requests_per_second=4, burst=8, max_concurrency=4)
 
     def clean_title(self, title_text):
         """
@@ -66,12 +75,33 @@ class EastMoneyNewsScraper(BaseNewsScraper):
     def get_list_page_type(self):
         return ListPageType.PAGINATION
 
+    def get_scroll_strategy(self):
+        # 分页网站，滚动不会加载更多新闻
+        return NO_SCROLL
+
     def get_list_page_urls(self):
+        return list(self.iter_list_page_urls())
+
+    def iter_list_page_urls(self):
         url_tmpl = "https://finance.eastmoney.com/a/cywjh_{}.html"
-        urls = []
-        for i in range(1, 6):
-            urls.append(url_tmpl.format(i))
-        return urls
+        for i in range(1, self.max_list_pages + 1):
+            yield url_tmpl.format(i)
+
+    def get_list_readiness_profile(self):
+        return ReadinessProfile(
+            container_selector="ul#newsListContent",
+            item_selector="ul#newsListContent li",
+        )
+
+    def get_content_selector(self):
+        return "#ContentBody"
+
+    def get_content_readiness_profile(self):
+        return ReadinessProfile(container_selector="#ContentBody")
+
+    def get_resource_blocking_profile(self):
+        # 列表和内容页面都是服务端渲染的分页页面，不依赖样式表加载或滚动
+        return DEFAULT_BLOCKING.extend("eastmoney", resource_types=["stylesheet"])
 
     def find_items_in_list_page(self):
         news_container = self.driver.find_element(
@@ -84,6 +114,24 @@ class EastMoneyNewsScraper(BaseNewsScraper):
 
         return news_items
 
+    def get_list_item_selectors(self):
+        return {
+            "container": "ul#newsListContent",
+            "item": "li",
+            "title": "p.title a",
+            "time": "p.time",
+        }
+
+    def parse_list_item_record(self, record):
+        title_text = self.clean_title(record["title"] or "")
+        link_url = record["href"]
+        if not title_text or not link_url or not record["time"]:
+            return title_text, link_url, None, None
+        news_time = self.parse_time_string(record["time"])
+        if news_time is None:
+            return title_text, link_url, None, None
+        return title_text, link_url, "东方财富网", news_time
+
     def parse_list_page_item(self, item: WebElement):
         li_element = item
         title_text = None
@@ -120,6 +168,33 @@ class EastMoneyNewsScraper(BaseNewsScraper):
         content = content_body_element.text.strip()
         return content
 
+    def supports_http_fetch(self):
+        return True
+
+    def parse_list_page_document(self, doc):
+        parsed_items = []
+        for li_element in doc.cssselect("ul#newsListContent li"):
+            a_title_elements = li_element.cssselect("p.title a")
+            p_time_elements = li_element.cssselect("p.time")
+            if not a_title_elements or not p_time_elements:
+                continue
+            a_title_element = a_title_elements[0]
+            title_text = self.clean_title(a_title_element.text_content())
+            link_url = a_title_element.get("href")
+            if not title_text or not link_url:
+                continue
+            news_time = self.parse_time_string(p_time_elements[0].text_content())
+            if news_time is None:
+                continue
+            parsed_items.append((title_text, link_url, "东方财富网", news_time))
+        return parsed_items
+
+    def parse_content_document(self, doc):
+        content_body_elements = doc.cssselect("#ContentBody")
+        if not content_body_elements:
+            return None
+        return extract_text(content_body_elements[0]) or None
+
 
 def main():
     scraper = None
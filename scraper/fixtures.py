@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录制/回放 - 把抓取过程中的页面和XHR响应录制到本地存档，再由本地HTTP服务器回放
+
+FIXTURE_MODE=record 时，HTTP抓取的响应和浏览器加载的文档、脚本、样式表、XHR/fetch响应
+都写入 FIXTURE_DIR；FIXTURE_MODE=replay 时，每个录制过的源站对应一个本地端口，抓取器
+打开的URL和响应内容中的源站地址都被替换为本地地址，可注入固定延迟和错误率，
+在离线环境中得到可重复的抓取过程。
+
+    python fixtures.py info            # 查看存档内容
+    python fixtures.py serve           # 单独启动回放服务器
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # 非POSIX系统上不加文件锁，只能由单个进程录制
+    fcntl = None
+
+
+# 回放页面需要的资源类型（performance日志中的 Network.responseReceived 类型）
+RECORDED_RESOURCE_TYPES = {"Document", "Script", "Stylesheet", "XHR", "Fetch"}
+
+# 需要替换源站地址的文本类型
+TEXT_CONTENT_TYPES = ("text/", "application/javascript", "application/json", "application/x-javascript")
+
+
+def fixture_mode():
+    """:return: "record"、"replay" 或 None"""
+    mode = os.environ.get("FIXTURE_MODE", "").strip().lower()
+    return mode if mode in ("record", "replay") else None
+
+
+def fixture_dir():
+    return os.environ.get("FIXTURE_DIR") or os.path.join(
+        os.environ.get("DATA_DIR", "."), "fixtures", "default"
+    )
+
+
+def fixture_key(url):
+    """存档键：去掉片段的URL"""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def url_origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+class FixtureArchive:
+    """
+    录制存档目录
+
+    index.json 记录每个URL的状态码、Content-Type和响应体文件，响应体按内容哈希保存在 bodies/ 下。
+    多个工作进程可以同时录制到同一个目录，保存时在文件锁内与磁盘上的索引合并。
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _index_path(self):
+        return os.path.join(self.directory, "index.json")
+
+    def _load(self):
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                return json.load(f)["entries"]
+        except FileNotFoundError:
+            return {}
+
+    def get(self, url):
+        """
+        :return: (状态码, Content-Type, 响应体bytes)，未录制时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(fixture_key(url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry["body"]), "rb") as f:
+            body = f.read()
+        return entry["status"], entry["content_type"], body
+
+    def put(self, url, status, content_type, body):
+        digest = hashlib.sha1(body).hexdigest()
+        relpath = os.path.join("bodies", digest)
+        filepath = os.path.join(self.directory, relpath)
+        if not os.path.exists(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "wb") as f:
+                f.write(body)
+        with self._lock:
+            self._entries[fixture_key(url)] = {
+                "status": status,
+                "content_type": content_type,
+                "body": relpath,
+                "recorded_at": time.time(),
+            }
+
+    def save(self):
+        """与磁盘上的索引合并后保存，同一URL保留录制时间较新的条目"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{self._index_path()}.lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            entries = self._load()
+            with self._lock:
+                for key, entry in self._entries.items():
+                    saved = entries.get(key)
+                    if saved is None or saved.get("recorded_at", 0) <= entry["recorded_at"]:
+                        entries[key] = entry
+                self._entries = dict(entries)
+            tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self._index_path())
+
+    def origins(self):
+        with self._lock:
+            return sorted({url_origin(url) for url in self._entries})
+
+    def urls(self):
+        with self._lock:
+            return sorted(self._entries)
+
+
+class FixtureRecorder:
+    """把HTTP抓取和浏览器加载的响应写入存档"""
+
+    def __init__(self, archive):
+        self.archive = archive
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record_response(self, url, status, content_type, body):
+        self.archive.put(url, status, content_type, body)
+        with self._lock:
+            self.recorded += 1
+
+    def capture_browser(self, driver):
+        """
+        从performance日志中取出当前页面加载的资源并保存响应体
+        需在离开页面前调用，浏览器需以 goog:loggingPrefs performance 启动
+        """
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            print(f"读取浏览器performance日志失败: {e}")
+            return
+
+        responses = {}
+        finished = set()
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived" and params.get("type") in RECORDED_RESOURCE_TYPES:
+                responses[params["requestId"]] = params["response"]
+            elif method == "Network.loadingFinished":
+                finished.add(params["requestId"])
+
+        for request_id, response in responses.items():
+            if request_id not in finished or response["url"].startswith("data:"):
+                continue
+            try:
+                result = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            except Exception:
+                # 页面已导航或响应体已被丢弃
+                continue
+            if result.get("base64Encoded"):
+                body = base64.b64decode(result["body"])
+            else:
+                body = result["body"].encode("utf-8")
+            content_type = response.get("mimeType", "application/octet-stream")
+            if content_type.startswith(TEXT_CONTENT_TYPES):
+                content_type += "; charset=utf-8"
+            self.record_response(response["url"], response.get("status", 200), content_type, body)
+
+    def save(self):
+        self.archive.save()
+        print(f"录制存档已保存: {self.archive.directory} (本次录制 {self.recorded} 个响应)")
+
+
+class FixtureServer:
+    """
+    回放服务器
+
+    每个录制过的源站在本地监听一个端口，相对地址因此仍指向同一源站。
+    文本响应中的源站地址被替换为对应的本地地址。
+    """
+
+    def __init__(self, archive, latency_ms=None, jitter_ms=None, error_rate=None, seed=None):
+        """
+        :param archive: FixtureArchive
+        :param latency_ms: 每个响应注入的固定延迟（毫秒）
+        :param jitter_ms: 在固定延迟上增加的随机延迟上限（毫秒）
+        :param error_rate: 返回503的请求比例，0-1
+        :param seed: 随机数种子，使延迟和错误可复现
+        """
+        self.archive = archive
+        self.latency_ms = latency_ms if latency_ms is not None else float(
+            os.environ.get("FIXTURE_LATENCY_MS", "0")
+        )
+        self.jitter_ms = jitter_ms if jitter_ms is not None else float(
+            os.environ.get("FIXTURE_JITTER_MS", "0")
+        )
+        self.error_rate = error_rate if error_rate is not None else float(
+            os.environ.get("FIXTURE_ERROR_RATE", "0")
+        )
+        self._random = random.Random(
+            seed if seed is not None else int(os.environ.get("FIXTURE_SEED", "0"))
+        )
+        self._random_lock = threading.Lock()
+        self._servers = []
+        self.origin_map = {}
+        self.stats = {"served": 0, "missing": 0, "injected_errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def start(self):
+        for origin in self.archive.origins():
+            server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class(origin))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+            self.origin_map[origin] = f"http://127.0.0.1:{server.server_address[1]}"
+        print(f"回放服务器已启动: {len(self.origin_map)} 个源站, 存档 {self.archive.directory}")
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def rewrite_url(self, url):
+        """把源站URL替换为本地回放地址，未录制的源站保持不变"""
+        local_origin = self.origin_map.get(url_origin(url))
+        if local_origin is None:
+            return url
+        parts = urlsplit(url)
+        return urlunsplit(urlsplit(local_origin)[:2] + (parts.path, parts.query, parts.fragment))
+
+    def rewrite_body(self, body):
+        text = body.decode("utf-8", errors="surrogateescape")
+        for origin, local_origin in self.origin_map.items():
+            host = urlsplit(origin).netloc
+            text = text.replace(origin, local_origin)
+            text = text.replace(f"//{host}", "//" + urlsplit(local_origin).netloc)
+        return text.encode("utf-8", errors="surrogateescape")
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _draw(self):
+        with self._random_lock:
+            return self._random.random(), self._random.random()
+
+    def _handler_class(self, origin):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                error_draw, jitter_draw = server._draw()
+                delay = server.latency_ms + server.jitter_ms * jitter_draw
+                if delay > 0:
+                    time.sleep(delay / 1000)
+                if error_draw < server.error_rate:
+                    server._count("injected_errors")
+                    self.send_error(503, "Injected error")
+                    return
+
+                fixture = server.archive.get(origin + self.path)
+                if fixture is None:
+                    server._count("missing")
+                    self.send_error(404, "Not recorded")
+                    return
+                status, content_type, body = fixture
+                if content_type.startswith(TEXT_CONTENT_TYPES):
+                    body = server.rewrite_body(body)
+                server._count("served")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def print_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        print(
+            f"\n回放统计: 返回 {stats['served']} 个响应, 未录制 {stats['missing']} 个, "
+            f"注入错误 {stats['injected_errors']} 个"
+        )
+
+
+_recorder = None
+_server = None
+_fixtures_lock = threading.Lock()
+
+
+def get_fixture_recorder():
+    """:return: 录制模式下共享的FixtureRecorder，否则返回None"""
+    global _recorder
+    if fixture_mode() != "record":
+        return None
+    with _fixtures_lock:
+        if _recorder is None:
+            _recorder = FixtureRecorder(FixtureArchive(fixture_dir()))
+        return _recorder
+
+
+def get_fixture_server():
+    """:return: 回放模式下共享的已启动FixtureServer，否则返回None"""
+    global _server
+    if fixture_mode() != "replay":
+        return None
+    with _fixtures_lock:
+        if _server is None:
+            _server = FixtureServer(FixtureArchive(fixture_dir()))
+            _server.start()
+        return _server
+
+
+def active_fixture_server():
+    """:return: 本进程中已启动的回放服务器，没有时返回None"""
+    return _server
+
+
+def rewrite_url(url):
+    """回放模式下把URL替换为本地回放地址，其他模式原样返回"""
+    server = get_fixture_server()
+    return server.rewrite_url(url) if server else url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="抓取录制存档")
+    parser.add_argument("command", choices=["info", "serve"])
+    parser.add_argument("--dir", default=None, help="存档目录，默认 FIXTURE_DIR")
+    args = parser.parse_args()
+
+    archive = FixtureArchive(args.dir or fixture_dir())
+    if args.command == "info":
+        urls = archive.urls()
+        print(f"存档 {archive.directory}: {len(urls)} 个响应")
+        for origin in archive.origins():
+            count = sum(1 for url in urls if url_origin(url) == origin)
+            print(f"  {origin}: {count}")
+        return
+
+    server = FixtureServer(archive)
+    server.start()
+    for origin, local_origin in server.origin_map.items():
+        print(f"  {origin} -> {local_origin}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.print_stats()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻内容缓存 - 按规范化URL持久保存提取后的正文和HTTP校验信息
+
+新闻发布后很少修改：缓存未过期时直接使用，过期后带 If-None-Match/If-Modified-Since
+发送条件请求，服务器返回304时继续使用缓存内容。缓存总大小超过上限时按最近使用时间淘汰。
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.utils import get_state_dir
+
+
+# 不影响页面内容的跟踪参数，规范化URL时去掉
+TRACKING_PARAMS = {"spm", "from", "share_token", "share_from", "fr", "ref"}
+
+
+def normalize_url(url):
+    """
+    规范化URL作为缓存键：协议和域名小写，去掉片段、默认端口和跟踪参数，查询参数排序
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+class CacheEntry:
+    """一条缓存记录"""
+
+    def __init__(self, url, content, etag, last_modified, fetched_at, size):
+        self.url = url
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        # 原始页面的字节数，命中时计入节省的下载量
+        self.size = size
+
+    def is_fresh(self, fresh_seconds):
+        return time.time() - self.fetched_at < fresh_seconds
+
+    def validators(self):
+        """条件请求头，没有校验信息时返回None"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers or None
+
+
+class HttpCacheStats:
+    """单个网站的缓存命中统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+    def record_hit(self, entry):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += entry.size
+
+    def record_revalidated(self, entry):
+        with self._lock:
+            self.revalidated += 1
+            self.bytes_saved += entry.size
+
+    def record_miss(self, size):
+        with self._lock:
+            self.misses += 1
+            self.bytes_downloaded += size
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+                "bytes_downloaded": self.bytes_downloaded,
+            }
+
+    def print_stats(self, title="内容缓存统计"):
+        stats = self.snapshot()
+        if not stats["hits"] + stats["revalidated"] + stats["misses"]:
+            return
+        print(
+            f"\n{title}: 命中 {stats['hits']} 次, 304 {stats['revalidated']} 次, "
+            f"未命中 {stats['misses']} 次, 节省 {stats['bytes_saved'] / 1024:.1f}KB, "
+            f"下载 {stats['bytes_downloaded'] / 1024:.1f}KB"
+        )
+
+
+class HttpCache:
+    """基于sqlite的新闻内容缓存，可被多个线程共享"""
+
+    def __init__(self, filepath, max_bytes=None, fresh_hours=None):
+        """
+        :param filepath: sqlite数据库文件路径
+        :param max_bytes: 缓存内容总大小上限（字节）
+        :param fresh_hours: 缓存在该小时数内直接使用，超过后发送条件请求
+        """
+        self.filepath = filepath
+        self.max_bytes = max_bytes or int(os.environ.get("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024
+        fresh_hours = fresh_hours if fresh_hours is not None else float(
+            os.environ.get("HTTP_CACHE_FRESH_HOURS", "24")
+        )
+        self.fresh_seconds = fresh_hours * 3600
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS content_cache (
+                url TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                stored_bytes INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_content_cache_accessed_at ON content_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        :param url: 新闻URL
+        :return: CacheEntry，未缓存时返回None
+        """
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, etag, last_modified, fetched_at, size FROM content_cache WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE content_cache SET accessed_at = ? WHERE url = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return CacheEntry(key, *row)
+
+    def put(self, url, content, etag=None, last_modified=None, size=0):
+        """
+        保存提取后的新闻内容
+        :param size: 原始页面的字节数
+        """
+        key = normalize_url(url)
+        now = time.time()
+        stored_bytes = len(content.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO content_cache
+                    (url, content, etag, last_modified, fetched_at, accessed_at, size, stored_bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, content, etag, last_modified, now, now, size, stored_bytes),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, entry):
+        """服务器确认内容未修改，刷新缓存时间"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE content_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (time.time(), time.time(), entry.url),
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """按最近使用时间淘汰，直到总大小不超过上限"""
+        total = self._conn.execute("SELECT COALESCE(SUM(stored_bytes), 0) FROM content_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT url, stored_bytes FROM content_cache ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for url, stored_bytes in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= stored_bytes
+        self._conn.executemany("DELETE FROM content_cache WHERE url = ?", evicted)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """
+    获取进程内共享的内容缓存，位于 DATA_DIR/http_cache/content_cache.sqlite3
+    :return: HttpCache，设置 HTTP_CACHE_ENABLED=0 或打开失败时返回None
+    """
+    global _default_cache
+    if os.environ.get("HTTP_CACHE_ENABLED", "1") != "1":
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            filepath = get_state_dir("http_cache", "content_cache.sqlite3")
+            try:
+                _default_cache = HttpCache(filepath)
+            except (OSError, sqlite3.Error) as e:
+                print(f"打开内容缓存失败: {e}")
+                return None
+        return _default_cache
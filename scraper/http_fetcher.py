@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP抓取层 - 用于服务端渲染的静态页面，无需启动浏览器
+"""
+
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+import lxml.html
+import os
+import re
+import requests
+import threading
+import time
+
+from fixtures import get_fixture_recorder, rewrite_url
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+}
+
+# 这些编码都是GB18030的子集，统一按GB18030解码以避免生僻字乱码
+GB_ENCODINGS = {"gb2312", "gbk", "gb18030", "x-gbk", "cp936"}
+
+META_CHARSET_PATTERN = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-]+)""", re.IGNORECASE
+)
+
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+    "table", "tr", "section", "article", "blockquote", "pre",
+}
+SKIP_TAGS = {"script", "style", "noscript", "iframe"}
+
+
+def normalize_charset(charset):
+    if not charset:
+        return None
+    charset = charset.strip().strip("\"'").lower()
+    if charset in GB_ENCODINGS:
+        return "gb18030"
+    return charset
+
+
+def detect_charset(response, data=None):
+    """
+    检测响应的字符编码
+    优先级: HTTP头 > HTML meta标签 > 内容推断
+    :param response: requests.Response
+    :param data: 流式读取时已读到的内容，为None时使用完整的 response.content
+    :return: 编码名称
+    """
+    content_type = response.headers.get("Content-Type", "")
+    match = re.search(r"charset=([^\s;]+)", content_type, re.IGNORECASE)
+    if match:
+        return normalize_charset(match.group(1))
+
+    content = response.content if data is None else data
+    match = META_CHARSET_PATTERN.search(content[:4096])
+    if match:
+        return normalize_charset(match.group(1).decode("ascii", "ignore"))
+
+    if data is None:
+        apparent_encoding = response.apparent_encoding
+    else:
+        # 流式响应读取 apparent_encoding 会读完剩余内容
+        apparent_encoding = chardet.detect(data)["encoding"]
+    return normalize_charset(apparent_encoding) or "utf-8"
+
+
+def extract_text(element):
+    """
+    提取元素文本，在块级元素之间保留换行
+    :param element: lxml元素
+    :return: 去除多余空白后的文本
+    """
+    parts = []
+
+    def walk(el):
+        tag = el.tag if isinstance(el.tag, str) else ""
+        if tag in SKIP_TAGS:
+            if el.tail:
+                parts.append(el.tail)
+            return
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+        if el.text:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+        if el.tail:
+            parts.append(el.tail)
+
+    walk(element)
+    # 去掉tail，只保留元素自身的文本
+    if element.tail:
+        parts.pop()
+    return normalize_text("".join(parts))
+
+
+def normalize_text(text):
+    """合并每行内的空白并去掉空行"""
+    lines = [" ".join(line.split()) for line in text.split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+class HttpPage:
+    """一次HTTP抓取的结果"""
+
+    def __init__(self, url, status_code, text, encoding, elapsed, etag=None, last_modified=None, size=0):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.encoding = encoding
+        self.elapsed = elapsed
+        # 用于条件请求的校验信息
+        self.etag = etag
+        self.last_modified = last_modified
+        # 响应体字节数
+        self.size = size
+
+    @property
+    def not_modified(self):
+        """条件请求的结果：服务器确认内容未修改"""
+        return self.status_code == 304
+
+    def document(self):
+        """解析为lxml文档，并把相对链接转换为绝对链接"""
+        doc = lxml.html.document_fromstring(self.text)
+        doc.make_links_absolute(self.url)
+        return doc
+
+
+class HttpFetcher:
+    """
+    基于requests的页面抓取器
+
+    每个线程持有一个长连接Session，同一站点的请求复用TCP/TLS连接。
+    """
+
+    def __init__(self, timeout=None, pool_maxsize=10):
+        self.timeout = timeout or int(os.environ.get("HTTP_FETCH_TIMEOUT", "15"))
+        self.pool_maxsize = pool_maxsize
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=self.pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def fetch(self, url, headers=None):
+        """
+        抓取页面
+        :param url: 页面URL
+        :param headers: 额外的请求头，可包含 If-None-Match/If-Modified-Since 条件请求头
+        :return: HttpPage，条件请求命中时 status_code 为304、text为空
+        """
+        start = time.perf_counter()
+        response = self._session().get(rewrite_url(url), headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        recorder = get_fixture_recorder()
+        if recorder and response.status_code == 200:
+            recorder.record_response(
+                url, 200, response.headers.get("Content-Type", "text/html"), response.content
+            )
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 304:
+            elapsed = time.perf_counter() - start
+            print(f"HTTP页面未修改: {url} (耗时: {elapsed * 1000:.0f}毫秒)")
+            return HttpPage(response.url, 304, "", None, elapsed, etag, last_modified)
+
+        encoding = detect_charset(response)
+        text = response.content.decode(encoding, errors="replace")
+        elapsed = time.perf_counter() - start
+        print(f"HTTP抓取页面: {url} (编码: {encoding}, 耗时: {elapsed * 1000:.0f}毫秒)")
+        return HttpPage(
+            response.url,
+            response.status_code,
+            text,
+            encoding,
+            elapsed,
+            etag,
+            last_modified,
+            len(response.content),
+        )
+
+    def fetch_prefix(self, url, max_bytes, stop=None):
+        """
+        只读取页面开头的部分内容，读够 max_bytes 字节或 stop 返回真值时断开
+        :param stop: 函数，参数为已读取的文本
+        :return: 已读取的文本，按第一块内容检测到的编码解码
+        """
+        start = time.perf_counter()
+        data = b""
+        encoding = None
+        with self._session().get(rewrite_url(url), timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                data += chunk
+                if encoding is None:
+                    encoding = detect_charset(response, data)
+                if len(data) >= max_bytes or (stop and stop(data.decode(encoding, errors="ignore"))):
+                    break
+        encoding = encoding or "utf-8"
+        elapsed = time.perf_counter() - start
+        print(f"HTTP读取页面开头: {url} ({len(data)} 字节, 编码: {encoding}, 耗时: {elapsed * 1000:.0f}毫秒)")
+        return data.decode(encoding, errors="replace")
+
+    def fetch_document(self, url):
+        """抓取并解析页面为lxml文档"""
+        return self.fetch(url).document()
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_http_fetcher():
+    """获取进程内共享的HTTP抓取器"""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = HttpFetcher()
+        return _default_fetcher
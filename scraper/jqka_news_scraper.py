@@ -2,13 +2,26 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from base_news_scraper import BaseNewsScraper, ListPageType
+from page_readiness import ReadinessProfile
+from scroll_strategy import NO_SCROLL
+from domain_scheduler import DomainRateLimit
+from http_fetcher import extract_text
+from resource_blocking import DEFAULT_BLOCKING
 import re
 from datetime import datetime
 
 
+# 正文容器：脚本处理后为 div.news-content-parsed，静态HTML中为 div.main-text
+CONTENT_SELECTOR = "div.news-content-parsed, div.main-text"
+
+
 class JQKANewsScraper(BaseNewsScraper):
     def __init__(self, hours_ago=3):
         super().__init__(hours_ago)
+        self.max_list_pages = 5
+        # 静态页面走HTTP抓取，可承受较高并发
+        self.content_concurrency = 4
+        self.domain_rate_limit = DomainRateLimit(requests_per_second=4, burst=8, max_concurrency=4)
 
     def clean_title(self, title_text):
         """
@@ -59,12 +72,35 @@ class JQKANewsScraper(BaseNewsScraper):
     def get_list_page_type(self):
         return ListPageType.PAGINATION
 
+    def get_scroll_strategy(self):
+        # 分页网站，滚动不会加载更多新闻
+        return NO_SCROLL
+
     def get_list_page_urls(self):
+        return list(self.iter_list_page_urls())
+
+    def iter_list_page_urls(self):
         url_tmpl = "https://news.10jqka.com.cn/today_list/index_{}.shtml"
-        urls = []
-        for i in range(1, 6):
-            urls.append(url_tmpl.format(i))
-        return urls
+        for i in range(1, self.max_list_pages + 1):
+            yield url_tmpl.format(i)
+
+    def get_list_readiness_profile(self):
+        return ReadinessProfile(
+            container_selector="div.list-con",
+            item_selector="div.list-con li",
+        )
+
+    def get_content_selector(self):
+        return CONTENT_SELECTOR
+
+    def get_content_readiness_profile(self):
+        return ReadinessProfile(container_selector=CONTENT_SELECTOR)
+
+    def get_resource_blocking_profile(self):
+        # 列表和内容页面都是服务端渲染的分页页面，不依赖样式表加载或滚动
+        return DEFAULT_BLOCKING.extend(
+            "jqka", resource_types=["stylesheet"], url_patterns=["*stat.10jqka.com.cn*"]
+        )
 
     def find_items_in_list_page(self):
         news_container = self.driver.find_element(By.CSS_SELECTOR, "div.list-con")
@@ -74,6 +110,27 @@ class JQKANewsScraper(BaseNewsScraper):
 
         return news_items
 
+    def get_list_item_selectors(self):
+        return {
+            "container": "div.list-con",
+            "item": "li",
+            "title": "span.arc-title a",
+            "texts": "span.arc-title span",
+        }
+
+    def parse_list_item_record(self, record):
+        title_text = self.clean_title(record["title"] or "")
+        link_url = record["href"]
+        news_time = None
+        for span_text in record.get("texts") or []:
+            # 检查是否包含时间格式（月日 时:分）
+            if span_text and re.search(r"\d{1,2}月\d{1,2}日\s+\d{1,2}:\d{2}", span_text):
+                news_time = self.parse_time_string(span_text)
+                break
+        if not title_text or not link_url:
+            return None, None, None, None
+        return title_text, link_url, "同花顺", news_time
+
     def parse_list_page_item(self, item: WebElement):
         li_element = item
         title_text = None
@@ -120,14 +177,48 @@ class JQKANewsScraper(BaseNewsScraper):
             return title_text, link_url, source, news_time
 
     def parse_content(self):
-        content_body_element = self.driver.find_element(
-            By.CSS_SELECTOR, "div.news-content-parsed"
-        )
+        content_body_element = self.driver.find_element(By.CSS_SELECTOR, CONTENT_SELECTOR)
         if content_body_element is None:
             raise Exception("content_body_element is None")
         content = content_body_element.text.strip()
         return content
 
+    def supports_http_fetch(self):
+        return True
+
+    def parse_list_page_document(self, doc):
+        parsed_items = []
+        for li_element in doc.cssselect("div.list-con li"):
+            arc_title_elements = li_element.cssselect("span.arc-title")
+            if not arc_title_elements:
+                continue
+            arc_title_element = arc_title_elements[0]
+            title_links = arc_title_element.cssselect("a")
+            if not title_links:
+                continue
+            title_text = self.clean_title(title_links[0].text_content())
+            link_url = title_links[0].get("href")
+            if not title_text or not link_url:
+                continue
+
+            # 时间位于arc-title内的span元素中
+            news_time = None
+            for span in arc_title_element.cssselect("span"):
+                span_text = span.text_content().strip()
+                if re.search(r"\d{1,2}月\d{1,2}日\s+\d{1,2}:\d{2}", span_text):
+                    news_time = self.parse_time_string(span_text)
+                    break
+            if news_time is None:
+                continue
+            parsed_items.append((title_text, link_url, "同花顺", news_time))
+        return parsed_items
+
+    def parse_content_document(self, doc):
+        content_body_elements = doc.cssselect(CONTENT_SELECTOR)
+        if not content_body_elements:
+            return None
+        return extract_text(content_body_elements[0]) or None
+
 
 def main():
     scraper = None
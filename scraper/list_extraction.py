@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表页面批量提取 - 一次execute_script调用取回全部新闻项
+"""
+
+import json
+
+
+# 按选择器描述在浏览器内提取所有新闻项，以JSON字符串返回
+BATCH_EXTRACT_SCRIPT = """
+var spec = arguments[0];
+var root = spec.container ? document.querySelector(spec.container) : document;
+if (!root) {
+    return null;
+}
+function textOf(el) {
+    return el ? (el.innerText || el.textContent || '').trim() : null;
+}
+var records = [];
+var items = root.querySelectorAll(spec.item);
+for (var i = spec.last_only ? Math.max(items.length - 1, 0) : 0; i < items.length; i++) {
+    var item = items[i];
+    var titleElement = null;
+    if (spec.title) {
+        var candidates = item.querySelectorAll(spec.title);
+        for (var j = 0; j < candidates.length; j++) {
+            if (textOf(candidates[j]).length > (spec.min_title_length || 0)) {
+                titleElement = candidates[j];
+                break;
+            }
+        }
+    }
+    var linkElement = spec.link ? item.querySelector(spec.link) : titleElement;
+    if (linkElement && titleElement && spec.link && !linkElement.contains(titleElement)) {
+        var closest = titleElement.closest(spec.link);
+        if (closest) {
+            linkElement = closest;
+        }
+    }
+    var record = {
+        title: textOf(titleElement),
+        href: linkElement ? (linkElement.href || linkElement.getAttribute('href')) : null,
+        time: null
+    };
+    if (spec.time) {
+        var timeElement = item.querySelector(spec.time);
+        if (timeElement) {
+            record.time = spec.time_attr ? timeElement.getAttribute(spec.time_attr) : textOf(timeElement);
+        }
+    }
+    if (spec.texts) {
+        var textElements = item.querySelectorAll(spec.texts);
+        record.texts = [];
+        for (var k = 0; k < textElements.length; k++) {
+            record.texts.push(textOf(textElements[k]));
+        }
+    }
+    if (spec.include_text) {
+        record.text = textOf(item);
+    }
+    records.push(record);
+}
+return JSON.stringify(records);
+"""
+
+
+def extract_list_items(driver, selectors):
+    """
+    在浏览器中一次性提取列表页面的所有新闻项
+
+    :param driver: selenium WebDriver
+    :param selectors: 选择器描述字典
+        - container: 列表容器选择器（可选）
+        - item: 新闻项选择器
+        - title: 新闻项内的标题元素选择器，取第一个文本长度超过 min_title_length 的元素
+        - min_title_length: 标题最小长度（可选）
+        - link: 链接元素选择器，默认使用标题元素（可选）
+        - time: 时间元素选择器（可选）
+        - time_attr: 从该属性读取时间，默认读取元素文本（可选）
+        - texts: 需要逐个返回文本的元素选择器（可选）
+        - include_text: 是否返回新闻项的完整文本（可选）
+        - last_only: 只提取最后一个新闻项（可选）
+    :return: 记录字典列表，容器不存在时返回None
+    """
+    result = driver.execute_script(BATCH_EXTRACT_SCRIPT, selectors)
+    if result is None:
+        return None
+    return json.loads(result)
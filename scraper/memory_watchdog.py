@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+浏览器内存监控 - 在后台定期采样每个Chrome进程树和本进程的常驻内存
+
+浏览器池根据采样结果回收超过 BROWSER_MAX_RSS_MB 的浏览器；同时按网站记录
+抓取期间的内存峰值，在抓取汇总中输出。网站由 MemoryWatchdog.site() 设置的上下文确定，
+浏览器租出时归属于租用它的网站。本进程的内存是所有网站共用的，只在进程中仅有一个网站
+抓取时计入该网站（如 process 模式的工作进程），另外单独记录整个进程的峰值。
+"""
+
+from contextlib import contextmanager
+import contextvars
+import os
+import threading
+import time
+
+from process_metrics import child_pid_map, descendant_pids, read_rss_bytes
+
+
+_current_site = contextvars.ContextVar("memory_site", default=None)
+
+
+def current_site():
+    """:return: 当前上下文中正在抓取的网站，没有时返回None"""
+    return _current_site.get()
+
+
+def driver_pid(driver):
+    """:return: selenium驱动对应的chromedriver进程pid，无法获取时返回None"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+class MemoryWatchdog:
+    """
+    定期采样被跟踪的浏览器进程树和本进程的常驻内存
+
+    :param interval: 采样间隔（秒）
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval or float(os.environ.get("BROWSER_MEMORY_SAMPLE_INTERVAL", "2"))
+        self._lock = threading.Lock()
+        self._thread = None
+        # key -> {"pid": chromedriver pid, "site": 租用的网站, "rss": 最近一次采样}
+        self._browsers = {}
+        # 正在抓取的网站 -> 嵌套层数
+        self._active_sites = {}
+        # 网站 -> {"browser_bytes", "python_bytes", "python_shared", "recycles"}
+        self._site_peaks = {}
+        # 整个进程的内存峰值
+        self.peak_python_bytes = 0
+
+    def start_run(self):
+        """开始新的一次抓取，清空上次运行记录的网站峰值和进程峰值"""
+        with self._lock:
+            self._site_peaks = {}
+            self.peak_python_bytes = 0
+
+    def track(self, key, pid):
+        """开始跟踪一个浏览器，pid为None时只记录不采样"""
+        with self._lock:
+            self._browsers[key] = {"pid": pid, "site": None, "rss": 0}
+            self._ensure_running()
+
+    def untrack(self, key):
+        with self._lock:
+            self._browsers.pop(key, None)
+
+    def assign(self, key, site):
+        """设置浏览器当前归属的网站，归还到池中时设为None"""
+        with self._lock:
+            browser = self._browsers.get(key)
+            if browser is not None:
+                browser["site"] = site
+
+    def rss_bytes(self, key):
+        """:return: 浏览器进程树最近一次采样的常驻内存（字节）"""
+        with self._lock:
+            browser = self._browsers.get(key)
+            return browser["rss"] if browser else 0
+
+    def record_recycle(self, key):
+        """记录浏览器因内存超限被回收，计入其所属网站"""
+        with self._lock:
+            browser = self._browsers.get(key)
+            if browser is not None and browser["site"]:
+                self._peak(browser["site"])["recycles"] += 1
+
+    @contextmanager
+    def site(self, name):
+        """在此上下文中租用的浏览器和本进程的内存计入网站 name"""
+        token = _current_site.set(name)
+        with self._lock:
+            self._active_sites[name] = self._active_sites.get(name, 0) + 1
+            self._peak(name)
+            self._ensure_running()
+        try:
+            yield
+        finally:
+            self.sample()
+            with self._lock:
+                self._active_sites[name] -= 1
+                if not self._active_sites[name]:
+                    del self._active_sites[name]
+            _current_site.reset(token)
+
+    def _peak(self, site):
+        peak = self._site_peaks.get(site)
+        if peak is None:
+            # python_shared: 曾与其他网站同时抓取，python_bytes 不能代表本网站
+            peak = {"browser_bytes": 0, "python_bytes": 0, "python_shared": False, "recycles": 0}
+            self._site_peaks[site] = peak
+        return peak
+
+    def sample(self):
+        """采样一次所有浏览器和本进程的内存，更新各网站的峰值"""
+        with self._lock:
+            pids = {key: browser["pid"] for key, browser in self._browsers.items() if browser["pid"]}
+        children = child_pid_map() if pids else {}
+        # chromedriver 及其启动的所有Chrome进程
+        rss = {
+            key: read_rss_bytes(pid) + sum(read_rss_bytes(child) for child in descendant_pids(pid, children))
+            for key, pid in pids.items()
+        }
+        python_bytes = read_rss_bytes(os.getpid())
+
+        with self._lock:
+            site_browser_bytes = {}
+            for key, value in rss.items():
+                browser = self._browsers.get(key)
+                if browser is None:
+                    continue
+                browser["rss"] = value
+                if browser["site"]:
+                    site_browser_bytes[browser["site"]] = site_browser_bytes.get(browser["site"], 0) + value
+            self.peak_python_bytes = max(self.peak_python_bytes, python_bytes)
+            for site in set(self._active_sites) | set(site_browser_bytes):
+                peak = self._peak(site)
+                peak["browser_bytes"] = max(peak["browser_bytes"], site_browser_bytes.get(site, 0))
+            if len(self._active_sites) == 1:
+                peak = self._peak(next(iter(self._active_sites)))
+                peak["python_bytes"] = max(peak["python_bytes"], python_bytes)
+            else:
+                for site in self._active_sites:
+                    self._peak(site)["python_shared"] = True
+
+    def _ensure_running(self):
+        """在持有锁时调用，没有采样线程时启动一个"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="memory-watchdog", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"内存采样失败: {e}")
+            with self._lock:
+                # 没有需要采样的对象时退出，之后再有浏览器或网站时重新启动
+                if not self._browsers and not self._active_sites:
+                    self._thread = None
+                    return
+
+    def site_peaks(self):
+        """:return: {网站: {"browser_bytes", "python_bytes", "python_shared", "recycles"}}"""
+        with self._lock:
+            return {site: dict(peak) for site, peak in self._site_peaks.items()}
+
+
+def print_site_peaks(site_peaks, python_bytes=None):
+    """
+    输出各网站抓取期间的内存峰值
+    :param python_bytes: 整个进程的Python内存峰值，网站在同一进程中并发抓取时输出
+    """
+    if not site_peaks:
+        return
+    print("\n网站内存峰值:")
+    for site, peak in site_peaks.items():
+        python = ""
+        if not peak["python_shared"]:
+            python = f", Python {peak['python_bytes'] / 1024 / 1024:.1f}MB"
+        recycles = f", 内存超限回收 {peak['recycles']} 次" if peak["recycles"] else ""
+        print(f"  {site}: Chrome {peak['browser_bytes'] / 1024 / 1024:.1f}MB{python}{recycles}")
+    if python_bytes:
+        print(f"  Python进程（所有网站共用）: {python_bytes / 1024 / 1024:.1f}MB")
+
+
+_watchdog = None
+_watchdog_lock = threading.Lock()
+
+
+def get_memory_watchdog():
+    """获取进程内共享的内存监控"""
+    global _watchdog
+    with _watchdog_lock:
+        if _watchdog is None:
+            _watchdog = MemoryWatchdog()
+        return _watchdog
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共享页面加载 - 多个抓取器使用同一个列表页面时，页面只打开和渲染一次
+
+    CLS_DEPTH_GROUP = get_page_load_group("cls_depth")
+
+    @CLS_DEPTH_GROUP.register
+    class CLSNewsScraper(BaseNewsScraper): ...
+
+组内第一个到达列表页面的抓取器打开页面，依次运行所有成员的等待、展开和解析，把各成员的
+解析结果保存下来；其他成员直接取用自己的结果，不再打开页面。组内成员抓取新闻内容时，
+同一URL只抓取一次，其他成员等待并共用结果。
+"""
+
+import os
+import threading
+import time
+
+from base_news_scraper import ListPageType
+
+
+def shared_page_ttl():
+    """共享结果的有效时间（秒），超过后重新加载"""
+    return float(os.environ.get("SHARED_PAGE_TTL", "600"))
+
+
+class _SharedResult:
+    """一次共享的页面加载或内容抓取"""
+
+    def __init__(self):
+        self.created_at = time.monotonic()
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+    def expired(self):
+        return self.done.is_set() and time.monotonic() - self.created_at > shared_page_ttl()
+
+
+class PageLoadGroup:
+    """共用同一列表页面的一组抓取器"""
+
+    def __init__(self, name):
+        self.name = name
+        self.members = []
+        # 本次运行中参与共享的成员，未调用 start_run 时不共享
+        self.active_members = []
+        self._lock = threading.Lock()
+        # 列表页面URL -> _SharedResult，value为 {抓取器类: 解析结果}
+        self._page_loads = {}
+        # 新闻URL -> _SharedResult，value为新闻内容
+        self._contents = {}
+
+    def register(self, scraper_class):
+        """类装饰器：把抓取器加入本组"""
+        self.members.append(scraper_class)
+        scraper_class.page_load_group = self
+        return scraper_class
+
+    def start_run(self, scraper_classes):
+        """
+        每次运行开始时清空共享结果，并登记本次运行的成员
+        只有一个成员参与时页面加载照常进行，不为未运行的成员解析页面
+        """
+        with self._lock:
+            self.active_members = [m for m in self.members if m in scraper_classes]
+            self._page_loads = {}
+            self._contents = {}
+
+    def is_shared(self, scraper):
+        return len(self.active_members) > 1 and type(scraper) in self.active_members
+
+    def _claim(self, entries, key):
+        """:return: (共享结果, 是否由调用方负责完成)"""
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None or entry.expired():
+                entry = _SharedResult()
+                entries[key] = entry
+                return entry, True
+            return entry, False
+
+    def list_page_items(self, scraper, url):
+        """
+        获取 scraper 在列表页面上的解析结果，页面由组内第一个到达的抓取器加载
+        :return: (title, url, source, time) 元组列表，解析失败返回None
+        """
+        entry, owner = self._claim(self._page_loads, url)
+        if owner:
+            try:
+                entry.value = self._load_page(scraper, url)
+            finally:
+                entry.done.set()
+        elif not entry.done.is_set():
+            print(f"等待 {self.name} 组共享的页面加载: {url}")
+            entry.done.wait(shared_page_ttl())
+
+        with self._lock:
+            items = (entry.value or {}).pop(type(scraper), None)
+        if items is not None or owner:
+            return items
+        # 加载失败或本抓取器的结果已被取用（如重试），自行加载
+        print(f"共享页面中没有 {type(scraper).__name__} 的结果，重新加载: {url}")
+        scraper.open_url(url, read_feed=scraper.uses_xhr_feed())
+        return scraper.render_list_page()
+
+    def _load_page(self, scraper, url):
+        """打开页面并运行所有成员的解析，只读取页面的成员先于需要点击"加载更多"的成员"""
+        print(f"正在访问页面: {url} ({self.name} 组共享, {len(self.members)} 个抓取器)")
+        extractors = self._extractors(scraper)
+        for member in extractors:
+            if member is not scraper:
+                member.page_readiness = scraper.page_readiness
+        scraper.open_url(url, read_feed=any(member.uses_xhr_feed() for member in extractors))
+        extractors.sort(key=lambda member: member.get_list_page_type() == ListPageType.LOAD_MORE)
+
+        results = {}
+        for member in extractors:
+            if member is not scraper:
+                # 借用加载页面的浏览器，结束后归还给原抓取器
+                member.driver = scraper.driver
+            try:
+                results[type(member)] = member.render_list_page()
+            except Exception as e:
+                print(f"{type(member).__name__} 解析共享页面失败: {e}")
+            finally:
+                if member is not scraper:
+                    member.driver = None
+        return results
+
+    def _extractors(self, scraper):
+        """:return: 本次运行的所有成员，scraper 以外的成员为新建的实例，共用 scraper 的浏览器池"""
+        extractors = []
+        for member_class in self.active_members:
+            if type(scraper) is member_class:
+                extractors.append(scraper)
+                continue
+            member = member_class(scraper.hours_ago)
+            member.browser_pool = scraper.browser_pool
+            extractors.append(member)
+        return extractors
+
+    def uses_xhr_feed(self, scraper):
+        """组内是否有成员从列表接口读取新闻，加载页面的浏览器需要开启performance日志"""
+        return any(member.uses_xhr_feed() for member in self._extractors(scraper))
+
+    def fetch_content(self, url, fetch):
+        """
+        组内同一新闻URL只抓取一次，等待者得到与抓取者相同的结果
+        :param fetch: 实际抓取的函数，返回 ArticleRecord
+        """
+        entry, owner = self._claim(self._contents, url)
+        if not owner:
+            entry.done.wait()
+            if entry.error is None:
+                return entry.value
+            # 抓取失败的URL由等待者自行重试
+            return fetch()
+        try:
+            entry.value = fetch()
+            return entry.value
+        except BaseException as e:
+            entry.error = e
+            with self._lock:
+                if self._contents.get(url) is entry:
+                    del self._contents[url]
+            raise
+        finally:
+            entry.done.set()
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def get_page_load_group(name):
+    """获取或创建指定名称的共享页面组"""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = PageLoadGroup(name)
+            _groups[name] = group
+        return group
+
+
+def start_page_load_groups(scraper_classes):
+    """
+    每次运行开始时调用
+    :param scraper_classes: 本次运行在同一进程中并发抓取的抓取器类
+    """
+    with _groups_lock:
+        groups = list(_groups.values())
+    for group in groups:
+        group.start_run(scraper_classes)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面就绪检测 - 按条件轮询页面状态，条件满足立即返回，替代固定时长的等待
+"""
+
+import threading
+import time
+
+
+# 通过CDP注入到每个新文档，统计进行中的XHR/fetch请求数和最近一次网络活动时间
+NETWORK_TRACKER_SCRIPT = """
+(function() {
+    if (window.__newsScraperInflight !== undefined) {
+        return;
+    }
+    window.__newsScraperInflight = 0;
+    window.__newsScraperLastActivity = Date.now();
+    function begin() {
+        window.__newsScraperInflight += 1;
+        window.__newsScraperLastActivity = Date.now();
+    }
+    function end() {
+        window.__newsScraperInflight = Math.max(0, window.__newsScraperInflight - 1);
+        window.__newsScraperLastActivity = Date.now();
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        begin();
+        this.addEventListener('loadend', end);
+        return originalSend.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            begin();
+            return originalFetch.apply(this, arguments).then(function(response) {
+                end();
+                return response;
+            }, function(error) {
+                end();
+                throw error;
+            });
+        };
+    }
+})();
+"""
+
+# 一次往返取回判断就绪所需的全部页面状态
+PAGE_STATE_SCRIPT = """
+var containerSelector = arguments[0];
+var itemSelector = arguments[1];
+return {
+    readyState: document.readyState,
+    container: containerSelector ? document.querySelector(containerSelector) !== null : true,
+    itemCount: itemSelector ? document.querySelectorAll(itemSelector).length : -1,
+    jqueryActive: typeof jQuery !== 'undefined' ? jQuery.active : 0,
+    inflight: window.__newsScraperInflight === undefined ? -1 : window.__newsScraperInflight,
+    idleMs: window.__newsScraperLastActivity === undefined ? -1 : Date.now() - window.__newsScraperLastActivity
+};
+"""
+
+
+class ReadinessProfile:
+    """
+    描述页面何时算作"就绪"
+
+    所有指定的条件同时满足时页面就绪:
+    - container_selector: 容器元素已出现
+    - item_selector/min_items: 新闻项数量不少于 min_items，且在 stable_ms 毫秒内不再变化
+    - network_idle_ms: 没有进行中的XHR/fetch请求，且网络已空闲该毫秒数
+    """
+
+    def __init__(
+        self,
+        container_selector=None,
+        item_selector=None,
+        min_items=1,
+        stable_ms=500,
+        network_idle_ms=None,
+        timeout=10,
+        poll_interval=0.1,
+    ):
+        self.container_selector = container_selector
+        self.item_selector = item_selector
+        self.min_items = min_items
+        self.stable_ms = stable_ms
+        self.network_idle_ms = network_idle_ms
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+
+class ReadinessCheck:
+    """根据 PAGE_STATE_SCRIPT 返回的页面状态逐次判断是否就绪，记录新闻项数量的变化时间"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.count = None
+        self.changed_at = time.perf_counter()
+
+    def is_ready(self, page):
+        profile = self.profile
+        now = time.perf_counter()
+        if page["readyState"] == "loading" or not page["container"]:
+            return False
+        if page["jqueryActive"]:
+            return False
+
+        if profile.item_selector:
+            count = page["itemCount"]
+            if count != self.count:
+                self.count = count
+                self.changed_at = now
+                return False
+            if count < profile.min_items:
+                return False
+            if (now - self.changed_at) * 1000 < profile.stable_ms:
+                return False
+
+        if profile.network_idle_ms is not None and page["inflight"] >= 0:
+            if page["inflight"] > 0 or page["idleMs"] < profile.network_idle_ms:
+                return False
+        return True
+
+
+class PageReadiness:
+    """等待页面就绪，并按阶段统计等待时间"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wait_seconds = {}
+        self._wait_counts = {}
+        self._timeouts = {}
+
+    def install_network_tracker(self, driver):
+        """通过CDP在浏览器中注册网络请求跟踪脚本，每个浏览器只注册一次"""
+        if getattr(driver, "_news_scraper_network_tracker", False):
+            return
+        try:
+            driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT}
+            )
+            driver._news_scraper_network_tracker = True
+        except Exception as e:
+            print(f"注册网络请求跟踪脚本失败: {e}")
+
+    def record(self, phase, seconds, timed_out=False):
+        """记录某个阶段的一次等待"""
+        with self._lock:
+            self._wait_seconds[phase] = self._wait_seconds.get(phase, 0.0) + seconds
+            self._wait_counts[phase] = self._wait_counts.get(phase, 0) + 1
+            if timed_out:
+                self._timeouts[phase] = self._timeouts.get(phase, 0) + 1
+
+    def wait_for(self, condition, timeout, phase, poll_interval=0.1):
+        """
+        轮询直到条件成立或超时
+        :param condition: 无参函数，返回真值表示条件成立
+        :param timeout: 超时时间（秒）
+        :param phase: 阶段名称，用于统计
+        :return: 条件是否成立
+        """
+        start = time.perf_counter()
+        deadline = start + timeout
+        while True:
+            try:
+                if condition():
+                    self.record(phase, time.perf_counter() - start)
+                    return True
+            except Exception:
+                pass
+            if time.perf_counter() >= deadline:
+                self.record(phase, time.perf_counter() - start, timed_out=True)
+                return False
+            time.sleep(poll_interval)
+
+    def wait_until_ready(self, driver, profile, phase):
+        """
+        等待页面满足就绪配置
+        :param driver: selenium WebDriver
+        :param profile: ReadinessProfile
+        :param phase: 阶段名称，用于统计
+        :return: 页面是否在超时前就绪
+        """
+        check = ReadinessCheck(profile)
+
+        def is_ready():
+            page = driver.execute_script(
+                PAGE_STATE_SCRIPT, profile.container_selector, profile.item_selector
+            )
+            return check.is_ready(page)
+
+        ready = self.wait_for(is_ready, profile.timeout, phase, profile.poll_interval)
+        if not ready:
+            print(f"等待页面就绪超时 ({phase}, {profile.timeout}秒)，继续执行...")
+        return ready
+
+    def report(self):
+        """
+        获取各阶段的等待时间统计
+        :return: {阶段: {"seconds": 总等待秒数, "count": 等待次数, "timeouts": 超时次数}}
+        """
+        with self._lock:
+            return {
+                phase: {
+                    "seconds": seconds,
+                    "count": self._wait_counts.get(phase, 0),
+                    "timeouts": self._timeouts.get(phase, 0),
+                }
+                for phase, seconds in self._wait_seconds.items()
+            }
+
+    def print_report(self, title="等待时间统计"):
+        report = self.report()
+        if not report:
+            return
+        print(f"\n{title}:")
+        for phase, stat in sorted(report.items(), key=lambda x: -x[1]["seconds"]):
+            print(
+                f"  {phase}: {stat['seconds']:.2f}秒 ({stat['count']} 次, 超时 {stat['timeouts']} 次)"
+            )
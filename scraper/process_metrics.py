@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进程内存统计 - 从 /proc 读取本进程和其子进程（chromedriver、Chrome）的常驻内存
+"""
+
+import os
+import threading
+
+
+def read_rss_bytes(pid):
+    """
+    :return: 进程的常驻内存（字节），进程不存在或无法读取时返回0
+    """
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def child_pid_map():
+    """:return: {父进程pid: [子进程pid]}"""
+    children = {}
+    try:
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return children
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # 进程名可能包含空格和括号，父进程pid在最后一个右括号之后的第二个字段
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(pid)
+    return children
+
+
+def descendant_pids(pid, children=None):
+    """:return: pid的所有后代进程"""
+    children = child_pid_map() if children is None else children
+    result = []
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        result.append(child)
+        stack.extend(children.get(child, []))
+    return result
+
+
+def process_tree_rss(pid):
+    """:return: 进程pid所有后代进程的常驻内存之和（字节），不含pid本身"""
+    return sum(read_rss_bytes(child) for child in descendant_pids(pid))
+
+
+class RssSampler:
+    """在后台线程中定期采样本进程和子进程的内存，记录峰值"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak_python_bytes = 0
+        self.peak_children_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        pid = os.getpid()
+        self.peak_python_bytes = max(self.peak_python_bytes, read_rss_bytes(pid))
+        self.peak_children_bytes = max(self.peak_children_bytes, process_tree_rss(pid))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.sample()
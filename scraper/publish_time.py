@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布时间解析 - 抓取内容前为列表中没有精确时间的新闻确定发布时间，早于截止时间的不再抓取内容
+
+- 文章ID索引：文章URL中带递增ID的网站，从接口和已抓取文章学习 ID -> 发布时间，
+  已知某篇ID更大的文章早于截止时间时，ID更小的文章也早于截止时间
+- 页面开头探测：只读取文章页面开头的部分内容，从meta标签、JSON-LD或页面数据中找出发布时间
+
+索引按域名保存在 DATA_DIR/time_index/<域名>.json，同一进程中的抓取器共用。
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+import json
+import os
+import re
+import sys
+import threading
+
+from article_extraction import parse_publish_time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.utils import get_state_dir
+
+
+# 页面开头中常见的发布时间写法，按顺序匹配
+PROBE_PATTERNS = (
+    re.compile(r"""<meta[^>]+(?:property|name|itemprop)=["'](?:article:published_time|datePublished|pubdate|publishdate)["'][^>]+content=["']([^"']+)["']""", re.IGNORECASE),
+    re.compile(r"""<meta[^>]+content=["']([^"']+)["'][^>]+(?:property|name|itemprop)=["'](?:article:published_time|datePublished|pubdate|publishdate)["']""", re.IGNORECASE),
+    re.compile(r""""datePublished"\s*:\s*"([^"]+)\""""),
+)
+
+
+def time_resolution_enabled():
+    return os.environ.get("TIME_RESOLUTION_ENABLED", "1") == "1"
+
+
+class PublishTimeIndex:
+    """
+    单个域名的 文章ID -> 发布时间 索引
+    只保留ID最大的 max_points 个点，早于 max_age_days 的点在加载时丢弃
+    """
+
+    def __init__(self, filepath, max_points=5000, max_age_days=30):
+        self.filepath = filepath
+        self.max_points = max_points
+        self.max_age_days = max_age_days
+        self.margin = timedelta(minutes=float(os.environ.get("TIME_INDEX_MARGIN_MINUTES", "30")))
+        self._lock = threading.Lock()
+        # 按ID排序的 (id, 发布时间) 列表
+        self._points = self._load()
+
+    def _load(self):
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            print(f"读取发布时间索引失败: {e}")
+            return []
+        expire_before = (datetime.now() - timedelta(days=self.max_age_days)).timestamp()
+        return sorted(
+            (int(article_id), datetime.fromtimestamp(ts))
+            for article_id, ts in data
+            if ts >= expire_before
+        )
+
+    def __len__(self):
+        with self._lock:
+            return len(self._points)
+
+    def learn(self, article_id, published_time):
+        with self._lock:
+            index = bisect_left(self._points, (article_id,))
+            if index < len(self._points) and self._points[index][0] == article_id:
+                self._points[index] = (article_id, published_time)
+            else:
+                insort(self._points, (article_id, published_time))
+            if len(self._points) > self.max_points:
+                del self._points[: len(self._points) - self.max_points]
+
+    def is_before(self, article_id, cutoff):
+        """
+        文章是否一定早于截止时间：存在ID不小于它、发布时间早于 cutoff - margin 的文章
+        留出 margin 以容忍ID分配与发布之间的时间差
+        """
+        threshold = cutoff - self.margin
+        with self._lock:
+            index = bisect_left(self._points, (article_id,))
+            return any(published_time <= threshold for _, published_time in self._points[index:])
+
+    def save(self):
+        with self._lock:
+            data = [[article_id, published_time.timestamp()] for article_id, published_time in self._points]
+        try:
+            os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+            tmp_filepath = f"{self.filepath}.tmp"
+            with open(tmp_filepath, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_filepath, self.filepath)
+        except OSError as e:
+            print(f"保存发布时间索引失败: {e}")
+
+
+def find_publish_time(text, extra_patterns=()):
+    """
+    在页面开头的内容中查找发布时间
+    :param extra_patterns: 网站特有的正则表达式，第一个分组为时间，优先匹配
+    :return: datetime，找不到时返回None
+    """
+    for pattern in tuple(extra_patterns) + PROBE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            published_time = parse_publish_time(match.group(1))
+            if published_time is not None:
+                return published_time
+    return None
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_publish_time_index(domain):
+    """获取进程内共享的域名发布时间索引"""
+    filepath = get_state_dir("time_index", f"{domain}.json")
+    with _indexes_lock:
+        index = _indexes.get(filepath)
+        if index is None:
+            index = PublishTimeIndex(filepath)
+            _indexes[filepath] = index
+        return index
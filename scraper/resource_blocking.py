@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+资源拦截 - 通过CDP Network.setBlockedURLs 阻止抓取不需要的字体、媒体、统计和广告请求
+"""
+
+import os
+
+
+# Network.setBlockedURLs 只支持按URL通配符匹配，资源类型按文件扩展名转换为URL模式
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.m3u8*", "*.flv*", "*.ts?*", "*.webm*", "*.mp3*", "*.m4a*"],
+    "stylesheet": ["*.css*"],
+}
+
+# 统计、埋点和广告服务
+TRACKER_PATTERNS = [
+    "*hm.baidu.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*cnzz.com*",
+    "*51.la*",
+    "*growingio.com*",
+    "*sensorsdata.cn*",
+    "*umeng.com*",
+    "*pos.baidu.com*",
+    "*cpro.baidustatic.com*",
+]
+
+# 获取页面资源加载情况，用于比较拦截前后的请求数和传输字节数
+PAGE_RESOURCES_SCRIPT = """
+var navigation = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = navigation ? navigation.transferSize : 0;
+for (var i = 0; i < resources.length; i++) {
+    bytes += resources[i].transferSize || 0;
+}
+return {
+    requests: resources.length + 1,
+    bytes: bytes,
+    heapBytes: performance.memory ? performance.memory.usedJSHeapSize : 0
+};
+"""
+
+
+class BlockingProfile:
+    """
+    一组拦截规则
+
+    - resource_types: 按扩展名拦截的资源类型，可选 image/font/media/stylesheet
+    - block_trackers: 是否拦截常见的统计和广告服务
+    - url_patterns: 额外拦截的URL通配符，如网站自己的广告或视频播放器脚本
+    """
+
+    def __init__(self, name, resource_types=(), block_trackers=True, url_patterns=()):
+        self.name = name
+        self.resource_types = tuple(resource_types)
+        self.block_trackers = block_trackers
+        self.url_patterns = tuple(url_patterns)
+
+    def blocked_urls(self):
+        urls = []
+        for resource_type in self.resource_types:
+            urls.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        if self.block_trackers:
+            urls.extend(TRACKER_PATTERNS)
+        urls.extend(self.url_patterns)
+        return urls
+
+    def extend(self, name, resource_types=(), url_patterns=()):
+        """在当前规则的基础上增加拦截项，生成新的规则"""
+        return BlockingProfile(
+            name,
+            self.resource_types + tuple(t for t in resource_types if t not in self.resource_types),
+            self.block_trackers,
+            self.url_patterns + tuple(url_patterns),
+        )
+
+
+# 不拦截任何请求
+NO_BLOCKING = BlockingProfile("none", block_trackers=False)
+
+# 默认规则：图片、字体、音视频和统计广告，保留样式表以免影响元素可见性和滚动加载
+DEFAULT_BLOCKING = BlockingProfile("default", ("image", "font", "media"))
+
+
+def resource_blocking_enabled():
+    return os.environ.get("RESOURCE_BLOCKING_ENABLED", "1") == "1"
+
+
+def apply_blocking_profile(driver, profile):
+    """
+    在浏览器中启用拦截规则，浏览器已使用同一规则时不重复设置
+    :param driver: selenium WebDriver
+    :param profile: BlockingProfile
+    """
+    if not resource_blocking_enabled():
+        profile = NO_BLOCKING
+    if getattr(driver, "_news_scraper_blocking_profile", None) == profile.name:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.blocked_urls()})
+        driver._news_scraper_blocking_profile = profile.name
+    except Exception as e:
+        print(f"设置资源拦截规则失败: {e}")
+
+
+def measure_page_resources(driver):
+    """
+    :return: 当前页面的 {"requests": 请求数, "bytes": 传输字节数, "heapBytes": JS堆大小}
+    """
+    return driver.execute_script(PAGE_RESOURCES_SCRIPT)
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+URL级重试 - 按错误类型决定是否重试，指数退避加随机抖动，每次运行共享重试预算，
+并为每个域名维护熔断器，网站明显不可用时不再继续请求
+
+    retrier = get_url_retrier()
+    content = retrier.call(url, scrape, url)
+
+超时、连接错误、5xx、408/429 会重试；其他4xx和解析错误不重试。
+"""
+
+from urllib.parse import urlsplit
+import asyncio
+import os
+import random
+import socket
+import threading
+import time
+
+
+# 错误类型
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+HTTP_4XX = "http_4xx"
+HTTP_5XX = "http_5xx"
+PARSE = "parse"
+CIRCUIT_OPEN = "circuit_open"
+UNKNOWN = "unknown"
+
+# 网站可能不可用的错误，计入熔断器
+BREAKER_KINDS = {TIMEOUT, CONNECTION, HTTP_5XX}
+RETRYABLE_4XX = {408, 429}
+# 与URL本身无关的错误，不计入统计，直接抛出
+PASSTHROUGH_ERRORS = {"BrowserPoolExhausted"}
+
+
+class ContentParseError(Exception):
+    """页面已加载但未解析到内容"""
+
+
+class CircuitOpenError(Exception):
+    """域名熔断中，请求未发出"""
+
+
+def _status_code(error):
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def classify_error(error):
+    """
+    :return: (错误类型, 是否可重试)
+    """
+    if isinstance(error, CircuitOpenError):
+        return CIRCUIT_OPEN, False
+    if isinstance(error, ContentParseError):
+        return PARSE, False
+
+    status = _status_code(error)
+    if status is not None:
+        if status >= 500:
+            return HTTP_5XX, True
+        if status >= 400:
+            return HTTP_4XX, status in RETRYABLE_4XX
+
+    # 按类名判断，避免为分类导入selenium、requests和websockets
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if isinstance(error, (TimeoutError, socket.timeout, asyncio.TimeoutError)) or names & {
+        "TimeoutException", "Timeout", "ReadTimeout", "ConnectTimeout",
+    }:
+        return TIMEOUT, True
+    if names & {"NoSuchElementException", "StaleElementReferenceException", "ValueError", "KeyError"}:
+        return PARSE, False
+    if isinstance(error, ConnectionError) or names & {
+        "ConnectionError", "WebDriverException", "ConnectionClosed", "CdpError",
+    }:
+        return CONNECTION, True
+    return UNKNOWN, False
+
+
+class RetryPolicy:
+    """指数退避，"full jitter"：第n次重试前等待 [0, min(max_delay, base_delay * 2^n)] 中的随机时间"""
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=None, rng=None):
+        self.max_attempts = max_attempts or int(os.environ.get("RETRY_MAX_ATTEMPTS", "3"))
+        self.base_delay = base_delay if base_delay is not None else float(
+            os.environ.get("RETRY_BASE_DELAY", "1")
+        )
+        self.max_delay = max_delay if max_delay is not None else float(
+            os.environ.get("RETRY_MAX_DELAY", "30")
+        )
+        self._rng = rng or random.Random()
+
+    def delay(self, retry_number):
+        """:param retry_number: 第几次重试，从0开始"""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry_number)))
+
+
+class RetryBudget:
+    """一次运行中所有URL共享的重试次数上限，避免大面积故障时重试放大请求量"""
+
+    def __init__(self, limit=None):
+        self.limit = limit if limit is not None else int(os.environ.get("RETRY_BUDGET", "100"))
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self):
+        with self._lock:
+            if self.spent >= self.limit:
+                return False
+            self.spent += 1
+            return True
+
+    def reset(self):
+        with self._lock:
+            self.spent = 0
+
+
+class CircuitBreaker:
+    """
+    单个域名的熔断器
+    连续 failure_threshold 次可能因网站不可用导致的失败后熔断，reset_seconds 后放行一次试探请求，
+    网站有响应则恢复，仍不可用则继续熔断，试探请求未发出时下次调用重新试探
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                # 只放行一个试探请求
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release_probe(self):
+        """试探请求未发出，恢复为熔断状态且不重新计时，下次 allow() 再放行一次试探"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_failure(self):
+        """:return: 本次失败是否使熔断器打开"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class RetryMetrics:
+    """重试和熔断统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.recovered = 0
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self.errors = {}
+        self.breaker_trips = {}
+        self.breaker_rejections = {}
+
+    def increment(self, name, key=None):
+        with self._lock:
+            if key is None:
+                setattr(self, name, getattr(self, name) + 1)
+            else:
+                counter = getattr(self, name)
+                counter[key] = counter.get(key, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "recovered": self.recovered,
+                "gave_up": self.gave_up,
+                "budget_exhausted": self.budget_exhausted,
+                "errors": dict(self.errors),
+                "breaker_trips": dict(self.breaker_trips),
+                "breaker_rejections": dict(self.breaker_rejections),
+            }
+
+    def print_stats(self, title="URL重试统计"):
+        stats = self.snapshot()
+        if not stats["calls"]:
+            return
+        print(
+            f"\n{title}: {stats['calls']} 个URL, 请求 {stats['attempts']} 次, 重试 {stats['retries']} 次, "
+            f"重试后成功 {stats['recovered']} 个, 放弃 {stats['gave_up']} 个, "
+            f"预算耗尽 {stats['budget_exhausted']} 次"
+        )
+        if stats["errors"]:
+            print("  错误类型: " + ", ".join(f"{k} {v}" for k, v in sorted(stats["errors"].items())))
+        for domain, trips in sorted(stats["breaker_trips"].items()):
+            rejected = stats["breaker_rejections"].get(domain, 0)
+            print(f"  熔断: {domain} 打开 {trips} 次, 拒绝 {rejected} 个请求")
+
+
+class UrlRetrier:
+    """按URL执行带重试和熔断的调用"""
+
+    def __init__(self, policy=None, budget=None, failure_threshold=None, reset_seconds=None):
+        self.policy = policy or RetryPolicy()
+        self.budget = budget or RetryBudget()
+        self.failure_threshold = failure_threshold or int(
+            os.environ.get("BREAKER_FAILURE_THRESHOLD", "5")
+        )
+        self.reset_seconds = reset_seconds if reset_seconds is not None else float(
+            os.environ.get("BREAKER_RESET_SECONDS", "60")
+        )
+        self.metrics = RetryMetrics()
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def start_run(self):
+        """每次运行开始时重置重试预算和统计，熔断器状态保留"""
+        self.budget.reset()
+        self.metrics = RetryMetrics()
+
+    def breaker(self, url):
+        domain = urlsplit(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(domain)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_seconds)
+                self._breakers[domain] = breaker
+            return domain, breaker
+
+    def _before_attempt(self, url):
+        domain, breaker = self.breaker(url)
+        if not breaker.allow():
+            self.metrics.increment("breaker_rejections", domain)
+            raise CircuitOpenError(f"{domain} 熔断中，跳过 {url}")
+        self.metrics.increment("attempts")
+        return domain, breaker
+
+    def _after_failure(self, url, error, domain, breaker, attempt):
+        """
+        记录失败并决定是否重试
+        :return: 重试前等待的秒数，不重试时返回None
+        """
+        kind, retryable = classify_error(error)
+        self.metrics.increment("errors", kind)
+        if kind in BREAKER_KINDS:
+            if breaker.record_failure():
+                self.metrics.increment("breaker_trips", domain)
+                print(f"{domain} 连续失败，熔断 {self.reset_seconds:.0f} 秒")
+        elif kind == CIRCUIT_OPEN:
+            breaker.release_probe()
+        else:
+            # 4xx、解析错误等说明网站有响应，只是本URL的问题
+            breaker.record_success()
+        if not retryable or attempt + 1 >= self.policy.max_attempts:
+            return None
+        if not self.budget.try_spend():
+            self.metrics.increment("budget_exhausted")
+            return None
+        self.metrics.increment("retries")
+        delay = self.policy.delay(attempt)
+        print(f"{kind} 错误，{delay:.1f}秒后第 {attempt + 1} 次重试: {url}")
+        return delay
+
+    def call(self, url, func, *args, **kwargs):
+        """
+        调用 func(*args, **kwargs)，失败时按策略重试
+        :return: func的返回值
+        :raise: 不再重试时抛出最后一次的异常
+        """
+        self.metrics.increment("calls")
+        attempt = 0
+        while True:
+            domain, breaker = self._before_attempt(url)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if type(e).__name__ in PASSTHROUGH_ERRORS:
+                    breaker.release_probe()
+                    raise
+                delay = self._after_failure(url, e, domain, breaker, attempt)
+                if delay is None:
+                    self.metrics.increment("gave_up")
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            breaker.record_success()
+            if attempt:
+                self.metrics.increment("recovered")
+            return result
+
+    async def acall(self, url, coroutine_factory):
+        """call 的异步版本，coroutine_factory 每次重试返回新的协程"""
+        self.metrics.increment("calls")
+        attempt = 0
+        while True:
+            domain, breaker = self._before_attempt(url)
+            try:
+                result = await coroutine_factory()
+            except Exception as e:
+                if type(e).__name__ in PASSTHROUGH_ERRORS:
+                    breaker.release_probe()
+                    raise
+                delay = self._after_failure(url, e, domain, breaker, attempt)
+                if delay is None:
+                    self.metrics.increment("gave_up")
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            breaker.record_success()
+            if attempt:
+                self.metrics.increment("recovered")
+            return result
+
+
+def site_retry_delay(retry_count, rng=random):
+    """
+    整站重试前的等待时间：5秒起指数退避，最长120秒，其中一半为随机抖动
+    :param retry_count: 第几次重试，从1开始
+    """
+    delay = min(120.0, 5.0 * (2 ** (retry_count - 1)))
+    return delay / 2 + rng.uniform(0, delay / 2)
+
+
+_retrier = None
+_retrier_lock = threading.Lock()
+
+
+def get_url_retrier():
+    """获取进程内共享的URL重试器"""
+    global _retrier
+    with _retrier_lock:
+        if _retrier is None:
+            _retrier = UrlRetrier()
+        return _retrier
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表页面滚动策略 - 每个抓取器选择是否滚动以及何时停止，不再固定滚动三次
+
+- NONE: 不滚动，用于分页网站和由"加载更多"按钮加载的网站
+- UNTIL_STABLE: 滚动到底部，新闻项数量不再增长时停止
+- UNTIL_CUTOFF: 同 UNTIL_STABLE，且最后一条新闻早于截止时间时停止
+- FIXED: 固定滚动 max_scrolls 次
+
+新闻项数量由注入页面的 MutationObserver 统计，每次轮询只需一次脚本调用。
+"""
+
+
+# 在页面中安装 MutationObserver，DOM变化时重新统计新闻项数量并记录变化时间
+SCROLL_WATCH_SCRIPT = """
+var itemSelector = arguments[0];
+var watch = window.__newsScraperScrollWatch;
+if (!watch || watch.selector !== itemSelector) {
+    if (watch) {
+        watch.observer.disconnect();
+    }
+    watch = {selector: itemSelector, count: -1, changedAt: Date.now()};
+    var update = function() {
+        var count = itemSelector
+            ? document.querySelectorAll(itemSelector).length
+            : document.body.scrollHeight;
+        if (count !== watch.count) {
+            watch.count = count;
+            watch.changedAt = Date.now();
+        }
+    };
+    watch.observer = new MutationObserver(update);
+    watch.observer.observe(document.body, {childList: true, subtree: true});
+    update();
+    window.__newsScraperScrollWatch = watch;
+}
+return {count: watch.count, quietMs: Date.now() - watch.changedAt};
+"""
+
+SCROLL_TO_BOTTOM_SCRIPT = "window.scrollTo(0, document.body.scrollHeight);"
+
+
+class ScrollStrategy:
+    """
+    列表页面的滚动方式
+
+    :param mode: NONE、UNTIL_STABLE、UNTIL_CUTOFF 或 FIXED
+    :param max_scrolls: 最多滚动次数，FIXED 模式下为滚动次数
+    :param settle_timeout: 每次滚动后等待新内容出现的最长时间（秒）
+    :param stable_ms: 新内容出现后DOM保持不变该毫秒数，才进行下一次滚动
+    """
+
+    NONE = "none"
+    UNTIL_STABLE = "until_stable"
+    UNTIL_CUTOFF = "until_cutoff"
+    FIXED = "fixed"
+
+    def __init__(self, mode=UNTIL_STABLE, max_scrolls=3, settle_timeout=1.5, stable_ms=200):
+        self.mode = mode
+        self.max_scrolls = max_scrolls
+        self.settle_timeout = settle_timeout
+        self.stable_ms = stable_ms
+
+
+NO_SCROLL = ScrollStrategy(ScrollStrategy.NONE)
+
+
+def read_scroll_watch(driver, item_selector):
+    """:return: {"count": 新闻项数量（无选择器时为页面高度）, "quietMs": 距上次变化的毫秒数}"""
+    return driver.execute_script(SCROLL_WATCH_SCRIPT, item_selector)
+
+
+def scroll_list_page(driver, strategy, page_readiness, item_selector=None, reached_cutoff=None):
+    """
+    按滚动策略滚动列表页面
+    :param item_selector: 新闻项选择器，None 时以页面高度判断是否加载了新内容
+    :param reached_cutoff: 无参函数，UNTIL_CUTOFF 模式下每次滚动前调用，返回True时停止
+    :return: 实际滚动次数
+    """
+    if strategy.mode == ScrollStrategy.NONE:
+        return 0
+
+    scrolls = 0
+    for i in range(strategy.max_scrolls):
+        if strategy.mode == ScrollStrategy.UNTIL_CUTOFF and reached_cutoff and reached_cutoff():
+            break
+
+        before = read_scroll_watch(driver, item_selector)["count"]
+        driver.execute_script(SCROLL_TO_BOTTOM_SCRIPT)
+        scrolls += 1
+
+        state = {"count": before}
+
+        def settled():
+            state.update(read_scroll_watch(driver, item_selector))
+            return state["count"] > before and state["quietMs"] >= strategy.stable_ms
+
+        page_readiness.wait_for(settled, timeout=strategy.settle_timeout, phase="scroll")
+        if state["count"] > before:
+            print(f"滚动 {i + 1}/{strategy.max_scrolls}: 新闻项 {before} -> {state['count']}")
+        elif strategy.mode != ScrollStrategy.FIXED:
+            print(f"滚动 {i + 1}/{strategy.max_scrolls}: 未检测到新内容加载，停止滚动")
+            break
+    return scrolls
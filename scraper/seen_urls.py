@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+已入库URL检查 - 在抓取新闻内容前跳过数据库中已有的新闻
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SeenUrlCache:
+    """
+    本地已抓取URL缓存
+
+    只记录数据库确认已存在的URL，数据库不可用时用来跳过已入库的新闻。
+    抓取到内容但尚未入库的URL不记录，入库失败时这些新闻在之后的运行中重新抓取。
+    超过有效期的记录在加载时丢弃。
+    """
+
+    def __init__(self, filepath, ttl_hours=72):
+        """
+        :param filepath: 缓存文件路径
+        :param ttl_hours: 记录的有效期（小时）
+        """
+        self.filepath = filepath
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._urls = self._load()
+
+    def _load(self):
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                urls = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"读取已抓取URL缓存失败: {e}")
+            return {}
+        expire_before = time.time() - self.ttl_seconds
+        return {url: seen_at for url, seen_at in urls.items() if seen_at >= expire_before}
+
+    def find_seen(self, urls):
+        """
+        :param urls: 待检查的URL列表
+        :return: 缓存中已有的URL集合
+        """
+        with self._lock:
+            return {url for url in urls if url in self._urls}
+
+    def add(self, urls):
+        now = time.time()
+        with self._lock:
+            for url in urls:
+                self._urls[url] = now
+
+    def save(self):
+        """原子地写回缓存文件"""
+        with self._lock:
+            data = dict(self._urls)
+        try:
+            os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+            tmp_filepath = f"{self.filepath}.tmp"
+            with open(tmp_filepath, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_filepath, self.filepath)
+        except OSError as e:
+            print(f"保存已抓取URL缓存失败: {e}")
+
+
+_news_dao = None
+_news_dao_lock = threading.Lock()
+
+
+def get_news_dao():
+    """
+    获取共享的NewsDAO实例
+    :return: NewsDAO，数据库驱动未安装或无法连接时返回None
+    """
+    global _news_dao
+    with _news_dao_lock:
+        if _news_dao is None:
+            dao_dir = os.path.join(project_dir, "dao")
+            if dao_dir not in sys.path:
+                sys.path.append(dao_dir)
+            try:
+                from news_dao import NewsDAO
+
+                _news_dao = NewsDAO()
+            except Exception as e:
+                print(f"连接新闻数据库失败: {e}")
+                return None
+        return _news_dao
+
+
+class ExistingUrlChecker:
+    """查询候选URL中哪些已经入库，数据库不可用时退回本地缓存"""
+
+    def __init__(self, cache):
+        """
+        :param cache: SeenUrlCache
+        """
+        self.cache = cache
+
+    def find_existing(self, urls):
+        """
+        :param urls: 候选URL列表
+        :return: 已入库（或本地缓存中已抓取过）的URL集合
+        """
+        if not urls:
+            return set()
+
+        news_dao = get_news_dao()
+        existing_urls = news_dao.get_existing_urls(urls) if news_dao else None
+        if existing_urls is not None:
+            print(f"数据库中已存在 {len(existing_urls)}/{len(urls)} 条新闻")
+            # 同步到本地缓存，供数据库不可用时使用
+            self.cache.add(existing_urls)
+            self.cache.save()
+            return existing_urls
+
+        seen_urls = self.cache.find_seen(urls)
+        print(f"数据库不可用，本地缓存中已抓取过 {len(seen_urls)}/{len(urls)} 条新闻")
+        return seen_urls
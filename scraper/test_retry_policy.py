@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+熔断器试探请求的回归测试
+
+    cd scraper && python -m unittest test_retry_policy
+"""
+
+import asyncio
+import time
+import unittest
+
+from retry_policy import CircuitBreaker, CircuitOpenError, ContentParseError, RetryBudget, RetryPolicy, UrlRetrier
+
+
+URL = "https://example.com/detail/1"
+
+
+class BrowserPoolExhausted(Exception):
+    """与 browser_pool.BrowserPoolExhausted 同名，按类名透传"""
+
+
+def make_retrier():
+    return UrlRetrier(
+        policy=RetryPolicy(max_attempts=1),
+        budget=RetryBudget(limit=0),
+        failure_threshold=1,
+        reset_seconds=0.05,
+    )
+
+
+def raise_error(error):
+    raise error
+
+
+class HalfOpenProbeTest(unittest.TestCase):
+    def open_breaker(self, retrier):
+        with self.assertRaises(ConnectionError):
+            retrier.call(URL, raise_error, ConnectionError("refused"))
+        _, breaker = retrier.breaker(URL)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            retrier.call(URL, lambda: "content")
+        time.sleep(0.06)
+        return breaker
+
+    def test_parse_error_probe_closes_breaker(self):
+        retrier = make_retrier()
+        breaker = self.open_breaker(retrier)
+        with self.assertRaises(ContentParseError):
+            retrier.call(URL, raise_error, ContentParseError("empty"))
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(retrier.call(URL, lambda: "content"), "content")
+
+    def test_async_parse_error_probe_closes_breaker(self):
+        retrier = make_retrier()
+        breaker = self.open_breaker(retrier)
+
+        async def probe():
+            raise ContentParseError("empty")
+
+        with self.assertRaises(ContentParseError):
+            asyncio.run(retrier.acall(URL, probe))
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_connection_error_probe_reopens_breaker(self):
+        retrier = make_retrier()
+        breaker = self.open_breaker(retrier)
+        with self.assertRaises(ConnectionError):
+            retrier.call(URL, raise_error, ConnectionError("refused"))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            retrier.call(URL, lambda: "content")
+
+    def test_passthrough_probe_allows_next_probe(self):
+        retrier = make_retrier()
+        breaker = self.open_breaker(retrier)
+        with self.assertRaises(BrowserPoolExhausted):
+            retrier.call(URL, raise_error, BrowserPoolExhausted("no browser"))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        # 试探请求未发出，不必再等待 reset_seconds
+        self.assertEqual(retrier.call(URL, lambda: "content"), "content")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,11 +8,17 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
 from base_news_scraper import BaseNewsScraper, ListPageType
+from page_readiness import ReadinessProfile
+from scroll_strategy import SCROLL_TO_BOTTOM_SCRIPT, ScrollStrategy
+from xhr_feed import FeedItem, XhrFeed, with_query_params
+from domain_scheduler import DomainRateLimit
 
 
 class WallStreetCNNewsScraper(BaseNewsScraper):
     def __init__(self, hours_ago=3):
         super().__init__(hours_ago)
+        self.content_concurrency = 3
+        self.domain_rate_limit = DomainRateLimit(requests_per_second=2, burst=4, max_concurrency=3)
         self.load_more_clicks = 5
 
     def clean_title(self, title_text):
@@ -45,9 +51,56 @@ class WallStreetCNNewsScraper(BaseNewsScraper):
     def get_list_page_type(self):
         return ListPageType.LOAD_MORE
 
+    def get_scroll_strategy(self):
+        # 滚动到底部时加载更多新闻，最后一条早于截止时间即可停止
+        return ScrollStrategy(ScrollStrategy.UNTIL_CUTOFF, max_scrolls=self.load_more_clicks)
+
     def get_list_page_urls(self):
         return ["https://wallstreetcn.com/news/global"]
 
+    def get_xhr_feed(self):
+        # 新闻列表由信息流接口填充，next_cursor 指向下一页
+        return XhrFeed(r"/apiv1/content/information-flow\?", max_pages=self.load_more_clicks)
+
+    def parse_feed_response(self, data):
+        items = []
+        for entry in (data.get("data") or {}).get("items") or []:
+            if entry.get("resource_type") != "article":
+                continue
+            resource = entry.get("resource") or {}
+            title_text = self.clean_title(resource.get("title") or "")
+            link_url = resource.get("uri")
+            if not title_text or not link_url:
+                continue
+            display_time = resource.get("display_time")
+            news_time = datetime.fromtimestamp(display_time) if display_time else None
+            items.append(FeedItem(title_text, link_url, "华尔街见闻", news_time))
+        return items
+
+    def next_feed_page_url(self, url, data, page_items):
+        cursor = (data.get("data") or {}).get("next_cursor")
+        if not cursor:
+            return None
+        return with_query_params(url, cursor=cursor)
+
+    def trigger_feed_request(self):
+        # 滚动到底部时页面请求下一页
+        self.driver.execute_script(SCROLL_TO_BOTTOM_SCRIPT)
+        return True
+
+    def get_list_readiness_profile(self):
+        return ReadinessProfile(
+            container_selector="div.article-list",
+            item_selector="div.article-entry.list-item",
+            network_idle_ms=500,
+        )
+
+    def get_content_selector(self):
+        return ".article"
+
+    def get_content_readiness_profile(self):
+        return ReadinessProfile(container_selector=".article")
+
     def find_items_in_list_page(self):
         news_container = self.driver.find_element(By.CSS_SELECTOR, "div.article-list")
         print("成功找到指定的新闻列表容器")
@@ -59,6 +112,24 @@ class WallStreetCNNewsScraper(BaseNewsScraper):
 
         return news_items
 
+    def get_list_item_selectors(self):
+        return {
+            "container": "div.article-list",
+            "item": "div.article-entry.list-item",
+            "title": "a span",
+            "link": "a",
+            "time": ".time",
+            "time_attr": "datetime",
+        }
+
+    def parse_list_item_record(self, record):
+        title_text = self.clean_title(record["title"] or "")
+        link_url = record["href"]
+        if not title_text or not link_url:
+            return None, None, None, None
+        news_time = self.parse_time_string(record["time"]) if record["time"] else None
+        return title_text, link_url, "华尔街见闻", news_time
+
     def parse_list_page_item(self, item: WebElement):
         news_element = item
         title_text = None
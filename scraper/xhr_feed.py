@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+XHR接口抓取 - 列表页面由JSON接口填充的网站，直接从接口响应中读取新闻列表
+
+列表页面加载后，从浏览器的performance日志中找出匹配 XhrFeed.url_pattern 的XHR/fetch响应，
+用 Network.getResponseBody 取回JSON并由抓取器解析，之后的页面不再点击"加载更多"，
+而是按接口的翻页参数通过HTTP直接请求，到达截止时间后停止。接口给出精确的发布时间，
+不再依赖"N小时前"。
+
+未捕获到接口响应或解析失败时，抓取器回退到原来的页面渲染和解析。
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import base64
+import json
+import os
+import re
+
+from fixtures import fixture_mode
+
+
+def xhr_feed_enabled():
+    """录制和回放时使用页面解析，保证存档中的请求与回放时一致"""
+    return os.environ.get("XHR_FEED_ENABLED", "1") == "1" and fixture_mode() is None
+
+
+def performance_log_enabled(feed=False):
+    """
+    浏览器是否需要以 goog:loggingPrefs performance 启动
+    :param feed: 租用浏览器的抓取器是否从列表接口读取新闻，录制模式下所有浏览器都需要
+    """
+    return (feed and xhr_feed_enabled()) or fixture_mode() == "record"
+
+
+class XhrFeed:
+    """
+    列表页面使用的JSON接口
+
+    :param url_pattern: 正则表达式，匹配接口请求的URL
+    :param max_pages: 捕获的响应之后最多再通过HTTP请求的页数
+    :param capture_timeout: 触发接口请求后等待响应的最长时间（秒）
+    """
+
+    def __init__(self, url_pattern, max_pages=5, capture_timeout=3):
+        self.url_pattern = re.compile(url_pattern)
+        self.max_pages = max_pages
+        self.capture_timeout = capture_timeout
+
+
+class FeedItem:
+    """接口返回的一条新闻，content 为接口直接给出的正文，没有时为None"""
+
+    def __init__(self, title, url, source, time, content=None):
+        self.title = title
+        self.url = url
+        self.source = source
+        self.time = time
+        self.content = content
+
+    def as_list_item(self):
+        return self.title, self.url, self.source, self.time
+
+
+class CapturedResponse:
+    """浏览器中捕获的一个接口响应"""
+
+    def __init__(self, url, request_headers, data):
+        self.url = url
+        self.request_headers = request_headers
+        self.data = data
+
+
+def drain_performance_log(driver):
+    """丢弃已积累的performance日志，之后读取的日志只包含新页面的请求"""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+class FeedCapture:
+    """
+    一个页面上的接口响应捕获
+
+    读取performance日志会清空已读取的部分，同一个请求的 responseReceived 和 loadingFinished
+    可能出现在不同的读取中，因此在多次 poll() 之间保留请求头、匹配的请求和已完成的请求。
+    """
+
+    def __init__(self, driver, url_pattern):
+        self.driver = driver
+        self.url_pattern = url_pattern
+        self._request_headers = {}
+        # 已匹配但尚未取回响应体的请求，按请求顺序
+        self._pending = []
+        self._finished = set()
+
+    @property
+    def has_pending(self):
+        """是否有已匹配但尚未完成加载的请求"""
+        return bool(self._pending)
+
+    def poll(self):
+        """
+        读取新的performance日志，取回已完成的、URL匹配的XHR/fetch响应
+        :return: 本次新取回的 CapturedResponse 列表，按请求顺序
+        """
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self._request_headers[params["requestId"]] = params["request"].get("headers", {})
+            elif method == "Network.responseReceived":
+                if params.get("type") in ("XHR", "Fetch") and self.url_pattern.search(params["response"]["url"]):
+                    self._pending.append((params["requestId"], params["response"]["url"]))
+            elif method == "Network.loadingFinished":
+                self._finished.add(params["requestId"])
+
+        captured = []
+        pending = []
+        for request_id, url in self._pending:
+            if request_id not in self._finished:
+                pending.append((request_id, url))
+                continue
+            response = self._read_response(request_id, url)
+            if response is not None:
+                captured.append(response)
+        self._pending = pending
+        return captured
+
+    def _read_response(self, request_id, url):
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            body = result["body"]
+            if result.get("base64Encoded"):
+                body = base64.b64decode(body)
+            data = json.loads(body)
+        except Exception as e:
+            print(f"读取接口响应失败: {url}: {e}")
+            return None
+        headers = {
+            name: value
+            for name, value in self._request_headers.get(request_id, {}).items()
+            if not name.startswith(":")
+        }
+        return CapturedResponse(url, headers, data)
+
+
+def with_query_params(url, **params):
+    """替换或添加URL中的查询参数，其余参数保持原来的顺序"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({name: str(value) for name, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def merge_list_items(page_items, feed_items):
+    """
+    合并页面解析和接口得到的新闻，同一URL使用接口的结果
+    :param page_items: (title, url, source, time) 元组列表
+    :param feed_items: FeedItem 列表
+    """
+    merged = {}
+    for item in page_items or []:
+        if item[1]:
+            merged[item[1]] = item
+    for item in feed_items:
+        merged[item.url] = item.as_list_item()
+    return list(merged.values())
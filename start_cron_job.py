@@ -10,8 +10,13 @@ sys.path.append(os.path.join(project_dir, "dao"))
 from scraper.cli import Cli
 from merger.news_merger import NewsMerger
 from dao.news_dao import NewsDAO
+from utils.tracing import span
 
 def job(time_range):
+    with span("cron.job", time_range=time_range):
+        run_job(time_range)
+
+def run_job(time_range):
     print("starting the cron job...")
     
     params = { 
@@ -25,8 +30,8 @@ def job(time_range):
     cli.run(params)
 
     data_dir = os.environ.get("DATA_DIR", ".")
-    output_json_filepath = os.path.join(data_dir, "news_merged.json")
     news_merger = NewsMerger()
+    output_json_filepath = os.path.join(data_dir, news_merger.output_file)
     news_merger.run(data_dir, output_json_filepath)
 
     newsDao = NewsDAO()
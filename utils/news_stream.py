@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻流式输出 - 每抓取完成一条新闻就追加一行NDJSON并立即刷新到磁盘
+
+    with NewsStreamWriter("data/cls_news.ndjson.gz") as writer:
+        writer.write(news_item)
+
+    for news in iter_news_file("data/cls_news.ndjson.gz"):
+        ...
+
+抓取中途崩溃时已完成的新闻仍保留在文件中。NEWS_OUTPUT_FORMAT=json（默认）时，
+抓取结束后由流文件生成原来的 {"scrape_time", "total_count", "news_list"} 格式；
+NEWS_OUTPUT_FORMAT=ndjson 时直接输出流文件，合并和入库都逐行读取。
+NEWS_STREAM_COMPRESSION 可选 gzip 或 zstd（需安装 zstandard）。
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+
+
+STREAM_SUFFIXES = {
+    "none": ".ndjson",
+    "gzip": ".ndjson.gz",
+    "zstd": ".ndjson.zst",
+}
+
+
+def news_output_format():
+    """:return: "json" 或 "ndjson" """
+    output_format = os.environ.get("NEWS_OUTPUT_FORMAT", "json").strip().lower()
+    return "ndjson" if output_format == "ndjson" else "json"
+
+
+def news_stream_compression():
+    """:return: "none"、"gzip" 或 "zstd" """
+    compression = os.environ.get("NEWS_STREAM_COMPRESSION", "none").strip().lower()
+    return compression if compression in STREAM_SUFFIXES else "none"
+
+
+def stream_filename(json_filename, compression=None):
+    """cls_news.json -> cls_news.ndjson[.gz|.zst]"""
+    stem = os.path.splitext(json_filename)[0]
+    return stem + STREAM_SUFFIXES[compression or news_stream_compression()]
+
+
+def is_stream_file(filepath):
+    return any(filepath.endswith(suffix) for suffix in STREAM_SUFFIXES.values())
+
+
+def _compression_of(filepath):
+    if filepath.endswith(".gz"):
+        return "gzip"
+    if filepath.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd压缩需要安装 zstandard: pip install zstandard") from e
+    return zstandard
+
+
+class NewsStreamWriter:
+    """
+    逐条追加新闻的NDJSON写入器，线程安全
+    每条新闻写入后立即刷新，压缩格式下也刷新到可独立解压的块边界
+    """
+
+    def __init__(self, filepath, compression=None):
+        """
+        :param filepath: 输出文件路径
+        :param compression: "none"、"gzip" 或 "zstd"，默认按文件扩展名判断
+        """
+        self.filepath = filepath
+        self.compression = compression or _compression_of(filepath)
+        self.count = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        self._raw = open(filepath, "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        elif self.compression == "zstd":
+            self._zstandard = _import_zstandard()
+            self._stream = self._zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+
+    def write(self, news):
+        line = (json.dumps(news, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._stream.write(line)
+            if self.compression == "zstd":
+                self._stream.flush(self._zstandard.FLUSH_BLOCK)
+            elif self.compression == "gzip":
+                # Z_SYNC_FLUSH，崩溃后已写入的新闻仍可解压
+                self._stream.flush()
+            self._raw.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._stream is not self._raw:
+                self._stream.close()
+            self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _iter_chunks(filepath, chunk_size=64 * 1024):
+    """逐块读取并解压文件内容，未正常结束的压缩流返回已解压的部分"""
+    compression = _compression_of(filepath)
+    if compression == "zstd":
+        zstandard = _import_zstandard()
+        with open(filepath, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            while True:
+                try:
+                    chunk = reader.read(chunk_size)
+                except zstandard.ZstdError:
+                    print(f"{filepath} 未正常结束，只读取已完整写入的新闻")
+                    return
+                if not chunk:
+                    return
+                yield chunk
+
+    with open(filepath, "rb") as f:
+        # gzip用zlib逐块解压，崩溃时写了一半的流也能读出已刷新的部分
+        decompressor = zlib.decompressobj(wbits=31) if compression == "gzip" else None
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            if decompressor is None:
+                yield chunk
+                continue
+            while chunk:
+                yield decompressor.decompress(chunk)
+                # 多个gzip成员首尾相接
+                chunk = decompressor.unused_data
+                if decompressor.eof:
+                    decompressor = zlib.decompressobj(wbits=31)
+
+
+def iter_stream_file(filepath):
+    """
+    逐行读取NDJSON新闻文件
+    抓取中途崩溃留下的不完整末行会被跳过
+    """
+    buffer = b""
+    for chunk in _iter_chunks(filepath):
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buffer.strip():
+        try:
+            yield json.loads(buffer)
+        except json.JSONDecodeError:
+            print(f"{filepath} 末行不完整，已跳过")
+
+
+def iter_news_file(filepath):
+    """
+    逐条读取新闻文件，支持NDJSON流文件和原来的JSON格式
+    JSON格式只能整体解析，仅用于兼容
+    """
+    if is_stream_file(filepath):
+        yield from iter_stream_file(filepath)
+        return
+    with open(filepath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    yield from data.get("news_list", [])
+
+
+def save_stream_as_json(stream_filepath, output_filepath, scrape_time=None):
+    """
+    由流文件生成原来的JSON格式，逐条写入，不把全部新闻读入内存
+    输出与 json.dump(indent=2) 的结果一致
+    :return: 新闻条数
+    """
+    total_count = sum(1 for _ in iter_stream_file(stream_filepath))
+    header = {
+        "scrape_time": scrape_time or time.strftime("%Y-%m-%d %H:%M:%S"),
+        "total_count": total_count,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output_filepath)), exist_ok=True)
+    tmp_filepath = f"{output_filepath}.tmp"
+    with open(tmp_filepath, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, value in header.items():
+            f.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+        if total_count == 0:
+            f.write('  "news_list": []\n}')
+        else:
+            f.write('  "news_list": [\n')
+            for index, news in enumerate(iter_stream_file(stream_filepath)):
+                item = json.dumps(news, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+                f.write(f"    {item}")
+                f.write(",\n" if index < total_count - 1 else "\n")
+            f.write("  ]\n}")
+    os.replace(tmp_filepath, output_filepath)
+    return total_count
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+轻量级链路追踪 - 记录抓取、合并、入库和查询各步骤的耗时
+
+    from utils.tracing import span, traced
+
+    with span("scraper.list_page", url=url) as s:
+        ...
+        s.set_attribute("items", len(news_list))
+
+    @traced("dao.insert_news_batch")
+    def insert_news_batch(self, news_list): ...
+
+当前span保存在contextvars中，同一线程或asyncio任务内的span自动形成父子关系；
+提交到线程池的函数用 bind_context() 包装后继承提交时的span。
+TRACE_ENABLED=1 时，结束的span按行写入 TRACE_FILE（JSON lines），设置 TRACE_OTLP_FILE
+或 TRACE_OTLP_ENDPOINT 时同时以OTLP/JSON格式导出。
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import urllib.request
+
+from utils.utils import get_state_dir
+
+_current_span = contextvars.ContextVar("news_scraper_current_span", default=None)
+
+
+def tracing_enabled():
+    return os.environ.get("TRACE_ENABLED", "0") == "1"
+
+
+class Span:
+    """一个计时区间"""
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "ok"
+        self.error = None
+        self.thread = threading.current_thread().name
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def record_error(self, error):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ms(self):
+        end_ns = self.end_ns or time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "thread": self.thread,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """追踪关闭时使用，不记录任何内容"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def record_error(self, error):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_span(span):
+    """转换为OTLP/JSON的span结构"""
+    otlp_span = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # SPAN_KIND_INTERNAL
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [
+            {"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()
+        ]
+        + [{"key": "thread.name", "value": {"stringValue": span.thread}}],
+        # STATUS_CODE_OK / STATUS_CODE_ERROR
+        "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id:
+        otlp_span["parentSpanId"] = span.parent_id
+    return otlp_span
+
+
+class SpanExporter:
+    """把结束的span写入JSON lines文件，并按批以OTLP/JSON格式导出"""
+
+    OTLP_BATCH_SIZE = 512
+
+    def __init__(self, filepath=None, otlp_filepath=None, otlp_endpoint=None, service_name="news-scraper"):
+        self.filepath = filepath
+        self.otlp_filepath = otlp_filepath
+        self.otlp_endpoint = otlp_endpoint
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self._otlp_buffer = []
+        for path in (filepath, otlp_filepath):
+            if path:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, span):
+        with self._lock:
+            if self.filepath:
+                try:
+                    with open(self.filepath, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+                except OSError as e:
+                    print(f"写入追踪文件失败: {e}")
+            if self.otlp_filepath or self.otlp_endpoint:
+                self._otlp_buffer.append(to_otlp_span(span))
+                if len(self._otlp_buffer) < self.OTLP_BATCH_SIZE:
+                    return
+                batch, self._otlp_buffer = self._otlp_buffer, []
+            else:
+                return
+        self._export_otlp(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._otlp_buffer = self._otlp_buffer, []
+        if batch:
+            self._export_otlp(batch)
+
+    def _export_otlp(self, otlp_spans):
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": self.service_name}}
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "news_scraper.tracing"}, "spans": otlp_spans}],
+                }
+            ]
+        }
+        body = json.dumps(request, ensure_ascii=False)
+        if self.otlp_filepath:
+            try:
+                with open(self.otlp_filepath, "a", encoding="utf-8") as f:
+                    f.write(body + "\n")
+            except OSError as e:
+                print(f"写入OTLP追踪文件失败: {e}")
+        if self.otlp_endpoint:
+            try:
+                req = urllib.request.Request(
+                    self.otlp_endpoint,
+                    data=body.encode("utf-8"),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                with urllib.request.urlopen(req, timeout=10):
+                    pass
+            except Exception as e:
+                print(f"发送OTLP追踪数据失败: {e}")
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter():
+    """:return: 根据环境变量创建的共享SpanExporter"""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = SpanExporter(
+                filepath=os.environ.get("TRACE_FILE") or get_state_dir("traces", "spans.jsonl"),
+                otlp_filepath=os.environ.get("TRACE_OTLP_FILE"),
+                otlp_endpoint=os.environ.get("TRACE_OTLP_ENDPOINT"),
+                service_name=os.environ.get("TRACE_SERVICE_NAME", "news-scraper"),
+            )
+            atexit.register(_exporter.flush)
+        return _exporter
+
+
+class span:
+    """
+    span上下文管理器
+    :param name: span名称，如 "scraper.content"
+    :param attributes: span属性
+    """
+
+    def __init__(self, name, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self._span = None
+        self._token = None
+
+    def __enter__(self):
+        if not tracing_enabled():
+            return _NOOP_SPAN
+        self._span = Span(self.name, _current_span.get(), self.attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is None:
+            return False
+        if exc is not None:
+            self._span.record_error(exc)
+        self._span.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        get_exporter().export(self._span)
+        return False
+
+
+def traced(name=None, **attributes):
+    """把函数调用记录为span的装饰器，默认以函数的限定名作为span名称"""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span():
+    """:return: 当前span，没有时返回不记录内容的空span"""
+    return _current_span.get() or _NOOP_SPAN
+
+
+def bind_context(func):
+    """
+    包装提交到线程池的函数，使其在提交时的上下文中运行，继承当前span
+    每次提交都需单独包装
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+
+    return wrapper
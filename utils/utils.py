@@ -1,6 +1,8 @@
 import os
 import json
 
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 def safe_string_to_int(s):
     try:
         return int(s)
@@ -19,6 +21,13 @@ def get_port_from_env(env_name, default_port):
 
     return port
 
+def get_state_dir(*parts):
+    """
+    缓存、索引和trace等运行状态文件的目录
+    使用 DATA_DIR，未设置时为项目下的 data 目录，不随当前工作目录变化
+    """
+    return os.path.join(os.environ.get("DATA_DIR") or os.path.join(PROJECT_DIR, "data"), *parts)
+
 def save_to_json_file(result_data, output_filepath):
     datadir, filename = os.path.split(output_filepath)
     os.makedirs(datadir, exist_ok=True)